@@ -1,17 +1,16 @@
 """Answer generator agent."""
+from typing import Optional
 from backend.models.rag_state import RAGState
-from backend.core import create_llm_adapter
+from backend.core import LLMAdapter, create_llm_adapter
+from backend.core.prompts import SYSTEM_PROMPT, build_user_prompt, format_timestamp
 from backend.config import config
+from backend.utils.tracing import tracer
 
 class AnswerGenerator:
     """Generates answer from retrieved chunks."""
     
-    def __init__(self):
-        self.llm = create_llm_adapter(
-            provider=config.LLM_PROVIDER,
-            api_key=config.GROQ_API_KEY,
-            model=config.GROQ_MODEL
-        )
+    def __init__(self, llm: Optional[LLMAdapter] = None):
+        self.llm = llm or create_llm_adapter(**config.llm_kwargs())
     
     def generate(self, state: RAGState) -> RAGState:
         """Generate answer from retrieved chunks."""
@@ -20,30 +19,22 @@ class AnswerGenerator:
             state["sources"] = []
             return state
         
-        # Build prompt
-        context_parts = []
-        for i, chunk in enumerate(state["retrieved_chunks"], 1):
-            timestamp = self._format_timestamp(chunk.start_time)
-            context_parts.append(f"[{i}] (Timestamp: {timestamp})\n{chunk.text}")
-        
-        context = "\n\n".join(context_parts)
-        
-        prompt = f"""You are a video content assistant. Answer using ONLY the transcript.
-
-STRICT RULES:
-1. Only use information explicitly stated
-2. If not in transcript, say "not covered in video"
-3. Reference timestamps when possible
-4. No external knowledge or speculation
-
-TRANSCRIPT EXCERPTS:
-{context}
-
-QUESTION: {state['query']}
-
-ANSWER:"""
+        # Static instructions go in the system prompt so the prefix is
+        # identical across requests and cacheable by the provider. A
+        # continued provider context already holds the earlier turns.
+        session_id = state.get("session_id")
+        turn = state.get("turn", 0)
+        history = None if self.llm.has_context(session_id, turn) else state.get("conversation_history")
+        prompt = build_user_prompt(state['query'], state["retrieved_chunks"], history)
+        tracer.annotate(
+            prompt_chars=len(SYSTEM_PROMPT) + len(prompt),
+            chunk_ids=[chunk.chunk_id for chunk in state["retrieved_chunks"]]
+        )
         
-        answer = self.llm.generate(prompt, max_tokens=500)
+        answer = self.llm.generate(
+            prompt, max_tokens=500, system=SYSTEM_PROMPT,
+            conversation_id=session_id, turn=turn
+        )
         state["final_answer"] = answer
         
         # Format sources
@@ -53,18 +44,8 @@ ANSWER:"""
                 'text': chunk.text[:200] + "..." if len(chunk.text) > 200 else chunk.text,
                 'start_time': chunk.start_time,
                 'end_time': chunk.end_time,
-                'timestamp_url': self._format_timestamp(chunk.start_time)
+                'timestamp_url': format_timestamp(chunk.start_time)
             })
         state["sources"] = sources
         
         return state
-    
-    def _format_timestamp(self, seconds: float) -> str:
-        """Format seconds as MM:SS or HH:MM:SS."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{secs:02d}"
-        return f"{minutes}:{secs:02d}"
@@ -1,25 +1,24 @@
 """Retrieval agent for semantic search."""
 from backend.models.rag_state import RAGState
 from backend.core import VectorStore
+from backend.core.prompts import contextualize_query
 from backend.config import config
 
 class RetrievalAgent:
     """Retrieves relevant chunks from vector store."""
     
     def __init__(self):
-        self.vector_store = VectorStore(
-            embedding_model=config.EMBEDDING_MODEL,
-            dimension=config.EMBEDDING_DIMENSION,
-            index_dir=config.FAISS_DIR
-        )
+        self.vector_store = VectorStore(**config.vector_store_kwargs())
     
     def retrieve(self, state: RAGState) -> RAGState:
         """Retrieve relevant chunks."""
         results = self.vector_store.search(
             video_id=state["video_id"],
-            query=state["query"],
+            query=contextualize_query(state["query"], state.get("conversation_history")),
             top_k=config.TOP_K_RETRIEVAL,
-            threshold=config.SIMILARITY_THRESHOLD
+            threshold=config.SIMILARITY_THRESHOLD,
+            start_time=state.get("start_time"),
+            end_time=state.get("end_time")
         )
         
         if results:
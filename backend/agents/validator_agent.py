@@ -7,11 +7,7 @@ class ValidatorAgent:
     """Validates answer quality and confidence."""
     
     def __init__(self):
-        self.llm = create_llm_adapter(
-            provider=config.LLM_PROVIDER,
-            api_key=config.GROQ_API_KEY,
-            model=config.GROQ_MODEL
-        )
+        self.llm = create_llm_adapter(**config.llm_kwargs())
     
     def validate(self, state: RAGState) -> RAGState:
         """Validate answer quality."""
@@ -1,9 +1,22 @@
 """FastAPI backend for decoupled frontend architecture."""
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import asyncio
+import json
+import secrets
+import time
+import uuid
+from datetime import date
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, HttpUrl
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, Response
+from pydantic import BaseModel, HttpUrl, Field
 from typing import Optional, List
+from backend.config import config
+from backend.core.bundle import BUNDLE_SUFFIX, BundleError
 from backend.services import VideoRAGService
+from backend.core.llm_resilience import LLMUnavailableError
+from backend.utils.admission import AdmissionQueue, Overloaded
+from backend.utils.metrics import registry, PROMETHEUS_CONTENT_TYPE
+from backend.utils.profiler import profiler
 
 app = FastAPI(
     title="Video RAG API",
@@ -20,17 +33,94 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "videorag_http_request_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Time every request, labelled by route template rather than raw path."""
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status_code
+        )
+
+@app.middleware("http")
+async def select_profiled_requests(request: Request, call_next):
+    """
+    Mark requests for the sampling profiler: X-Profile: 1 or PROFILE_REQUEST_RATE.
+    
+    The mark is a context variable, so it follows the request into worker
+    threads; the service profiles the thread doing the request's work.
+    """
+    forced = request.headers.get("x-profile", "").lower() in ("1", "true")
+    token = profiler.mark_request(forced)
+    try:
+        return await call_next(request)
+    finally:
+        profiler.reset_request(token)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints need X-Admin-Token when ADMIN_TOKEN is configured."""
+    if config.ADMIN_TOKEN and not secrets.compare_digest(x_admin_token or "", config.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
 # Initialize service
 service = VideoRAGService()
 
+# Separate queues so a flood of one kind of request can't starve the others
+query_admission = AdmissionQueue(
+    "query", config.QUERY_CONCURRENCY, config.QUERY_MAX_QUEUE, config.QUERY_QUEUE_TIMEOUT,
+    initial_estimate=2.0
+)
+search_admission = AdmissionQueue(
+    "search", config.SEARCH_CONCURRENCY, config.SEARCH_MAX_QUEUE, config.SEARCH_QUEUE_TIMEOUT,
+    initial_estimate=0.2
+)
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    """Over capacity: 429 with when to retry, rather than queueing without bound."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "queue": exc.queue, "reason": exc.reason},
+        headers={"Retry-After": str(int(exc.retry_after))}
+    )
+
+SSE_KEEPALIVE_SECONDS = 15.0
+SSE_POLL_SECONDS = 1.0
+
 # Request/Response models
 class IngestRequest(BaseModel):
     url: HttpUrl
+    profile: bool = False  # Capture a sampling profile of this job (PROFILING_ENABLED)
 
 class IngestResponse(BaseModel):
     video_id: str
     status: str
 
+class BulkIngestRequest(BaseModel):
+    urls: List[HttpUrl]  # Videos, playlists or channels
+    force: bool = False  # Re-ingest videos that are already indexed
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    status: str  # processing | complete | partial
+    total: int
+    counts: dict
+    progress: float
+    videos: List[dict]
+
 class StatusResponse(BaseModel):
     video_id: str
     status: str
@@ -38,10 +128,14 @@ class StatusResponse(BaseModel):
     progress: float
     error: Optional[str] = None
     metadata: Optional[dict] = None
+    transcript_source: Optional[str] = None  # whisper | captions_manual | captions_auto
 
 class QueryRequest(BaseModel):
     video_id: str
     question: str
+    session_id: Optional[str] = None  # Continue a conversation
+    start_time: Optional[float] = Field(None, ge=0)  # Only use this part of the video (seconds)
+    end_time: Optional[float] = Field(None, ge=0)
 
 class Source(BaseModel):
     text: str
@@ -54,6 +148,43 @@ class QueryResponse(BaseModel):
     answer: str
     sources: List[Source]
     video_id: str
+    session_id: Optional[str] = None
+    trace_id: Optional[str] = None  # Look up in /api/traces/slow if the query was slow
+
+class SearchRequest(BaseModel):
+    query: str
+    top_k: int = Field(10, ge=1, le=100)
+    video_ids: Optional[List[str]] = None  # Default: whole library
+    start_time: Optional[float] = Field(None, ge=0)  # Window within each video (seconds)
+    end_time: Optional[float] = Field(None, ge=0)
+    min_duration: Optional[float] = None  # Video length (seconds)
+    max_duration: Optional[float] = None
+    published_after: Optional[date] = None  # Upload date, inclusive
+    published_before: Optional[date] = None
+
+class SearchResult(Source):
+    video_id: str
+    title: str
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+
+class LocateResponse(BaseModel):
+    video_id: str
+    phrase: str
+    time: Optional[float]  # None if not found or no word timestamps
+
+class BundleImportResponse(BaseModel):
+    video_id: str
+    title: str
+    num_chunks: int
+    version: str
+
+class BundleSyncResponse(BaseModel):
+    imported: List[str]
+    skipped: List[str]
+    failed: dict
 
 class MetadataResponse(BaseModel):
     video_id: str
@@ -62,6 +193,8 @@ class MetadataResponse(BaseModel):
     duration: float
     num_chunks: int
     processed_at: str
+    transcript_source: str = "whisper"
+    upload_date: Optional[str] = None
 
 # Endpoints
 @app.post("/api/ingest", response_model=IngestResponse)
@@ -72,11 +205,39 @@ async def ingest_video(request: IngestRequest):
     Returns video_id for tracking.
     """
     try:
-        video_id = service.ingest_video(str(request.url))
+        video_id = service.ingest_video(str(request.url), profile=request.profile)
         return IngestResponse(video_id=video_id, status="processing")
+    except Overloaded:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/ingest/bulk", response_model=BatchStatusResponse)
+async def ingest_bulk(request: BulkIngestRequest):
+    """
+    Ingest a list of video, playlist or channel URLs.
+    
+    Returns a batch_id whose aggregate status tracks every video.
+    """
+    try:
+        # Playlist expansion makes network calls; keep the event loop free
+        batch = await asyncio.to_thread(
+            service.ingest_batch, [str(url) for url in request.urls], request.force
+        )
+        return BatchStatusResponse(**batch)
+    except Overloaded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/batches/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(batch_id: str):
+    """Aggregate status of a bulk ingestion."""
+    batch = service.get_batch_status(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return BatchStatusResponse(**batch)
+
 @app.get("/api/status/{video_id}", response_model=StatusResponse)
 async def get_status(video_id: str):
     """Get processing status for video."""
@@ -91,24 +252,195 @@ async def get_status(video_id: str):
         stage=status.get('stage', 'unknown'),
         progress=status.get('progress', 0.0),
         error=status.get('error'),
-        metadata=status.get('metadata')
+        metadata=status.get('metadata'),
+        transcript_source=status.get('transcript_source')
+    )
+
+@app.get("/api/status/{video_id}/events")
+async def status_events(video_id: str):
+    """
+    Stream processing progress as Server-Sent Events.
+    
+    Emits the current status first, then stage transitions and
+    fine-grained progress until the video is complete or errored.
+    """
+    subscription = service.subscribe(video_id, loop=asyncio.get_running_loop())
+    status = service.get_status(video_id)
+    
+    if status.get('status') == 'unknown':
+        service.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    async def event_stream():
+        try:
+            event = {'type': 'status', 'video_id': video_id, **status}
+            last_version = status.get('version', -1)
+            idle = 0.0
+            while True:
+                if event is not None:
+                    last_version = max(last_version, event.get('version', -1))
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                    if event.get('status') in ('complete', 'error'):
+                        break
+                    idle = 0.0
+                elif idle >= SSE_KEEPALIVE_SECONDS:
+                    yield ": keep-alive\n\n"
+                    idle = 0.0
+                
+                event = await subscription.aget(timeout=SSE_POLL_SECONDS)
+                if event is None:
+                    idle += SSE_POLL_SECONDS
+                    # Ingestion may be running in another worker process;
+                    # fall back to the shared store's version counter.
+                    if service.status_store.get_version(video_id) > last_version:
+                        event = {'type': 'status', 'video_id': video_id, **service.get_status(video_id)}
+        finally:
+            service.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @app.post("/api/query", response_model=QueryResponse)
-async def query_video(request: QueryRequest):
-    """Query video content."""
+async def query_video(
+    request: QueryRequest,
+    http_response: Response,
+    x_trace_id: Optional[str] = Header(None, max_length=64)
+):
+    """
+    Query video content. The trace id is returned in the body and X-Trace-Id header.
+    
+    Answers 429 with Retry-After when the query queue is full.
+    """
     try:
-        response = service.query(request.video_id, request.question)
+        response = await query_admission.run_in_thread(
+            service.query,
+            request.video_id, request.question,
+            session_id=request.session_id,
+            start_time=request.start_time,
+            end_time=request.end_time,
+            trace_id=x_trace_id
+        )
+        http_response.headers["X-Trace-Id"] = response.trace_id or ""
         return QueryResponse(
             answer=response.answer,
             sources=[Source(**s) for s in response.sources],
-            video_id=response.video_id
+            video_id=response.video_id,
+            session_id=response.session_id,
+            trace_id=response.trace_id
         )
+    except LLMUnavailableError as e:
+        headers = {"Retry-After": str(int(e.retry_after or 5) + 1)}
+        raise HTTPException(status_code=503, detail=str(e), headers=headers)
+    except Overloaded:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/query/stream")
+async def query_video_stream(
+    request: QueryRequest,
+    x_trace_id: Optional[str] = Header(None, max_length=64)
+):
+    """
+    Query video content, streaming the answer as Server-Sent Events.
+    
+    Emits `token` events ({text}) as the LLM generates, then one `done`
+    event with the full QueryResponse, or an `error` event ({status, detail}).
+    Shares the query queue; a full queue is a plain 429 before streaming starts.
+    """
+    admitted = await query_admission.acquire()
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def on_token(text: str):
+        loop.call_soon_threadsafe(events.put_nowait, ('token', {'text': text}))
+    
+    async def run_query():
+        try:
+            response = await asyncio.to_thread(
+                service.query,
+                request.video_id, request.question,
+                session_id=request.session_id,
+                start_time=request.start_time,
+                end_time=request.end_time,
+                trace_id=x_trace_id,
+                on_token=on_token
+            )
+            await events.put(('done', {
+                'answer': response.answer,
+                'sources': response.sources,
+                'video_id': response.video_id,
+                'session_id': response.session_id,
+                'trace_id': response.trace_id
+            }))
+        except LLMUnavailableError as e:
+            await events.put(('error', {'status': 503, 'detail': str(e), 'retry_after': e.retry_after}))
+        except ValueError as e:
+            await events.put(('error', {'status': 404, 'detail': str(e)}))
+        except Exception as e:
+            await events.put(('error', {'status': 500, 'detail': str(e)}))
+        finally:
+            query_admission.release(admitted)
+    
+    # Runs to completion even if the client disconnects, so the turn is recorded
+    task = asyncio.create_task(run_query())
+    
+    async def event_stream():
+        while True:
+            event, data = await events.get()
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+            if event in ('done', 'error'):
+                break
+        await task
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/search", response_model=SearchResponse)
+async def search_library(request: SearchRequest):
+    """Search passages across processed videos, filtered by time window, length and upload date."""
+    try:
+        results = await search_admission.run_in_thread(
+            service.search_library,
+            request.query,
+            top_k=request.top_k,
+            video_ids=request.video_ids,
+            start_time=request.start_time,
+            end_time=request.end_time,
+            min_duration=request.min_duration,
+            max_duration=request.max_duration,
+            published_after=request.published_after.isoformat() if request.published_after else None,
+            published_before=request.published_before.isoformat() if request.published_before else None
+        )
+        return SearchResponse(query=request.query, results=[SearchResult(**r) for r in results])
+    except Overloaded:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/sessions/{session_id}")
+async def end_session(session_id: str):
+    """Discard a conversation session."""
+    if not service.end_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id, "deleted": True}
+
+@app.get("/api/locate/{video_id}", response_model=LocateResponse)
+async def locate_phrase(video_id: str, phrase: str, start: float = 0.0, end: Optional[float] = None):
+    """Resolve a quoted phrase to the second it is spoken (needs WHISPER_WORD_TIMESTAMPS)."""
+    time_found = service.locate_phrase(video_id, phrase, start, end if end is not None else float("inf"))
+    return LocateResponse(video_id=video_id, phrase=phrase, time=time_found)
+
 @app.get("/api/metadata/{video_id}", response_model=MetadataResponse)
 async def get_metadata(video_id: str):
     """Get video metadata."""
@@ -119,6 +451,105 @@ async def get_metadata(video_id: str):
     
     return MetadataResponse(**metadata.to_dict())
 
+@app.get("/api/bundles/{video_id}")
+async def export_bundle(video_id: str):
+    """Download a video's single-file bundle (index, chunks, transcript, metadata)."""
+    try:
+        path = await asyncio.to_thread(service.export_bundle, video_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{video_id}{BUNDLE_SUFFIX}")
+
+@app.post("/api/bundles", response_model=BundleImportResponse, dependencies=[Depends(require_admin)])
+async def import_bundle(request: Request):
+    """
+    Import a bundle sent as the raw request body (at most BUNDLE_MAX_UPLOAD_MB).
+    
+    The upload is streamed to disk, verified and attached without unpacking.
+    """
+    max_bytes = int(config.BUNDLE_MAX_UPLOAD_MB * 1024 * 1024)
+    too_large = HTTPException(status_code=413, detail=f"Bundle exceeds {config.BUNDLE_MAX_UPLOAD_MB:g} MB")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+    
+    incoming = config.BUNDLE_DIR / f".incoming-{uuid.uuid4().hex}{BUNDLE_SUFFIX}"
+    try:
+        received = 0
+        f = await asyncio.to_thread(open, incoming, "wb")
+        try:
+            async for block in request.stream():
+                received += len(block)
+                if received > max_bytes:
+                    raise too_large
+                await asyncio.to_thread(f.write, block)
+        finally:
+            await asyncio.to_thread(f.close)
+        return BundleImportResponse(**await asyncio.to_thread(service.import_bundle, incoming))
+    except HTTPException:
+        raise
+    except BundleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        incoming.unlink(missing_ok=True)  # The index holds its own link or copy
+
+@app.post("/api/bundles/sync", response_model=BundleSyncResponse, dependencies=[Depends(require_admin)])
+async def sync_bundles():
+    """Import every bundle in BUNDLE_SYNC_DIR that is newer than this node's copy."""
+    directory = config.BUNDLE_SYNC_DIR
+    if directory is None or not directory.is_dir():
+        raise HTTPException(status_code=400, detail="BUNDLE_SYNC_DIR is not configured")
+    return BundleSyncResponse(**await asyncio.to_thread(service.sync_bundles, directory))
+
+@app.get("/api/bundles/sync/last")
+async def last_bundle_sync():
+    """Result of the most recent bundle sync (including the startup sync)."""
+    return service.last_bundle_sync or {}
+
+@app.get("/api/traces/slow", dependencies=[Depends(require_admin)])
+async def slow_traces(limit: int = Query(20, ge=1, le=500)):
+    """Recent traces slower than TRACE_SLOW_SECONDS, newest first, with per-span timings."""
+    return await asyncio.to_thread(service.slow_traces, limit)
+
+@app.get("/api/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles(kind: Optional[str] = None, limit: int = Query(100, ge=1, le=1000)):
+    """Captured sampling profiles, newest first; kind is ingest, query or search."""
+    return await asyncio.to_thread(service.list_profiles, kind, limit)
+
+@app.get("/api/admin/profiles/{name}", dependencies=[Depends(require_admin)])
+async def download_profile(name: str):
+    """A profile as collapsed stacks, for flamegraph.pl, speedscope or inferno."""
+    path = service.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
+
+@app.get("/api/admission")
+async def admission_stats():
+    """Capacity and current load of the query, search and ingest queues in this process."""
+    return {
+        'query': query_admission.stats(),
+        'search': search_admission.stats(),
+        **service.admission_stats()
+    }
+
+@app.get("/api/cpu")
+async def cpu_stats():
+    """CPU budget of this process and how busy each engine's share of it is."""
+    return service.cpu_stats()
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Audio cache usage, budget and evictions."""
+    return service.cache_stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics for this worker process."""
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
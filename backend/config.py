@@ -2,6 +2,7 @@
 import os
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -11,10 +12,17 @@ load_dotenv()
 class Config:
     # Paths
     BASE_DIR: Path = Path(__file__).parent.parent
-    DATA_DIR: Path = BASE_DIR / "data"
+    DATA_DIR: Path = Path(os.getenv("DATA_DIR", str(BASE_DIR / "data")))
     FAISS_DIR: Path = DATA_DIR / "faiss_indexes"
     METADATA_DIR: Path = DATA_DIR / "metadata"
     CACHE_DIR: Path = DATA_DIR / "cache"
+    TRANSCRIPT_DIR: Path = DATA_DIR / "transcripts"
+    STATUS_DB: Path = DATA_DIR / "status.db"  # Shared across API worker processes
+    BUNDLE_DIR: Path = DATA_DIR / "bundles"  # Exported single-file video bundles
+    # Directory of bundles imported at startup (e.g. a shared volume); unset disables
+    BUNDLE_SYNC_DIR: Optional[Path] = Path(os.environ["BUNDLE_SYNC_DIR"]) if os.getenv("BUNDLE_SYNC_DIR") else None
+    BUNDLE_SYNC_WORKERS: int = int(os.getenv("BUNDLE_SYNC_WORKERS", "4"))
+    BUNDLE_MAX_UPLOAD_MB: float = float(os.getenv("BUNDLE_MAX_UPLOAD_MB", "1024"))  # POST /api/bundles; larger gets 413
     
     # LLM Configuration
     LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "groq")  # groq | ollama
@@ -22,14 +30,98 @@ class Config:
     GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.1")
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # Model residency after each request
+    OLLAMA_PRELOAD: bool = os.getenv("OLLAMA_PRELOAD", "true").lower() == "true"  # Load model on startup
+    OLLAMA_WARM_INTERVAL: float = float(os.getenv("OLLAMA_WARM_INTERVAL", "0"))  # Keep-warm ping seconds; 0 disables
+    OLLAMA_REUSE_CONTEXT: bool = os.getenv("OLLAMA_REUSE_CONTEXT", "false").lower() == "true"
+    # LLM resilience: timeouts, retries, rate limits (0 = unlimited) and hedging
+    LLM_RESILIENCE: bool = os.getenv("LLM_RESILIENCE", "true").lower() == "true"
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "30"))  # seconds per request
+    LLM_DEADLINE: float = float(os.getenv("LLM_DEADLINE", "60"))  # seconds including retries
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_REQUESTS_PER_MINUTE: float = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+    LLM_TOKENS_PER_MINUTE: float = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+    LLM_HEDGE_AFTER: float = float(os.getenv("LLM_HEDGE_AFTER", "0"))  # seconds; 0 disables hedging
+    
+    # Fake provider (LLM_PROVIDER=fake) for benchmarks and load tests
+    FAKE_LLM_LATENCY: float = float(os.getenv("FAKE_LLM_LATENCY", "0.0"))  # seconds to first token
+    FAKE_LLM_TOKENS_PER_SECOND: float = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0.0"))
     
     # Embedding Configuration
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
-    EMBEDDING_DIMENSION: int = 384  # all-MiniLM-L6-v2 dimension
+    # sentence-transformers (PyTorch) | onnx | onnx-int8 (CPU-optimized) | hashing (offline tests)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "sentence-transformers")
+    # Detected from the model when unset
+    EMBEDDING_DIMENSION: Optional[int] = int(os.environ["EMBEDDING_DIMENSION"]) if os.getenv("EMBEDDING_DIMENSION") else None
+    EMBEDDING_THREADS: int = int(os.getenv("EMBEDDING_THREADS", "0"))  # ONNX intra-op threads; 0 = default
+    # Index builds: processes embedding chunks in parallel (each loads the model;
+    # 0 = in-process, on the query threads when the CPU budget is on)
+    EMBED_WORKERS: int = int(os.getenv("EMBED_WORKERS", "0"))
+    EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "64"))  # Chunks per length-sorted batch
+    
+    # Request tracing: traces at or above TRACE_SLOW_SECONDS go to a rotating JSONL log
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_SLOW_SECONDS: float = float(os.getenv("TRACE_SLOW_SECONDS", "2.0"))
+    TRACE_LOG_PATH: Path = DATA_DIR / "traces" / "slow_queries.jsonl"
+    TRACE_LOG_MAX_MB: float = float(os.getenv("TRACE_LOG_MAX_MB", "10"))
+    TRACE_LOG_BACKUPS: int = int(os.getenv("TRACE_LOG_BACKUPS", "3"))
+    
+    # Sampling profiler (opt-in): collapsed-stack profiles of chosen jobs and requests
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_DIR: Path = DATA_DIR / "profiles"
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "10"))  # 100 Hz
+    PROFILE_REQUEST_RATE: float = float(os.getenv("PROFILE_REQUEST_RATE", "0"))  # Fraction of queries/searches
+    PROFILE_INGEST_RATE: float = float(os.getenv("PROFILE_INGEST_RATE", "0"))  # Fraction of ingestion jobs
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "200"))
+    # Required as X-Admin-Token on /api/admin endpoints when set
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    
+    # Streamlit frontend: embedded (runs the service in-process) | api (thin HTTP client)
+    FRONTEND_MODE: str = os.getenv("FRONTEND_MODE", "embedded")
+    API_BASE_URL: str = os.getenv("API_BASE_URL", "http://localhost:8000")
+    API_TIMEOUT: float = float(os.getenv("API_TIMEOUT", "120"))  # Seconds per call; streams wait per event
+    API_POOL_SIZE: int = int(os.getenv("API_POOL_SIZE", "16"))  # Keep-alive connections per UI process
+    
+    # CPU budget: fixed thread counts per engine instead of every library using
+    # all cores; QUERY_RESERVED_CORES stay free of ingestion (0 = a quarter)
+    CPU_BUDGET_ENABLED: bool = os.getenv("CPU_BUDGET_ENABLED", "true").lower() == "true"
+    CPU_CORES: int = int(os.getenv("CPU_CORES", "0"))  # Cores for this process; 0 = affinity / cgroup limit
+    QUERY_RESERVED_CORES: int = int(os.getenv("QUERY_RESERVED_CORES", "0"))
+    
+    # Ingestion fan-out
+    INGEST_WORKERS: int = int(os.getenv("INGEST_WORKERS", "2"))  # Videos processed concurrently per process
+    INGEST_MAX_QUEUE: int = int(os.getenv("INGEST_MAX_QUEUE", "100"))  # Jobs waiting for a worker before 429
+    
+    # Admission control per API process: concurrent requests, waiting requests,
+    # and the longest a request may wait for a slot before it gets 429
+    QUERY_CONCURRENCY: int = int(os.getenv("QUERY_CONCURRENCY", "8"))
+    QUERY_MAX_QUEUE: int = int(os.getenv("QUERY_MAX_QUEUE", "32"))
+    QUERY_QUEUE_TIMEOUT: float = float(os.getenv("QUERY_QUEUE_TIMEOUT", "10"))
+    SEARCH_CONCURRENCY: int = int(os.getenv("SEARCH_CONCURRENCY", "8"))
+    SEARCH_MAX_QUEUE: int = int(os.getenv("SEARCH_MAX_QUEUE", "64"))
+    SEARCH_QUEUE_TIMEOUT: float = float(os.getenv("SEARCH_QUEUE_TIMEOUT", "5"))
+    BULK_MAX_VIDEOS: int = int(os.getenv("BULK_MAX_VIDEOS", "500"))  # Per bulk request
+    
+    # Downloaded audio: original (no transcode) | pcm16k (16 kHz mono WAV) | mp3
+    AUDIO_FORMAT: str = os.getenv("AUDIO_FORMAT", "original")
+    AUDIO_CACHE_MAX_MB: float = float(os.getenv("AUDIO_CACHE_MAX_MB", "2048"))  # 0 = unbounded
+    AUDIO_CACHE_ORPHAN_HOURS: float = float(os.getenv("AUDIO_CACHE_ORPHAN_HOURS", "24"))  # untranscribed audio
+    
+    # Use the video's subtitles instead of Whisper when they pass quality checks
+    CAPTIONS_FIRST: bool = os.getenv("CAPTIONS_FIRST", "true").lower() == "true"
+    CAPTIONS_LANGUAGES: tuple = tuple(os.getenv("CAPTIONS_LANGUAGES", "en").split(","))  # preference order
+    CAPTIONS_ALLOW_AUTO: bool = os.getenv("CAPTIONS_ALLOW_AUTO", "true").lower() == "true"  # YouTube auto-captions
     
     # Transcription Configuration
     WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")  # tiny, base, small, medium, large
     WHISPER_DEVICE: str = os.getenv("WHISPER_DEVICE", "cpu")  # cpu | cuda
+    WHISPER_PROFILE: str = os.getenv("WHISPER_PROFILE", "balanced")  # fast | balanced | accurate
+    # Override the profile's thread settings (unset = profile default; -1 threads = all cores)
+    WHISPER_CPU_THREADS: Optional[int] = int(os.environ["WHISPER_CPU_THREADS"]) if os.getenv("WHISPER_CPU_THREADS") else None
+    WHISPER_NUM_WORKERS: Optional[int] = int(os.environ["WHISPER_NUM_WORKERS"]) if os.getenv("WHISPER_NUM_WORKERS") else None
+    # Keep per-word times for precise citations; adds an alignment pass
+    WHISPER_WORD_TIMESTAMPS: bool = os.getenv("WHISPER_WORD_TIMESTAMPS", "false").lower() == "true"
     
     # Chunking Configuration
     CHUNK_SIZE: int = 500  # tokens (roughly 375 words)
@@ -40,9 +132,72 @@ class Config:
     SIMILARITY_THRESHOLD: float = 0.2
     MAX_CONTEXT_LENGTH: int = 4000  # tokens for LLM context
     
+    # Conversation sessions (held in memory per API process)
+    SESSION_MAX_SESSIONS: int = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+    SESSION_MAX_MEMORY_MB: float = float(os.getenv("SESSION_MAX_MEMORY_MB", "64"))
+    SESSION_IDLE_TTL: float = float(os.getenv("SESSION_IDLE_TTL", "1800"))  # seconds
+    SESSION_MAX_TURNS: int = int(os.getenv("SESSION_MAX_TURNS", "5"))  # verbatim turns kept
+    SESSION_HISTORY_TOKENS: int = int(os.getenv("SESSION_HISTORY_TOKENS", "600"))  # history budget per prompt
+    
+    def llm_kwargs(self) -> dict:
+        """Arguments for create_llm_adapter() for the configured provider."""
+        return {
+            "provider": self.LLM_PROVIDER,
+            "api_key": self.GROQ_API_KEY,
+            "model": self.GROQ_MODEL if self.LLM_PROVIDER == "groq" else self.OLLAMA_MODEL,
+            "base_url": self.OLLAMA_BASE_URL,
+            "keep_alive": self.OLLAMA_KEEP_ALIVE,
+            "preload": self.OLLAMA_PRELOAD,
+            "warm_interval": self.OLLAMA_WARM_INTERVAL,
+            "reuse_context": self.OLLAMA_REUSE_CONTEXT,
+            "timeout": self.LLM_TIMEOUT,
+            "latency": self.FAKE_LLM_LATENCY,
+            "tokens_per_second": self.FAKE_LLM_TOKENS_PER_SECOND,
+            "resilience": {
+                "requests_per_minute": self.LLM_REQUESTS_PER_MINUTE,
+                "tokens_per_minute": self.LLM_TOKENS_PER_MINUTE,
+                "max_concurrency": self.LLM_MAX_CONCURRENCY,
+                "max_retries": self.LLM_MAX_RETRIES,
+                "deadline": self.LLM_DEADLINE,
+                "hedge_after": self.LLM_HEDGE_AFTER
+            } if self.LLM_RESILIENCE else None
+        }
+    
+    def cpu_budget(self):
+        """CPUBudget for this process, or None when CPU_BUDGET_ENABLED is off."""
+        if not self.CPU_BUDGET_ENABLED:
+            return None
+        from backend.utils.cpu_budget import CPUBudget
+        return CPUBudget.plan(
+            total_cores=self.CPU_CORES,
+            query_cores=self.QUERY_RESERVED_CORES,
+            ingest_workers=self.INGEST_WORKERS,
+            embed_workers=self.EMBED_WORKERS,
+            query_concurrency=self.QUERY_CONCURRENCY,
+            whisper_threads=self.WHISPER_CPU_THREADS,
+            query_threads=self.EMBEDDING_THREADS
+        )
+    
+    def vector_store_kwargs(self) -> dict:
+        """Arguments for VectorStore() with the configured embedding backend."""
+        budget = self.cpu_budget()
+        return {
+            "embedding_model": self.EMBEDDING_MODEL,
+            "dimension": self.EMBEDDING_DIMENSION,
+            "index_dir": self.FAISS_DIR,
+            "backend": self.EMBEDDING_BACKEND,
+            "backend_options": {
+                "threads": budget.query_threads if budget else self.EMBEDDING_THREADS,
+                "cache_dir": self.DATA_DIR / "models"
+            },
+            "embed_workers": budget.embed_workers if budget else self.EMBED_WORKERS,
+            "embed_threads": budget.embed_threads if budget else 0,
+            "embed_batch_size": self.EMBED_BATCH_SIZE
+        }
+    
     def __post_init__(self):
         """Create directories if they don't exist."""
-        for dir_path in [self.FAISS_DIR, self.METADATA_DIR, self.CACHE_DIR]:
+        for dir_path in [self.FAISS_DIR, self.METADATA_DIR, self.CACHE_DIR, self.TRANSCRIPT_DIR]:
             dir_path.mkdir(parents=True, exist_ok=True)
 
 config = Config()
@@ -1,12 +1,16 @@
 from .video_downloader import VideoDownloader
+from .audio_cache import AudioCache
 from .transcriber import Transcriber
+from .transcript_store import TranscriptStore
 from .chunker import TranscriptChunker
 from .vector_store import VectorStore
 from .llm_adapter import LLMAdapter, create_llm_adapter
 
 __all__ = [
     'VideoDownloader',
+    'AudioCache',
     'Transcriber', 
+    'TranscriptStore',
     'TranscriptChunker',
     'VectorStore',
     'LLMAdapter',
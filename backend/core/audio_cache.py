@@ -0,0 +1,151 @@
+"""Size-bounded cache of downloaded audio."""
+import os
+import threading
+import time
+from collections import Counter as _RefCounts
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from backend.utils.metrics import registry
+
+# Leftovers of interrupted or in-progress downloads
+PARTIAL_SUFFIXES = {'.part', '.ytdl', '.temp', '.tmp'}
+
+AUDIO_CACHE_BYTES = registry.gauge(
+    "videorag_audio_cache_bytes", "Bytes of downloaded audio on disk"
+)
+AUDIO_CACHE_LOOKUPS = registry.counter(
+    "videorag_audio_cache_lookups_total", "Audio cache lookups by result", ["result"]
+)
+AUDIO_CACHE_EVICTIONS = registry.counter(
+    "videorag_audio_cache_evictions_total", "Audio files removed from the cache by reason", ["reason"]
+)
+
+class AudioCache:
+    """
+    Byte-budgeted LRU over the audio files in cache_dir.
+
+    A file's mtime is its last-access time (refreshed on lookup), so the
+    LRU order is shared by all worker processes and survives restarts.
+    Audio is evictable once its video has a transcript, or once it has
+    been idle for orphan_grace seconds (e.g. a failed job). Pinned
+    videos (in-flight jobs in this process) are never evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int,
+        has_transcript: Callable[[str], bool],
+        orphan_grace: float = 24 * 3600
+    ):
+        """
+        Args:
+            cache_dir: Directory the downloader writes `{video_id}.{ext}` to
+            max_bytes: Byte budget; 0 disables eviction
+            has_transcript: Whether a video's transcript is persisted
+            orphan_grace: Seconds after which untranscribed audio is evictable
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.has_transcript = has_transcript
+        self.orphan_grace = orphan_grace
+        self._pins: _RefCounts = _RefCounts()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def lookup(self, video_id: str) -> Optional[Path]:
+        """Cached audio for a video, marking it recently used."""
+        for path in self.cache_dir.glob(f"{video_id}.*"):
+            if path.suffix in PARTIAL_SUFFIXES:
+                continue
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                continue  # Evicted by another process meanwhile
+            AUDIO_CACHE_LOOKUPS.inc(result='hit')
+            return path
+        AUDIO_CACHE_LOOKUPS.inc(result='miss')
+        return None
+
+    @contextmanager
+    def pin(self, video_id: str):
+        """Protect a video's audio from eviction for the duration of a job."""
+        with self._lock:
+            self._pins[video_id] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins[video_id] -= 1
+                if self._pins[video_id] <= 0:
+                    del self._pins[video_id]
+
+    def _entries(self) -> List[Tuple[float, int, str, Path]]:
+        """(mtime, size, video_id, path) for every file in the cache."""
+        entries = []
+        for path in self.cache_dir.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.is_file():
+                entries.append((stat.st_mtime, stat.st_size, path.name.split('.', 1)[0], path))
+        return entries
+
+    def enforce_budget(self) -> int:
+        """
+        Evict least recently used evictable audio until within budget.
+
+        Returns:
+            Bytes freed
+        """
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _, _ in entries)
+            now = time.time()
+            freed = 0
+            for mtime, size, video_id, path in entries:
+                if video_id in self._pins:
+                    continue
+                idle = now - mtime
+                if path.suffix in PARTIAL_SUFFIXES:
+                    reason = 'partial' if idle > self.orphan_grace else None
+                elif self.max_bytes and total - freed > self.max_bytes:
+                    if self.has_transcript(video_id):
+                        reason = 'capacity'
+                    elif idle > self.orphan_grace:
+                        reason = 'orphaned'
+                    else:
+                        reason = None
+                else:
+                    reason = None
+                if reason is None:
+                    continue
+                path.unlink(missing_ok=True)
+                freed += size
+                self._evictions += 1
+                AUDIO_CACHE_EVICTIONS.inc(reason=reason)
+            AUDIO_CACHE_BYTES.set(total - freed)
+            return freed
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        with self._lock:
+            pinned = set(self._pins)
+            evictions = self._evictions
+        total = sum(size for _, size, _, _ in entries)
+        evictable = sum(
+            size for _, size, video_id, path in entries
+            if video_id not in pinned and path.suffix not in PARTIAL_SUFFIXES and self.has_transcript(video_id)
+        )
+        AUDIO_CACHE_BYTES.set(total)
+        return {
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'files': len(entries),
+            'pinned': len(pinned),
+            'evictable_bytes': evictable,
+            'evictions': evictions  # Since this process started
+        }
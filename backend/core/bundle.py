@@ -0,0 +1,147 @@
+"""Single-file, checksummed, memory-mappable video bundles."""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+BUNDLE_MAGIC = b"VRAGBNDL"
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = ".vrb"
+ALIGNMENT = 4096  # Sections start on page boundaries so each can be mapped directly
+
+# magic, format version, manifest length, data offset
+_HEADER = struct.Struct("<8sIIQ")
+
+class BundleError(ValueError):
+    """Bundle is malformed, from an unsupported version, or fails verification."""
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def write_bundle(path: Path, manifest: dict, sections: Dict[str, Union[bytes, bytearray, memoryview]]):
+    """
+    Write a bundle atomically.
+
+    Layout:
+
+        header (magic, version, manifest length, data offset)
+        manifest JSON: caller's fields plus sections {name: {offset, length, sha256}}
+        sections, uncompressed, each padded to a 4 KiB boundary
+
+    Section offsets are relative to the data offset, so the manifest can
+    describe them before its own length is known.
+    """
+    entries, offset = {}, 0
+    for name, data in sections.items():
+        view = memoryview(data).cast("B")
+        entries[name] = {
+            "offset": offset,
+            "length": view.nbytes,
+            "sha256": hashlib.sha256(view).hexdigest()
+        }
+        offset = _align(offset + view.nbytes)
+
+    manifest_bytes = json.dumps(
+        {**manifest, "format_version": BUNDLE_VERSION, "sections": entries}, default=str
+    ).encode("utf-8")
+    data_offset = _align(_HEADER.size + len(manifest_bytes))
+
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(manifest_bytes), data_offset))
+            f.write(manifest_bytes)
+            for name, data in sections.items():
+                f.seek(data_offset + entries[name]["offset"])
+                f.write(data)
+            f.truncate(data_offset + offset)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def read_manifest(path: Path) -> dict:
+    """Read only the header and manifest (cheap; no section data is touched)."""
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        manifest_length, _ = _check_header(header, path)
+        return json.loads(f.read(manifest_length))
+
+def _check_header(header: bytes, path: Path):
+    if len(header) < _HEADER.size:
+        raise BundleError(f"{path} is too short to be a bundle")
+    magic, version, manifest_length, data_offset = _HEADER.unpack(header[:_HEADER.size])
+    if magic != BUNDLE_MAGIC:
+        raise BundleError(f"{path} is not a video bundle")
+    if version > BUNDLE_VERSION:
+        raise BundleError(f"{path} uses bundle format {version}; this build reads up to {BUNDLE_VERSION}")
+    return manifest_length, data_offset
+
+class Bundle:
+    """
+    Read-only, memory-mapped view of a bundle.
+
+    section() returns zero-copy memoryviews into the mapping, so callers
+    can deserialize straight from the page cache. Use as a context manager;
+    views must not be used after close().
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BundleError(f"{self.path} is empty")
+        manifest_length, self._data_offset = _check_header(self._map[:_HEADER.size], self.path)
+        try:
+            self.manifest = json.loads(bytes(self._map[_HEADER.size:_HEADER.size + manifest_length]))
+        except ValueError as e:
+            self.close()
+            raise BundleError(f"{self.path} has a corrupt manifest: {e}")
+        self._view = memoryview(self._map)
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_section(self, name: str) -> bool:
+        return name in self.manifest["sections"]
+
+    def section(self, name: str) -> Optional[memoryview]:
+        """Zero-copy view of a section, or None if the bundle doesn't have it."""
+        entry = self.manifest["sections"].get(name)
+        if entry is None:
+            return None
+        start = self._data_offset + entry["offset"]
+        end = start + entry["length"]
+        if end > len(self._map):
+            raise BundleError(f"{self.path} is truncated (section {name})")
+        return self._view[start:end]
+
+    def verify(self):
+        """Check every section's SHA-256; raises BundleError on mismatch."""
+        for name, entry in self.manifest["sections"].items():
+            if hashlib.sha256(self.section(name)).hexdigest() != entry["sha256"]:
+                raise BundleError(f"{self.path} failed verification (section {name})")
+
+    def close(self):
+        try:
+            view = getattr(self, "_view", None)
+            if view is not None:
+                view.release()
+                self._view = None
+            self._map.close()
+        except BufferError:
+            pass  # Caller still holds section views; unmapped once they are released
+        self._file.close()
@@ -0,0 +1,108 @@
+"""Subtitle parsing (WebVTT, YouTube SRV3) and caption quality checks."""
+import html
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List, Tuple
+from backend.models import TranscriptSegment
+
+_TIMESTAMP = r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})"
+_CUE_TIMING = re.compile(rf"{_TIMESTAMP}\s*-->\s*{_TIMESTAMP}")
+_TAG = re.compile(r"<[^>]+>")
+_NOISE = re.compile(r"^[\[\(♪].*[\]\)♪]$|^♪+$")
+
+def _seconds(hours, minutes, seconds, millis) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+def parse_vtt(text: str) -> List[TranscriptSegment]:
+    """
+    Parse WebVTT into segments.
+
+    YouTube auto-captions repeat the previous line in each cue (roll-up
+    style) and add ~10 ms transition cues; both are collapsed so each
+    spoken line appears once.
+    """
+    segments = []
+    previous_lines: List[str] = []
+    # Cues are separated by empty lines; YouTube cues may contain a " " line
+    for block in re.split(r"\n{2,}", text.replace("\r\n", "\n")):
+        lines = block.strip().split("\n")
+        for i, line in enumerate(lines):
+            match = _CUE_TIMING.search(line)
+            if match:
+                break
+        else:
+            continue  # Header, NOTE or STYLE block
+
+        start = _seconds(*match.groups()[:4])
+        end = _seconds(*match.groups()[4:])
+        cue_lines = [html.unescape(_TAG.sub("", l)).strip() for l in lines[i + 1:]]
+        cue_lines = [l for l in cue_lines if l]
+        new_lines = [l for l in cue_lines if l not in previous_lines]
+        if cue_lines:
+            previous_lines = cue_lines
+        if not new_lines or end - start < 0.05:
+            continue
+        segments.append(TranscriptSegment(text=" ".join(new_lines), start=start, end=end))
+    return segments
+
+def parse_srv3(text: str) -> List[TranscriptSegment]:
+    """Parse YouTube's timedtext format 3 (<p t="ms" d="ms">...</p>)."""
+    root = ET.fromstring(text)
+    segments = []
+    for p in root.iter("p"):
+        words = " ".join("".join(p.itertext()).split())
+        if not words:
+            continue
+        start = int(p.get("t", 0)) / 1000
+        duration = int(p.get("d", 0)) / 1000
+        segments.append(TranscriptSegment(text=words, start=start, end=start + duration))
+    return segments
+
+def parse_captions(text: str, fmt: str) -> List[TranscriptSegment]:
+    """Parse caption text in 'vtt' or 'srv3' format."""
+    if fmt == "vtt":
+        return parse_vtt(text)
+    if fmt == "srv3":
+        return parse_srv3(text)
+    raise ValueError(f"Unsupported caption format: {fmt}")
+
+def parse_caption_file(path: Path) -> List[TranscriptSegment]:
+    """Parse a local caption file, format taken from its extension."""
+    path = Path(path)
+    return parse_captions(path.read_text(encoding="utf-8"), path.suffix.lstrip(".").lower())
+
+def assess_captions(
+    segments: List[TranscriptSegment],
+    duration: float,
+    min_coverage: float = 0.6,
+    min_words_per_minute: float = 40.0,
+    max_words_per_minute: float = 320.0,
+    max_noise_ratio: float = 0.3
+) -> Tuple[bool, str]:
+    """
+    Decide whether captions are good enough to replace Whisper.
+
+    Args:
+        segments: Parsed caption segments
+        duration: Video duration in seconds (0 if unknown)
+
+    Returns:
+        (usable, reason) where reason explains a rejection
+    """
+    if not segments:
+        return False, "no captions"
+    noise = sum(1 for s in segments if _NOISE.match(s.text))
+    if noise / len(segments) > max_noise_ratio:
+        return False, f"mostly non-speech cues ({noise}/{len(segments)})"
+    if duration <= 0:
+        return True, "ok"
+
+    coverage = (segments[-1].end - segments[0].start) / duration
+    if coverage < min_coverage:
+        return False, f"captions cover {coverage:.0%} of the video"
+    words = sum(len(s.text.split()) for s in segments if not _NOISE.match(s.text))
+    words_per_minute = words / (duration / 60)
+    if not min_words_per_minute <= words_per_minute <= max_words_per_minute:
+        return False, f"implausible speech rate ({words_per_minute:.0f} words/min)"
+    return True, "ok"
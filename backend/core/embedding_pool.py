@@ -0,0 +1,192 @@
+"""Length-sorted batch embedding, optionally sharded across worker processes."""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from backend.core.embeddings import create_embedding_backend
+from backend.utils.metrics import registry
+
+EMBED_POOL_FAILURES = registry.counter(
+    "videorag_embed_pool_failures_total",
+    "Index embeddings whose worker pool broke, by how they were finished",
+    ["fallback"]
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+def length_sorted_batches(texts: List[str], batch_size: int, sort_by_length: bool = True) -> List[List[int]]:
+    """
+    Split text indices into batches, longest texts first.
+
+    Transformer encoders pad every text in a batch to the longest one, so
+    grouping similar lengths removes most of the wasted padding compute.
+    """
+    order = list(range(len(texts)))
+    if sort_by_length:
+        order.sort(key=lambda i: len(texts[i]), reverse=True)
+    return [order[start:start + batch_size] for start in range(0, len(order), max(1, batch_size))]
+
+def embed_in_order(
+    texts: List[str],
+    encode: Callable[[List[str]], np.ndarray],
+    batch_size: int = 64,
+    sort_by_length: bool = True,
+    progress_callback: Optional[ProgressCallback] = None,
+    on_batch: Optional[Callable[[int, float], None]] = None
+) -> np.ndarray:
+    """
+    Embed texts in (length-sorted) batches in this process.
+
+    Args:
+        encode: Embeds one batch of texts
+        on_batch: Called with (batch length, seconds) after each batch
+
+    Returns:
+        float32 array whose rows follow the input order
+    """
+    output = None
+    done = 0
+    for indices in length_sorted_batches(texts, batch_size, sort_by_length):
+        started = time.perf_counter()
+        vectors = np.asarray(encode([texts[i] for i in indices]), dtype=np.float32)
+        if on_batch:
+            on_batch(len(indices), time.perf_counter() - started)
+        if output is None:
+            output = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+        output[indices] = vectors
+        done += len(indices)
+        if progress_callback:
+            progress_callback(done, len(texts))
+    return output if output is not None else np.zeros((0, 0), dtype=np.float32)
+
+# Per-worker-process encoder, built once by the pool initializer
+_worker_encoder = None
+
+def _init_worker(backend: str, model_name: str, options: dict, torch_threads: int):
+    global _worker_encoder
+    if torch_threads:
+        try:
+            import torch
+            torch.set_num_threads(torch_threads)
+        except ImportError:
+            pass
+    _worker_encoder = create_embedding_backend(backend, model_name, **options)
+
+def _encode_batch(texts: List[str]) -> Tuple[np.ndarray, float]:
+    started = time.perf_counter()
+    vectors = _worker_encoder.encode(texts, batch_size=len(texts), show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32), time.perf_counter() - started
+
+class EmbeddingPool:
+    """
+    Worker processes that each hold a copy of the embedding model.
+
+    Batches are sent to whichever worker is free and scattered back into
+    input order, so callers get the same array as a single-process encode.
+    Workers are spawned on first use and reused for every later build;
+    each gets an even share of the CPU threads unless threads is given.
+    A worker that dies (e.g. OOM-killed) breaks the whole executor, so a
+    broken pool is replaced and the texts re-sent once, then embedded
+    in-process.
+    """
+
+    def __init__(self, backend: str, model_name: str, options: Optional[dict] = None, workers: int = 2, threads: int = 0):
+        """
+        Args:
+            backend: Embedding backend name (see create_embedding_backend)
+            options: Backend options, rebuilt in each worker
+            threads: PyTorch threads per worker; 0 splits the CPUs evenly
+        """
+        self.backend = backend
+        self.model_name = model_name
+        self.options = dict(options or {})
+        self.workers = max(1, workers)
+        self.threads = threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.options["threads"] = self.threads
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs PyTorch/FAISS threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.backend, self.model_name, self.options, self.threads)
+                )
+            return self._executor
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        sort_by_length: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+        on_batch: Optional[Callable[[int, float], None]] = None,
+        fallback: Optional[Callable[[List[str]], np.ndarray]] = None
+    ) -> np.ndarray:
+        """
+        Same contract as embed_in_order, with batches spread over the workers.
+
+        Args:
+            fallback: In-process batch encoder used if the pool breaks twice;
+                None loads the model in this process
+        """
+        for attempt in range(2):
+            pool = self._pool()
+            try:
+                return self._encode_pooled(pool, texts, batch_size, sort_by_length, progress_callback, on_batch)
+            except BrokenProcessPool:
+                self._discard(pool)
+                EMBED_POOL_FAILURES.inc(fallback="respawn" if attempt == 0 else "in_process")
+
+        if fallback is None:
+            encoder = create_embedding_backend(self.backend, self.model_name, **self.options)
+            fallback = lambda batch: encoder.encode(batch, show_progress_bar=False)
+        return embed_in_order(texts, fallback, batch_size, sort_by_length, progress_callback, on_batch)
+
+    def _encode_pooled(
+        self,
+        pool: ProcessPoolExecutor,
+        texts: List[str],
+        batch_size: int,
+        sort_by_length: bool,
+        progress_callback: Optional[ProgressCallback],
+        on_batch: Optional[Callable[[int, float], None]]
+    ) -> np.ndarray:
+        batches = length_sorted_batches(texts, batch_size, sort_by_length)
+        futures = {pool.submit(_encode_batch, [texts[i] for i in indices]): indices for indices in batches}
+
+        output = None
+        done = 0
+        for future in as_completed(futures):
+            vectors, seconds = future.result()
+            indices = futures[future]
+            if on_batch:
+                on_batch(len(indices), seconds)
+            if output is None:
+                output = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            output[indices] = vectors
+            done += len(indices)
+            if progress_callback:
+                progress_callback(done, len(texts))
+        return output if output is not None else np.zeros((0, 0), dtype=np.float32)
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        """Drop a broken executor (unless another caller already replaced it)."""
+        with self._lock:
+            if self._executor is pool:
+                self._executor = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
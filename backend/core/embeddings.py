@@ -0,0 +1,168 @@
+"""Pluggable text embedding backends."""
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+
+class EmbeddingBackend(ABC):
+    """
+    Text encoder with the SentenceTransformer encode() shape.
+
+    VectorStore only calls encode() and reads dimension, so any backend
+    producing the same vector space can be swapped in.
+    """
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        pass
+
+    @abstractmethod
+    def encode(self, texts: List[str], show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        """Embed texts; returns float32 array of shape (len(texts), dimension)."""
+        pass
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """PyTorch SentenceTransformer (reference implementation)."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        return self.model.encode(texts, show_progress_bar=show_progress_bar, **kwargs)
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    ONNX Runtime encoder for sentence-transformers BERT-style models.
+
+    Uses the ONNX export published in the model repo (onnx/model.onnx),
+    optionally dynamically quantized to int8 once and cached next to it.
+    Applies the same mean pooling and L2 normalization as the
+    SentenceTransformer pipeline, so vectors stay comparable with indexes
+    built by the PyTorch backend.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantize: bool = False,
+        max_seq_length: int = 256,
+        threads: int = 0,
+        cache_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            model_name: Hugging Face repo id, e.g. sentence-transformers/all-MiniLM-L6-v2
+            quantize: Use int8 dynamic quantization (faster on CPU, ~0.99 cosine agreement)
+            max_seq_length: Token truncation length (256 for MiniLM)
+            threads: ONNX Runtime intra-op threads; 0 = runtime default
+            cache_dir: Where the quantized model is written
+        """
+        import onnxruntime as ort
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        model_path = Path(hf_hub_download(model_name, "onnx/model.onnx"))
+        if quantize:
+            model_path = self._quantized(model_path, Path(cache_dir) if cache_dir else model_path.parent)
+
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(model_name, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self._dimension = int(self.encode(["dimension probe"]).shape[1])
+
+    @staticmethod
+    def _quantized(model_path: Path, cache_dir: Path) -> Path:
+        """int8 dynamically quantized copy of the model, built on first use."""
+        target = cache_dir / f"{model_path.stem}_int8.onnx"
+        if not target.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(".tmp.onnx")
+            quantize_dynamic(str(model_path), str(tmp), weight_type=QuantType.QInt8)
+            tmp.replace(target)
+        return target
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False, batch_size: int = 32, **kwargs) -> np.ndarray:
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real tokens, then L2 normalize
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            outputs.append(pooled.astype(np.float32))
+        if not outputs:
+            return np.zeros((0, getattr(self, "_dimension", 0)), dtype=np.float32)
+        return np.vstack(outputs)
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Feature-hashing embedder.
+
+    Needs no model download, so index/search costs can be measured without
+    network access. Similarity reflects shared words only.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self._dimension = dimension
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, texts: List[str], show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self._dimension), dtype='float32')
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                h = zlib.crc32(word.encode())
+                embeddings[row, h % self._dimension] += 1.0 if h & 0x80000000 else -1.0
+        return embeddings
+
+EMBEDDING_BACKENDS = ("sentence-transformers", "onnx", "onnx-int8", "hashing")
+
+def create_embedding_backend(backend: str, model_name: str, **kwargs) -> EmbeddingBackend:
+    """
+    Factory for embedding backends.
+
+    Args:
+        backend: sentence-transformers | onnx | onnx-int8 | hashing
+        model_name: Model repo id (ignored by hashing)
+        **kwargs: Backend options (threads, cache_dir, dimension for hashing)
+    """
+    if backend == "sentence-transformers":
+        return SentenceTransformerBackend(model_name)
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxBackend(
+            model_name,
+            quantize=backend == "onnx-int8",
+            threads=kwargs.get("threads", 0),
+            cache_dir=kwargs.get("cache_dir")
+        )
+    if backend == "hashing":
+        return HashingBackend(kwargs.get("dimension") or 384)
+    raise ValueError(f"Unknown embedding backend: {backend}")
@@ -1,67 +1,502 @@
 """LLM adapter supporting Groq and Ollama."""
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import threading
+import time
 import requests
 from groq import Groq
+from backend.utils.metrics import registry
+from backend.utils.tracing import tracer
+
+LLM_REQUEST_SECONDS = registry.histogram(
+    "videorag_llm_request_seconds", "LLM generation latency", ["provider"]
+)
+LLM_TOKENS = registry.counter(
+    "videorag_llm_tokens_total", "LLM tokens processed", ["provider", "direction"]
+)
+LLM_ERRORS = registry.counter(
+    "videorag_llm_errors_total", "Failed LLM generation calls", ["provider"]
+)
+LLM_IN_FLIGHT = registry.gauge(
+    "videorag_llm_requests_in_flight", "LLM calls currently waiting on the provider", ["provider"]
+)
+LLM_MODEL_LOAD_SECONDS = registry.histogram(
+    "videorag_llm_model_load_seconds", "Model load time reported by local providers (cold starts)", ["provider"]
+)
+LLM_WARMUPS = registry.counter(
+    "videorag_llm_warmups_total", "Model preload / keep-warm pings", ["provider", "result"]
+)
 
 class LLMAdapter(ABC):
     """Abstract base class for LLM providers."""
     
     @abstractmethod
-    def generate(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Generate response from prompt."""
+    def generate(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> str:
+        """
+        Generate response from prompt.
+        
+        Args:
+            system: Static instruction prefix, sent separately so providers
+                can cache its processing across requests
+            conversation_id: Lets adapters that support it reuse state
+                across turns of one conversation
+            turn: Turns of the conversation answered before this one
+        """
         pass
+    
+    def generate_stream(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> Iterator[str]:
+        """
+        Generate a response as text pieces, as the provider produces them.
+        
+        Adapters without native streaming yield the whole answer at once.
+        """
+        yield self.generate(prompt, max_tokens, system, conversation_id, turn)
+    
+    def has_context(self, conversation_id: Optional[str], turn: int = 0) -> bool:
+        """
+        Whether a call at `turn` continues provider-side state that already
+        holds exactly the conversation's `turn` earlier turns, so the prompt
+        should carry only the new excerpts and question.
+        """
+        return False
 
 class GroqAdapter(LLMAdapter):
     """Groq API adapter."""
     
-    def __init__(self, api_key: str, model: str = "llama-3.1-70b-versatile"):
-        self.client = Groq(api_key=api_key)
+    def __init__(
+        self, 
+        api_key: str, 
+        model: str = "llama-3.1-70b-versatile",
+        timeout: Optional[float] = None,
+        max_retries: int = 2
+    ):
+        """
+        Args:
+            timeout: Per-request timeout in seconds (SDK default if None)
+            max_retries: SDK-level retries; 0 when wrapped by ResilientLLMAdapter
+        """
+        client_kwargs = {"api_key": api_key, "max_retries": max_retries}
+        if timeout is not None:
+            client_kwargs["timeout"] = timeout
+        self.client = Groq(**client_kwargs)
         self.model = model
     
-    def generate(self, prompt: str, max_tokens: int = 1000) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=0.1,  # Low temperature for factual responses
-        )
+    def generate(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> str:
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        with tracer.span("llm.request", provider="groq", model=self.model) as span, \
+                LLM_IN_FLIGHT.track_inprogress(provider="groq"), \
+                LLM_REQUEST_SECONDS.time(provider="groq"):
+            try:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.1,  # Low temperature for factual responses
+                )
+            except Exception:
+                LLM_ERRORS.inc(provider="groq")
+                raise
+            if response.usage is not None:
+                LLM_TOKENS.inc(response.usage.prompt_tokens, provider="groq", direction="in")
+                LLM_TOKENS.inc(response.usage.completion_tokens, provider="groq", direction="out")
+                span.set(
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=response.usage.completion_tokens
+                )
         return response.choices[0].message.content
+    
+    def generate_stream(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> Iterator[str]:
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        with tracer.span("llm.request", provider="groq", model=self.model, stream=True) as span, \
+                LLM_IN_FLIGHT.track_inprogress(provider="groq"), \
+                LLM_REQUEST_SECONDS.time(provider="groq"):
+            try:
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.1,
+                    stream=True
+                )
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                    usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                    if usage is not None:
+                        LLM_TOKENS.inc(usage.prompt_tokens, provider="groq", direction="in")
+                        LLM_TOKENS.inc(usage.completion_tokens, provider="groq", direction="out")
+                        span.set(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            except Exception:
+                LLM_ERRORS.inc(provider="groq")
+                raise
 
 class OllamaAdapter(LLMAdapter):
-    """Ollama local API adapter."""
+    """
+    Ollama local API adapter.
+    
+    Manages model residency (keep_alive on every request, optional preload
+    and periodic warm pings) so requests don't pay multi-second cold loads,
+    and can reuse Ollama's returned context across turns of a conversation.
+    """
+    
+    MAX_CONVERSATIONS = 256
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.1"):
+    # Preloads / warmers shared by all adapters for the same model
+    _warmers: Dict[Tuple[str, str], threading.Thread] = {}
+    _warm_lock = threading.Lock()
+    
+    def __init__(
+        self, 
+        base_url: str = "http://localhost:11434", 
+        model: str = "llama3.1",
+        timeout: Optional[float] = None,
+        keep_alive: Optional[str] = None,
+        reuse_context: bool = False,
+        max_context_tokens: int = 4096
+    ):
+        """
+        Args:
+            timeout: Per-request timeout in seconds (None waits forever)
+            keep_alive: How long Ollama keeps the model loaded after a
+                request (e.g. "30m", "-1" for forever); server default if None
+            reuse_context: Continue from Ollama's returned context for
+                follow-up turns with the same conversation_id
+            max_context_tokens: Start a fresh context once the stored one
+                grows beyond this many tokens
+        """
         self.base_url = base_url.rstrip('/')
         self.model = model
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.reuse_context = reuse_context
+        self.max_context_tokens = max_context_tokens
+        # conversation_id -> (turns the context covers, context)
+        self._contexts: "OrderedDict[str, Tuple[int, List[int]]]" = OrderedDict()
+        self._contexts_lock = threading.Lock()
     
-    def generate(self, prompt: str, max_tokens: int = 1000) -> str:
-        response = requests.post(
-            f"{self.base_url}/api/generate",
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.1,
-                    "num_predict": max_tokens
-                }
+    def build_payload(
+        self, 
+        prompt: str, 
+        max_tokens: int, 
+        system: Optional[str] = None,
+        stream: bool = False,
+        context: Optional[List[int]] = None
+    ) -> dict:
+        """Request body for /api/generate."""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": 0.1,
+                "num_predict": max_tokens
             }
-        )
-        response.raise_for_status()
-        return response.json()["response"]
+        }
+        if context:
+            # System prompt is already part of the continued context
+            payload["context"] = context
+        elif system:
+            payload["system"] = system
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+    
+    def generate(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> str:
+        context = self._context(conversation_id, turn)
+        
+        with tracer.span("llm.request", provider="ollama", model=self.model) as span, \
+                LLM_IN_FLIGHT.track_inprogress(provider="ollama"), \
+                LLM_REQUEST_SECONDS.time(provider="ollama"):
+            try:
+                response = requests.post(
+                    f"{self.base_url}/api/generate",
+                    json=self.build_payload(prompt, max_tokens, system, context=context),
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+            except Exception:
+                LLM_ERRORS.inc(provider="ollama")
+                raise
+            data = response.json()
+            span.set(
+                prompt_tokens=data.get("prompt_eval_count", 0),
+                completion_tokens=data.get("eval_count", 0),
+                model_load_ms=round(data.get("load_duration", 0) / 1e6, 1),
+                reused_context=context is not None
+            )
+        LLM_TOKENS.inc(data.get("prompt_eval_count", 0), provider="ollama", direction="in")
+        LLM_TOKENS.inc(data.get("eval_count", 0), provider="ollama", direction="out")
+        if data.get("load_duration"):
+            LLM_MODEL_LOAD_SECONDS.observe(data["load_duration"] / 1e9, provider="ollama")
+        
+        if self.reuse_context and conversation_id and data.get("context"):
+            self._store_context(conversation_id, turn + 1, data["context"])
+        return data["response"]
+    
+    def generate_stream(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> Iterator[str]:
+        context = self._context(conversation_id, turn)
+        
+        data = {}
+        with tracer.span("llm.request", provider="ollama", model=self.model, stream=True) as span, \
+                LLM_IN_FLIGHT.track_inprogress(provider="ollama"), \
+                LLM_REQUEST_SECONDS.time(provider="ollama"):
+            try:
+                with requests.post(
+                    f"{self.base_url}/api/generate",
+                    json=self.build_payload(prompt, max_tokens, system, stream=True, context=context),
+                    timeout=self.timeout,
+                    stream=True
+                ) as response:
+                    response.raise_for_status()
+                    # One JSON object per line; the last has done=true and the stats
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        data = json.loads(line)
+                        if data.get("response"):
+                            yield data["response"]
+                        if data.get("done"):
+                            break
+            except Exception:
+                LLM_ERRORS.inc(provider="ollama")
+                raise
+            span.set(
+                prompt_tokens=data.get("prompt_eval_count", 0),
+                completion_tokens=data.get("eval_count", 0),
+                model_load_ms=round(data.get("load_duration", 0) / 1e6, 1),
+                reused_context=context is not None
+            )
+        LLM_TOKENS.inc(data.get("prompt_eval_count", 0), provider="ollama", direction="in")
+        LLM_TOKENS.inc(data.get("eval_count", 0), provider="ollama", direction="out")
+        if data.get("load_duration"):
+            LLM_MODEL_LOAD_SECONDS.observe(data["load_duration"] / 1e9, provider="ollama")
+        
+        if self.reuse_context and conversation_id and data.get("context"):
+            self._store_context(conversation_id, turn + 1, data["context"])
+    
+    def has_context(self, conversation_id: Optional[str], turn: int = 0) -> bool:
+        return self._context(conversation_id, turn) is not None
+    
+    def _context(self, conversation_id: Optional[str], turn: int) -> Optional[List[int]]:
+        """
+        Stored context for the conversation, if it covers exactly `turn`
+        turns; one that missed a turn (answered elsewhere, or by another
+        request) would silently drop it from the model's view.
+        """
+        if not (self.reuse_context and conversation_id):
+            return None
+        with self._contexts_lock:
+            stored = self._contexts.get(conversation_id)
+        if stored is None or stored[0] != turn:
+            return None
+        return stored[1]
+    
+    def _store_context(self, conversation_id: str, turns: int, context: List[int]):
+        """Remember a conversation's context, covering `turns` turns, in a bounded LRU."""
+        with self._contexts_lock:
+            self._contexts.pop(conversation_id, None)
+            if len(context) <= self.max_context_tokens:
+                self._contexts[conversation_id] = (turns, context)
+            while len(self._contexts) > self.MAX_CONVERSATIONS:
+                self._contexts.popitem(last=False)
+    
+    def forget_conversation(self, conversation_id: str):
+        """Drop stored context for a conversation."""
+        with self._contexts_lock:
+            self._contexts.pop(conversation_id, None)
+    
+    def preload(self) -> bool:
+        """
+        Load the model into memory without generating.
+        
+        Ollama loads a model when it receives a request with no prompt.
+        """
+        body = {"model": self.model}
+        if self.keep_alive is not None:
+            body["keep_alive"] = self.keep_alive
+        try:
+            response = requests.post(f"{self.base_url}/api/generate", json=body, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            LLM_WARMUPS.inc(provider="ollama", result="error")
+            return False
+        LLM_WARMUPS.inc(provider="ollama", result="ok")
+        return True
+    
+    def start_warmer(self, interval: float = 0.0):
+        """
+        Preload the model in the background, then optionally re-ping it.
+        
+        Only one warmer runs per (base_url, model) in a process.
+        
+        Args:
+            interval: Seconds between keep-warm pings; 0 preloads once
+        """
+        key = (self.base_url, self.model)
+        with self._warm_lock:
+            if key in self._warmers:
+                return
+            
+            def run():
+                self.preload()
+                while interval > 0:
+                    time.sleep(interval)
+                    self.preload()
+            
+            thread = threading.Thread(target=run, name=f"ollama-warm-{self.model}", daemon=True)
+            self._warmers[key] = thread
+            thread.start()
+
+class FakeAdapter(LLMAdapter):
+    """
+    Deterministic offline adapter for benchmarks and load tests.
+    
+    Simulates a provider with a fixed time-to-first-token plus a token
+    generation rate; the same prompt always yields the same answer.
+    """
+    
+    def __init__(self, latency: float = 0.0, tokens_per_second: float = 0.0, answer_tokens: int = 64):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.answer_tokens = answer_tokens
+    
+    def generate(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> str:
+        num_tokens = min(max_tokens, self.answer_tokens)
+        digest = hashlib.sha1(((system or "") + prompt).encode()).hexdigest()
+        words = [f"{digest[i % 40:i % 40 + 4]}" for i in range(num_tokens)]
+        
+        with tracer.span(
+            "llm.request", provider="fake",
+            prompt_tokens=(len(system or "") + len(prompt)) // 4, completion_tokens=num_tokens
+        ), LLM_IN_FLIGHT.track_inprogress(provider="fake"), \
+                LLM_REQUEST_SECONDS.time(provider="fake"):
+            delay = self.latency
+            if self.tokens_per_second > 0:
+                delay += num_tokens / self.tokens_per_second
+            if delay > 0:
+                time.sleep(delay)
+        
+        LLM_TOKENS.inc((len(system or "") + len(prompt)) // 4, provider="fake", direction="in")
+        LLM_TOKENS.inc(num_tokens, provider="fake", direction="out")
+        return " ".join(words)
+    
+    def generate_stream(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000, 
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> Iterator[str]:
+        num_tokens = min(max_tokens, self.answer_tokens)
+        digest = hashlib.sha1(((system or "") + prompt).encode()).hexdigest()
+        
+        with tracer.span(
+            "llm.request", provider="fake", stream=True,
+            prompt_tokens=(len(system or "") + len(prompt)) // 4, completion_tokens=num_tokens
+        ), LLM_IN_FLIGHT.track_inprogress(provider="fake"), \
+                LLM_REQUEST_SECONDS.time(provider="fake"):
+            if self.latency > 0:
+                time.sleep(self.latency)
+            for i in range(num_tokens):
+                if self.tokens_per_second > 0:
+                    time.sleep(1 / self.tokens_per_second)
+                yield ("" if i == 0 else " ") + digest[i % 40:i % 40 + 4]
+        
+        LLM_TOKENS.inc((len(system or "") + len(prompt)) // 4, provider="fake", direction="in")
+        LLM_TOKENS.inc(num_tokens, provider="fake", direction="out")
 
 def create_llm_adapter(provider: str, **kwargs) -> LLMAdapter:
-    """Factory function to create LLM adapter."""
+    """
+    Factory function to create LLM adapter.
+    
+    Pass resilience={...} (ResilientLLMAdapter settings) to wrap the
+    adapter with rate limiting, retries and hedging.
+    """
+    resilience = kwargs.get("resilience")
     if provider == "groq":
-        return GroqAdapter(
+        adapter = GroqAdapter(
             api_key=kwargs.get("api_key"),
-            model=kwargs.get("model", "llama-3.1-70b-versatile")
+            model=kwargs.get("model", "llama-3.1-70b-versatile"),
+            timeout=kwargs.get("timeout"),
+            # Retries are handled by the resilience layer when enabled
+            max_retries=0 if resilience else 2
         )
     elif provider == "ollama":
-        return OllamaAdapter(
+        adapter = OllamaAdapter(
             base_url=kwargs.get("base_url", "http://localhost:11434"),
-            model=kwargs.get("model", "llama3.1")
+            model=kwargs.get("model", "llama3.1"),
+            timeout=kwargs.get("timeout"),
+            keep_alive=kwargs.get("keep_alive"),
+            reuse_context=kwargs.get("reuse_context", False)
+        )
+        if kwargs.get("preload"):
+            adapter.start_warmer(interval=kwargs.get("warm_interval", 0.0))
+    elif provider == "fake":
+        adapter = FakeAdapter(
+            latency=kwargs.get("latency", 0.0),
+            tokens_per_second=kwargs.get("tokens_per_second", 0.0)
         )
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
+    
+    if resilience:
+        from backend.core.llm_resilience import ResilientLLMAdapter
+        adapter = ResilientLLMAdapter(adapter, provider, **resilience)
+    return adapter
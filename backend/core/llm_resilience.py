@@ -0,0 +1,365 @@
+"""Rate limiting, bounded concurrency, retries and hedging for LLM calls."""
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, Optional, Tuple
+import requests
+from backend.core.llm_adapter import LLMAdapter
+from backend.utils.metrics import registry
+from backend.utils.tracing import tracer
+
+LLM_RETRIES = registry.counter(
+    "videorag_llm_retries_total", "LLM call retries by reason", ["provider", "reason"]
+)
+LLM_GIVE_UPS = registry.counter(
+    "videorag_llm_give_ups_total", "LLM calls that failed after retries or deadline", ["provider"]
+)
+LLM_HEDGES = registry.counter(
+    "videorag_llm_hedged_requests_total", "Hedged duplicate LLM requests by winner", ["provider", "winner"]
+)
+LLM_LIMIT_WAIT_SECONDS = registry.histogram(
+    "videorag_llm_rate_limit_wait_seconds", "Time spent waiting for rate limit or concurrency slots", ["provider"]
+)
+
+class LLMUnavailableError(RuntimeError):
+    """Provider could not serve the request within its deadline."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self._tokens = per_minute
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float) -> bool:
+        """Take tokens without waiting."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._blocked_until and self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def acquire(self, amount: float, deadline: float) -> bool:
+        """Wait for tokens until the monotonic deadline; False if it would pass."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait_for = max(self._blocked_until - now, (amount - self._tokens) / self.rate)
+            if now + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+    def block_for(self, seconds: float):
+        """Pause all callers, e.g. after the provider answered 429 with Retry-After."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+class ProviderLimiter:
+    """Request/token rate limits and a concurrency cap shared per provider."""
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0, max_concurrency: int = 0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+
+    def acquire_rate(self, tokens: float, deadline: float) -> bool:
+        if self.requests and not self.requests.acquire(1, deadline):
+            return False
+        if self.tokens and not self.tokens.acquire(tokens, deadline):
+            return False
+        return True
+
+    def try_acquire_rate(self, tokens: float) -> bool:
+        if self.requests and not self.requests.try_acquire(1):
+            return False
+        if self.tokens and not self.tokens.try_acquire(tokens):
+            return False
+        return True
+
+    def block_for(self, seconds: float):
+        for bucket in (self.requests, self.tokens):
+            if bucket:
+                bucket.block_for(seconds)
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_provider_limiter(provider: str, **settings) -> ProviderLimiter:
+    """One limiter per provider, shared by every adapter in the process."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = ProviderLimiter(**settings)
+        return _limiters[provider]
+
+def classify_error(exc: Exception) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Decide whether an LLM error is worth retrying.
+
+    Works for both requests (Ollama) and the Groq SDK without importing
+    provider-specific exception types.
+
+    Returns:
+        (reason or None if not retryable, Retry-After seconds if given)
+    """
+    response = getattr(exc, 'response', None)
+    status = getattr(exc, 'status_code', None) or getattr(response, 'status_code', None)
+    retry_after = None
+    headers = getattr(response, 'headers', None)
+    if headers:
+        try:
+            retry_after = float(headers.get('retry-after'))
+        except (TypeError, ValueError):
+            pass
+
+    if status == 429:
+        return 'rate_limited', retry_after
+    if status is not None and 500 <= status < 600:
+        return 'server_error', retry_after
+    if isinstance(exc, (requests.Timeout, TimeoutError)) or 'Timeout' in type(exc).__name__:
+        return 'timeout', None
+    if isinstance(exc, requests.ConnectionError) or 'Connection' in type(exc).__name__:
+        return 'connection', None
+    return None, None
+
+class ResilientLLMAdapter(LLMAdapter):
+    """
+    Wraps an LLMAdapter with provider-aware resilience.
+
+    - Requests/tokens per minute token buckets and a concurrency cap,
+      shared by all adapters of the same provider
+    - Deadline-aware retries with full-jitter exponential backoff,
+      honouring Retry-After
+    - Optional hedging: if an attempt hasn't finished after hedge_after
+      seconds, a duplicate is sent and the first success wins
+    """
+
+    def __init__(
+        self,
+        inner: LLMAdapter,
+        provider: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 0,
+        max_retries: int = 3,
+        deadline: float = 60.0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        hedge_after: float = 0.0
+    ):
+        self.inner = inner
+        self.provider = provider
+        self.limiter = get_provider_limiter(
+            provider,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_concurrency=max_concurrency
+        )
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, 2 * max_concurrency), thread_name_prefix=f"llm-{provider}"
+        ) if hedge_after > 0 else None
+
+    def generate(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> str:
+        deadline = time.monotonic() + self.deadline
+        estimated_tokens = (len(system or "") + len(prompt)) / 4 + max_tokens
+        call_kwargs = {
+            "max_tokens": max_tokens, "system": system, "conversation_id": conversation_id, "turn": turn
+        }
+        last_error: Optional[Exception] = None
+        retry_after: Optional[float] = None
+
+        with tracer.span(
+            "llm.generate", provider=self.provider,
+            estimated_prompt_tokens=int(estimated_tokens - max_tokens), max_tokens=max_tokens
+        ):
+            for attempt in range(self.max_retries + 1):
+                waited = time.monotonic()
+                if not self.limiter.acquire_rate(estimated_tokens, deadline):
+                    break
+                limit_wait = time.monotonic() - waited
+                LLM_LIMIT_WAIT_SECONDS.observe(limit_wait, provider=self.provider)
+                tracer.annotate(attempts=attempt + 1, rate_limit_wait_ms=round(limit_wait * 1000, 1))
+
+                try:
+                    return self._attempt(prompt, call_kwargs, estimated_tokens, deadline)
+                except LLMUnavailableError:
+                    LLM_GIVE_UPS.inc(provider=self.provider)
+                    raise
+                except Exception as e:
+                    reason, retry_after = classify_error(e)
+                    if reason is None:
+                        raise
+                    last_error = e
+                    if reason == 'rate_limited' and retry_after:
+                        self.limiter.block_for(retry_after)
+                    if attempt == self.max_retries:
+                        break
+                    backoff = retry_after or random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                    if time.monotonic() + backoff >= deadline:
+                        break
+                    LLM_RETRIES.inc(provider=self.provider, reason=reason)
+                    time.sleep(backoff)
+
+            LLM_GIVE_UPS.inc(provider=self.provider)
+            raise LLMUnavailableError(
+                f"{self.provider} unavailable: {last_error or 'rate limit deadline exceeded'}",
+                retry_after=retry_after
+            )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        system: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        turn: int = 0
+    ) -> Iterator[str]:
+        """
+        Stream under the same limits; retried only until the first piece arrives.
+
+        Streams are never hedged: a duplicate can't be merged into text
+        the caller has already shown.
+        """
+        deadline = time.monotonic() + self.deadline
+        estimated_tokens = (len(system or "") + len(prompt)) / 4 + max_tokens
+        last_error: Optional[Exception] = None
+        retry_after: Optional[float] = None
+
+        with tracer.span(
+            "llm.generate", provider=self.provider, stream=True,
+            estimated_prompt_tokens=int(estimated_tokens - max_tokens), max_tokens=max_tokens
+        ):
+            for attempt in range(self.max_retries + 1):
+                waited = time.monotonic()
+                if not self.limiter.acquire_rate(estimated_tokens, deadline):
+                    break
+                limit_wait = time.monotonic() - waited
+                LLM_LIMIT_WAIT_SECONDS.observe(limit_wait, provider=self.provider)
+                tracer.annotate(attempts=attempt + 1, rate_limit_wait_ms=round(limit_wait * 1000, 1))
+
+                if self.limiter.slots is not None:
+                    waited = time.monotonic()
+                    if not self.limiter.slots.acquire(timeout=max(0.0, deadline - waited)):
+                        LLM_GIVE_UPS.inc(provider=self.provider)
+                        raise LLMUnavailableError(f"{self.provider} concurrency limit: no slot before deadline")
+                    LLM_LIMIT_WAIT_SECONDS.observe(time.monotonic() - waited, provider=self.provider)
+                started = False
+                try:
+                    for piece in self.inner.generate_stream(
+                        prompt, max_tokens=max_tokens, system=system, conversation_id=conversation_id, turn=turn
+                    ):
+                        started = True
+                        yield piece
+                    return
+                except Exception as e:
+                    reason, retry_after = classify_error(e)
+                    if started or reason is None:
+                        raise
+                    last_error = e
+                    if reason == 'rate_limited' and retry_after:
+                        self.limiter.block_for(retry_after)
+                finally:
+                    if self.limiter.slots is not None:
+                        self.limiter.slots.release()
+
+                if attempt == self.max_retries:
+                    break
+                backoff = retry_after or random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                if time.monotonic() + backoff >= deadline:
+                    break
+                LLM_RETRIES.inc(provider=self.provider, reason=reason)
+                time.sleep(backoff)
+
+            LLM_GIVE_UPS.inc(provider=self.provider)
+            raise LLMUnavailableError(
+                f"{self.provider} unavailable: {last_error or 'rate limit deadline exceeded'}",
+                retry_after=retry_after
+            )
+
+    def has_context(self, conversation_id: Optional[str], turn: int = 0) -> bool:
+        return self.inner.has_context(conversation_id, turn)
+
+    def _call(self, prompt: str, call_kwargs: dict, deadline: float) -> str:
+        """One physical provider call inside a concurrency slot."""
+        if self.limiter.slots is not None:
+            waited = time.monotonic()
+            if not self.limiter.slots.acquire(timeout=max(0.0, deadline - waited)):
+                raise LLMUnavailableError(f"{self.provider} concurrency limit: no slot before deadline")
+            LLM_LIMIT_WAIT_SECONDS.observe(time.monotonic() - waited, provider=self.provider)
+            tracer.annotate(slot_wait_ms=round((time.monotonic() - waited) * 1000, 1))
+        try:
+            return self.inner.generate(prompt, **call_kwargs)
+        finally:
+            if self.limiter.slots is not None:
+                self.limiter.slots.release()
+
+    def _attempt(self, prompt: str, call_kwargs: dict, estimated_tokens: float, deadline: float) -> str:
+        """One logical attempt, optionally hedged with a duplicate request."""
+        if self._executor is None:
+            return self._call(prompt, call_kwargs, deadline)
+
+        # Run in a copy of the caller's context so request traces follow
+        primary = self._executor.submit(contextvars.copy_context().run, self._call, prompt, call_kwargs, deadline)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        futures = {primary: 'primary'}
+        # Only hedge when it fits the rate budget; never queue for it
+        if self.limiter.try_acquire_rate(estimated_tokens):
+            futures[self._executor.submit(
+                contextvars.copy_context().run, self._call, prompt, call_kwargs, deadline
+            )] = 'hedge'
+
+        pending = set(futures)
+        error: Optional[Exception] = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if len(futures) > 1:
+                    LLM_HEDGES.inc(provider=self.provider, winner=futures[future])
+                return result
+        if error is not None:
+            raise error
+        raise LLMUnavailableError(f"{self.provider} did not respond before deadline")
@@ -0,0 +1,81 @@
+"""Prompt templates shared by the RAG pipeline and LangGraph agents."""
+from typing import Dict, List, Optional
+from backend.models import DocumentChunk
+
+# Static instruction prefix. Kept byte-identical across requests and sent as
+# the system message so providers can reuse its cached prompt processing.
+SYSTEM_PROMPT = """You are a video content assistant. Answer the question using ONLY the information from the video transcript provided below.
+
+STRICT RULES:
+1. Only use information explicitly stated in the transcript
+2. If the answer is not in the transcript, say "This information is not covered in the video"
+3. Reference timestamps when possible (e.g., "At 2:30, the speaker mentions...")
+4. Do not add external knowledge or speculation
+5. Be concise and direct"""
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as MM:SS or HH:MM:SS."""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+def build_context(chunks: List[DocumentChunk]) -> str:
+    """Number transcript excerpts and tag them with their timestamps."""
+    return "\n\n".join(
+        f"[{i}] (Timestamp: {format_timestamp(chunk.start_time)})\n{chunk.text}"
+        for i, chunk in enumerate(chunks, 1)
+    )
+
+def format_history(history: List[Dict]) -> str:
+    """Render compressed conversation history (summary entry, then turns)."""
+    parts = []
+    for turn in history:
+        if "summary" in turn:
+            parts.append(f"Summary of earlier conversation: {turn['summary']}")
+        else:
+            parts.append(f"Q: {turn['query']}\nA: {turn['answer']}")
+    return "\n\n".join(parts)
+
+def build_user_prompt(
+    question: str,
+    chunks: List[DocumentChunk],
+    history: Optional[List[Dict]] = None
+) -> str:
+    """Per-request part of the prompt: history, retrieved excerpts and the question."""
+    conversation = ""
+    if history:
+        # Only helps resolve follow-up questions; facts still come from the transcript
+        conversation = f"CONVERSATION SO FAR:\n{format_history(history)}\n\n"
+    return f"""{conversation}TRANSCRIPT EXCERPTS:
+{build_context(chunks)}
+
+QUESTION: {question}
+
+ANSWER:"""
+
+def contextualize_query(question: str, history: Optional[List[Dict]] = None, max_words: int = 8) -> str:
+    """
+    Search text for a question, given the conversation so far.
+
+    Short follow-ups ("what about the second one?") rarely match the
+    transcript on their own, so they are searched together with the
+    previous question.
+    """
+    turns = [turn for turn in history or [] if "query" in turn]
+    if not turns or len(question.split()) > max_words:
+        return question
+    return f"{turns[-1]['query']} {question}"
+
+def build_summary_prompt(previous_summary: str, turns: List[Dict]) -> str:
+    """Prompt that folds older turns into the running conversation summary."""
+    earlier = f"EXISTING SUMMARY:\n{previous_summary}\n\n" if previous_summary else ""
+    return f"""{earlier}NEW TURNS:
+{format_history(turns)}
+
+Update the summary of this conversation about a video in at most 3 sentences. Keep the topics asked about and the key facts answered. Output only the summary.
+
+SUMMARY:"""
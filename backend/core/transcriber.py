@@ -1,41 +1,162 @@
 """Audio transcription using faster-whisper."""
+import os
+from dataclasses import dataclass, field, replace
 from faster_whisper import WhisperModel
-from typing import List
+from typing import Dict, List, Optional, Callable, Tuple
 from backend.models import TranscriptSegment
+from backend.core.word_timings import WordTimings
+
+try:  # faster-whisper >= 1.1
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None
+
+@dataclass(frozen=True)
+class TranscriptionProfile:
+    """Decoding and threading settings traded off for speed vs accuracy."""
+    beam_size: int = 5
+    best_of: int = 5
+    batch_size: int = 0  # >0 decodes VAD chunks in batches (BatchedInferencePipeline)
+    compute_type: str = "int8"
+    cpu_threads: int = 0  # 0 = library default; -1 = all cores
+    num_workers: int = 1  # Parallel transcribe() calls sharing the model
+    # Fallback temperatures when decoding fails compression/log-prob checks
+    temperature: Tuple[float, ...] = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+    condition_on_previous_text: bool = True
+    vad_filter: bool = True
+    vad_parameters: Dict = field(default_factory=dict)
+
+TRANSCRIPTION_PROFILES: Dict[str, TranscriptionProfile] = {
+    # Greedy, batched, no temperature fallback; best throughput
+    "fast": TranscriptionProfile(
+        beam_size=1,
+        best_of=1,
+        batch_size=16,
+        cpu_threads=-1,
+        temperature=(0.0,),
+        condition_on_previous_text=False,
+        vad_parameters={"min_silence_duration_ms": 500}
+    ),
+    # Previous fixed behaviour
+    "balanced": TranscriptionProfile(),
+    # Full-precision weights and wider search
+    "accurate": TranscriptionProfile(
+        beam_size=8,
+        best_of=5,
+        compute_type="float32",
+        cpu_threads=-1,
+        vad_parameters={"speech_pad_ms": 600}
+    ),
+}
 
 class Transcriber:
     """Transcribes audio files with timestamp preservation."""
     
-    def __init__(self, model_size: str = "base", device: str = "cpu"):
+    def __init__(
+        self,
+        model_size: str = "base",
+        device: str = "cpu",
+        word_timestamps: bool = False,
+        profile: str = "balanced",
+        cpu_threads: Optional[int] = None,
+        num_workers: Optional[int] = None
+    ):
         """
         Initialize Whisper model.
         
         Args:
             model_size: tiny, base, small, medium, large-v2
             device: cpu or cuda
+            word_timestamps: Run the word alignment pass and keep per-word
+                times. Costs extra decode time; off by default.
+            profile: fast | balanced | accurate (see TRANSCRIPTION_PROFILES)
+            cpu_threads: Override the profile's thread count
+            num_workers: Override the profile's worker count
         """
-        self.model = WhisperModel(model_size, device=device, compute_type="int8")
+        if profile not in TRANSCRIPTION_PROFILES:
+            raise ValueError(f"Unknown transcription profile: {profile}")
+        self.profile = TRANSCRIPTION_PROFILES[profile]
+        if cpu_threads is not None:
+            self.profile = replace(self.profile, cpu_threads=cpu_threads)
+        if num_workers is not None:
+            self.profile = replace(self.profile, num_workers=num_workers)
+        
+        threads = self.profile.cpu_threads
+        if threads < 0:
+            threads = os.cpu_count() or 0
+        compute_type = self.profile.compute_type
+        if device == "cuda" and compute_type == "float32":
+            compute_type = "float16"
+        
+        self.model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=threads,
+            num_workers=self.profile.num_workers
+        )
+        self.pipeline = None
+        if self.profile.batch_size > 0 and BatchedInferencePipeline is not None:
+            self.pipeline = BatchedInferencePipeline(model=self.model)
+        self.word_timestamps = word_timestamps
     
-    def transcribe(self, audio_path: str) -> List[TranscriptSegment]:
+    def transcribe(
+        self, 
+        audio_path: str, 
+        progress_callback: Optional[Callable[[float, float], None]] = None
+    ) -> List[TranscriptSegment]:
         """
-        Transcribe audio file with word-level timestamps.
+        Transcribe audio file with segment-level timestamps.
+        
+        Args:
+            audio_path: Path to audio file
+            progress_callback: Called with (transcribed_seconds, total_seconds)
+                as each segment is decoded
         
         Returns:
             List of TranscriptSegment with text and timestamps
         """
-        segments, info = self.model.transcribe(
-            audio_path,
-            beam_size=5,
-            word_timestamps=True,
-            vad_filter=True,  # Voice activity detection
+        segments, _ = self.transcribe_with_words(audio_path, progress_callback)
+        return segments
+    
+    def transcribe_with_words(
+        self,
+        audio_path: str,
+        progress_callback: Optional[Callable[[float, float], None]] = None
+    ) -> Tuple[List[TranscriptSegment], Optional[WordTimings]]:
+        """
+        Transcribe audio file, keeping word timings if enabled.
+        
+        Returns:
+            (segments, word timings or None when word_timestamps is off)
+        """
+        profile = self.profile
+        options = dict(
+            beam_size=profile.beam_size,
+            best_of=profile.best_of,
+            temperature=list(profile.temperature),
+            condition_on_previous_text=profile.condition_on_previous_text,
+            word_timestamps=self.word_timestamps,
+            vad_filter=profile.vad_filter,  # Voice activity detection
+            vad_parameters=profile.vad_parameters or None,
         )
+        if self.pipeline is not None:
+            segments, info = self.pipeline.transcribe(audio_path, batch_size=profile.batch_size, **options)
+        else:
+            segments, info = self.model.transcribe(audio_path, **options)
         
         transcript_segments = []
+        segment_words = []
         for segment in segments:
             transcript_segments.append(TranscriptSegment(
                 text=segment.text.strip(),
                 start=segment.start,
                 end=segment.end
             ))
+            if self.word_timestamps:
+                segment_words.append([(w.word, w.start, w.end) for w in segment.words or []])
+            if progress_callback:
+                progress_callback(segment.end, info.duration)
         
-        return transcript_segments
+        words = WordTimings.from_segments(segment_words) if self.word_timestamps else None
+        return transcript_segments, words
@@ -0,0 +1,102 @@
+"""Persistence for transcripts and their word timings."""
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+from backend.models import TranscriptSegment
+from backend.core.word_timings import WordTimings
+
+class TranscriptStore:
+    """
+    Stores `{video_id}.json` segments and optional `{video_id}.words.npz`.
+
+    Loaded word timings are kept in a small LRU so repeated citation
+    lookups on the same video don't re-read the file.
+    """
+
+    MAX_LOADED = 16
+
+    def __init__(self, transcript_dir: Path):
+        self.transcript_dir = Path(transcript_dir)
+        self.transcript_dir.mkdir(parents=True, exist_ok=True)
+        self._words: "OrderedDict[str, WordTimings]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _segments_path(self, video_id: str) -> Path:
+        return self.transcript_dir / f"{video_id}.json"
+
+    def _words_path(self, video_id: str) -> Path:
+        return self.transcript_dir / f"{video_id}.words.npz"
+
+    def save(self, video_id: str, segments: List[TranscriptSegment], words: Optional[WordTimings] = None):
+        """Persist a transcript; word timings are written first so segments imply both."""
+        if words is not None:
+            words.save(self._words_path(video_id))
+        else:
+            self._words_path(video_id).unlink(missing_ok=True)
+        with self._lock:
+            self._words.pop(video_id, None)
+
+        path = self._segments_path(video_id)
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump([segment.to_dict() for segment in segments], f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def export_files(self, video_id: str) -> Dict[str, bytes]:
+        """Raw stored files, keyed 'transcript' and (if recorded) 'words'."""
+        files = {}
+        if self._segments_path(video_id).exists():
+            files["transcript"] = self._segments_path(video_id).read_bytes()
+        if self._words_path(video_id).exists():
+            files["words"] = self._words_path(video_id).read_bytes()
+        return files
+
+    def import_files(self, video_id: str, transcript: bytes, words: Optional[bytes] = None):
+        """Install files produced by export_files (e.g. from a bundle) as-is."""
+        targets = [(self._words_path(video_id), words), (self._segments_path(video_id), transcript)]
+        for path, data in targets:
+            if data is None:
+                path.unlink(missing_ok=True)
+                continue
+            tmp_path = Path(f"{path}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._words.pop(video_id, None)
+
+    def exists(self, video_id: str) -> bool:
+        return self._segments_path(video_id).exists()
+
+    def load_segments(self, video_id: str) -> Optional[List[TranscriptSegment]]:
+        path = self._segments_path(video_id)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return [TranscriptSegment(**data) for data in json.load(f)]
+
+    def load_words(self, video_id: str) -> Optional[WordTimings]:
+        """Word timings for a video, or None if they weren't recorded."""
+        with self._lock:
+            words = self._words.get(video_id)
+            if words is not None:
+                self._words.move_to_end(video_id)
+                return words
+
+        path = self._words_path(video_id)
+        if not path.exists():
+            return None
+        words = WordTimings.load(path)
+
+        with self._lock:
+            self._words[video_id] = words
+            while len(self._words) > self.MAX_LOADED:
+                self._words.popitem(last=False)
+        return words
@@ -1,33 +1,225 @@
 """FAISS-based vector store with metadata management."""
 import faiss
+import json
 import numpy as np
+import os
 import pickle
+import shutil
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple
-from sentence_transformers import SentenceTransformer
+from typing import Dict, List, Tuple, Optional, Callable, Set
+try:
+    import fcntl
+except ImportError:  # Windows: publishers rely on the version-number check alone
+    fcntl = None
+from backend.core.bundle import Bundle
+from backend.core.embedding_pool import EmbeddingPool, embed_in_order
+from backend.core.embeddings import create_embedding_backend
 from backend.models import DocumentChunk
+from backend.utils.cpu_budget import cpu_meter
+from backend.utils.metrics import registry
+from backend.utils.tracing import tracer
+
+EMBEDDING_SECONDS = registry.histogram(
+    "videorag_embedding_seconds", "Time spent computing embeddings", ["operation"]
+)
+CHUNKS_EMBEDDED = registry.counter(
+    "videorag_chunks_embedded_total", "Transcript chunks embedded for indexing"
+)
+FAISS_SEARCH_SECONDS = registry.histogram(
+    "videorag_faiss_search_seconds", "FAISS index search latency"
+)
+INDEX_LOAD_SECONDS = registry.histogram(
+    "videorag_index_load_seconds", "Time to load an index version from disk"
+)
+SEARCH_CANDIDATE_FRACTION = registry.histogram(
+    "videorag_search_candidate_fraction",
+    "Fraction of a video's chunks scored by a time-filtered search",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0)
+)
+
+@dataclass
+class IndexVersion:
+    """A loaded, immutable index version pinned by in-flight queries."""
+    video_id: str
+    version: str
+    index: faiss.Index
+    chunks: List[DocumentChunk]
+    # Time index over chunks (which are stored sorted by start_time):
+    # starts for bisecting the upper bound, running max of end times for
+    # the lower bound
+    starts: List[float] = field(default_factory=list)
+    max_ends: List[float] = field(default_factory=list)
+    # Per-chunk end times: [lo, hi) can still hold chunks ending before
+    # the window when an earlier chunk runs long
+    ends: Optional[np.ndarray] = None
+    time_sorted: bool = True
+    # Zero-copy view of a flat index's vectors, for scoring a slice
+    vectors: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self.starts = [chunk.start_time for chunk in self.chunks]
+        self.ends = np.array([chunk.end_time for chunk in self.chunks], dtype=np.float64)
+        self.max_ends = np.maximum.accumulate(self.ends).tolist() if self.chunks else []
+        self.time_sorted = all(a <= b for a, b in zip(self.starts, self.starts[1:]))
+        if isinstance(self.index, faiss.IndexFlat) and self.index.ntotal:
+            self.vectors = faiss.rev_swig_ptr(
+                self.index.get_xb(), self.index.ntotal * self.index.d
+            ).reshape(self.index.ntotal, self.index.d)
+
+    def time_range(self, start_time: Optional[float], end_time: Optional[float]) -> Tuple[int, int]:
+        """
+        Ids [lo, hi) of chunks that may overlap [start_time, end_time].
+
+        Two binary searches: chunks starting at or after end_time are past
+        the window, chunks whose (running max) end is at or before
+        start_time are before it.
+        """
+        lo, hi = 0, len(self.chunks)
+        if end_time is not None:
+            hi = bisect_left(self.starts, end_time)
+        if start_time is not None:
+            lo = min(bisect_right(self.max_ends, start_time), hi)
+        return lo, hi
 
 class VectorStore:
-    """Manages FAISS index and chunk metadata."""
+    """
+    Manages FAISS index and chunk metadata.
+    
+    Each build is written to its own version directory and published by
+    atomically replacing a CURRENT manifest:
     
-    def __init__(self, embedding_model: str, dimension: int, index_dir: Path):
-        self.embedding_model = SentenceTransformer(embedding_model)
-        self.dimension = dimension
+        {index_dir}/{video_id}/v{N}/index.faiss
+        {index_dir}/{video_id}/v{N}/chunks.pkl
+        {index_dir}/{video_id}/CURRENT   -> "v{N}"
+
+    A version attached from a portable bundle holds the bundle file itself
+    ({index_dir}/{video_id}/v{N}/bundle.vrb); its index and chunks sections
+    are deserialized into memory when the version is loaded.
+    Readers resolve CURRENT once per query and keep that version for the
+    whole query, so a concurrent rebuild never mixes an index with another
+    build's chunks. Legacy {video_id}.faiss / _metadata.pkl files are still
+    readable.
+    """
+
+    MANIFEST_NAME = "CURRENT"
+    SUPERSEDED_FILE = "SUPERSEDED"  # In a replaced version: when CURRENT moved on
+    INDEX_FILE = "index.faiss"
+    CHUNKS_FILE = "chunks.pkl"
+    BUNDLE_FILE = "bundle.vrb"
+    GC_GRACE_SECONDS = 60.0  # Superseded versions other processes may still be reading
+    MAX_LOADED_INDEXES = 32
+
+    def __init__(
+        self,
+        embedding_model: str,
+        dimension: Optional[int],
+        index_dir: Path,
+        encoder=None,
+        backend: str = "sentence-transformers",
+        backend_options: Optional[dict] = None,
+        embed_workers: int = 0,
+        embed_threads: int = 0,
+        embed_batch_size: int = 64
+    ):
+        """
+        Args:
+            embedding_model: Model repo id passed to the embedding backend
+            dimension: Embedding size; detected from the backend if None
+            encoder: Optional pre-built object exposing encode(texts); when
+                given, no backend is loaded (e.g. offline benchmarks)
+            backend: sentence-transformers | onnx | onnx-int8 | hashing
+            backend_options: Extra backend arguments (e.g. threads)
+            embed_workers: Processes used to embed chunks when building an
+                index (each loads the model); 0 embeds in-process.
+                Ignored when a pre-built encoder is given.
+            embed_threads: Threads per embedding worker; 0 splits the CPUs evenly
+            embed_batch_size: Chunks per (length-sorted) embedding batch
+        """
+        self.embedding_model = encoder if encoder is not None else create_embedding_backend(
+            backend, embedding_model, dimension=dimension, **(backend_options or {})
+        )
+        self.dimension = dimension or self._detect_dimension()
+        self.embed_batch_size = embed_batch_size
+        self.embed_pool = EmbeddingPool(
+            backend, embedding_model,
+            options={'dimension': self.dimension, **(backend_options or {})},
+            workers=embed_workers,
+            threads=embed_threads
+        ) if encoder is None and embed_workers > 0 else None
         self.index_dir = index_dir
         self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        # Loaded versions keyed by video_id (most recently used last)
+        self._loaded: Dict[str, IndexVersion] = {}
+        # Pin counts per (video_id, version) for in-flight queries
+        self._pins: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        # Background collection of superseded versions: due time per video
+        self._gc_due: Dict[str, float] = {}
+        self._gc_wakeup = threading.Condition(self._lock)
+        self._gc_thread: Optional[threading.Thread] = None
+
+    def _detect_dimension(self) -> int:
+        """Embedding size reported by the backend, or measured on a probe text."""
+        dimension = getattr(self.embedding_model, "dimension", None)
+        if isinstance(dimension, int) and dimension > 0:
+            return dimension
+        if hasattr(self.embedding_model, "get_sentence_embedding_dimension"):
+            return self.embedding_model.get_sentence_embedding_dimension()
+        return int(np.asarray(self.embedding_model.encode(["dimension probe"])).shape[1])
     
-    def create_index(self, video_id: str, chunks: List[DocumentChunk]):
+    def create_index(
+        self,
+        video_id: str,
+        chunks: List[DocumentChunk],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """
-        Create FAISS index for video chunks.
+        Create FAISS index for video chunks as a new published version.
         
-        Stores:
-        - FAISS index: {video_id}.faiss
-        - Metadata: {video_id}_metadata.pkl (list of DocumentChunk)
+        Args:
+            progress_callback: Called with (chunks_embedded, total_chunks)
+                after each embedding batch
+
+        Returns:
+            Published version name
         """
-        # Generate embeddings
+        # Store chunks in time order so time-filtered searches can
+        # bisect to a contiguous id range
+        chunks = sorted(chunks, key=lambda chunk: (chunk.start_time, chunk.chunk_index))
+
+        # Embed in length-sorted batches (across worker processes for long
+        # videos); rows come back in chunk order, with progress per batch
         texts = [chunk.text for chunk in chunks]
-        embeddings = self.embedding_model.encode(texts, show_progress_bar=False)
-        embeddings = np.array(embeddings).astype('float32')
+
+        def on_batch(size: int, seconds: float):
+            EMBEDDING_SECONDS.observe(seconds, operation='index')
+            CHUNKS_EMBEDDED.inc(size)
+
+        with tracer.span("embed_chunks", chunks=len(texts), workers=self.embed_pool.workers if self.embed_pool else 1), \
+                cpu_meter.track("embed_index"):
+            if self.embed_pool is not None:
+                embeddings = self.embed_pool.encode(
+                    texts, self.embed_batch_size, progress_callback=progress_callback, on_batch=on_batch,
+                    fallback=lambda batch: self.embedding_model.encode(batch, show_progress_bar=False)
+                )
+            else:
+                embeddings = embed_in_order(
+                    texts,
+                    lambda batch: self.embedding_model.encode(batch, show_progress_bar=False),
+                    self.embed_batch_size,
+                    progress_callback=progress_callback,
+                    on_batch=on_batch
+                )
+        embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+        if not len(embeddings):
+            embeddings = embeddings.reshape(0, self.dimension)
         
         # Normalize for cosine similarity
         faiss.normalize_L2(embeddings)
@@ -36,55 +228,457 @@ class VectorStore:
         index = faiss.IndexFlatIP(self.dimension)
         index.add(embeddings)
         
-        # Save index and metadata
-        index_path = self.index_dir / f"{video_id}.faiss"
-        metadata_path = self.index_dir / f"{video_id}_metadata.pkl"
+        # Write into a private staging directory, then publish. Versions
+        # superseded by the previous build are collected first.
+        video_dir = self.index_dir / video_id
+        video_dir.mkdir(parents=True, exist_ok=True)
+        self.gc(video_id)
+        staging_dir = video_dir / f".staging-{uuid.uuid4().hex}"
+        staging_dir.mkdir()
+        try:
+            faiss.write_index(index, str(staging_dir / self.INDEX_FILE))
+            with open(staging_dir / self.CHUNKS_FILE, 'wb') as f:
+                pickle.dump(chunks, f)
+            version = self._publish(video_id, staging_dir)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
         
-        faiss.write_index(index, str(index_path))
-        with open(metadata_path, 'wb') as f:
-            pickle.dump(chunks, f)
+        self.gc(video_id)
+        return version
+
+    def _publish(self, video_id: str, staging_dir: Path) -> str:
+        """
+        Move a staged build to the next version and point CURRENT at it.
+
+        Publishers of one video are serialized by a lock file, so CURRENT
+        only moves forward. A build that still loses a race (no file
+        locking on this platform) leaves CURRENT at the newer version and
+        is marked superseded like any other.
+        """
+        video_dir = self.index_dir / video_id
+        with self._manifest_lock(video_dir):
+            while True:
+                number = self._latest_version_number(video_id) + 1
+                version = f"v{number}"
+                try:
+                    # Directory rename is atomic and fails if a concurrent
+                    # build already claimed this version number
+                    os.rename(staging_dir, video_dir / version)
+                    break
+                except OSError:
+                    if (video_dir / version).exists():
+                        continue
+                    raise
+
+            current = self.current_version(video_id)
+            current_number = int(current[1:]) if current and current[1:].isdigit() else 0
+            if number > current_number:
+                tmp_manifest = video_dir / f".{self.MANIFEST_NAME}.{uuid.uuid4().hex}"
+                with open(tmp_manifest, 'w') as f:
+                    f.write(version)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_manifest, video_dir / self.MANIFEST_NAME)
+                current = version
+
+            # Every other version (including one that lost a race) starts its grace period
+            for path in video_dir.glob("v*"):
+                if path.name != current and path.name[1:].isdigit() and path.is_dir() \
+                        and not (path / self.SUPERSEDED_FILE).exists():
+                    self._mark_superseded(path)
+        return version
+
+    @contextmanager
+    def _manifest_lock(self, video_dir: Path):
+        """Exclusive lock across processes for updating a video's CURRENT."""
+        with open(video_dir / ".publish.lock", "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _mark_superseded(self, version_dir: Path) -> float:
+        """Record when a version stopped being CURRENT; its grace period starts here."""
+        superseded_at = time.time()
+        try:
+            (version_dir / self.SUPERSEDED_FILE).write_text(repr(superseded_at))
+        except FileNotFoundError:
+            pass  # Already collected
+        return superseded_at
+
+    def _superseded_at(self, version_dir: Path) -> float:
+        """When a non-current version was superseded; starts the clock if unrecorded."""
+        try:
+            return float((version_dir / self.SUPERSEDED_FILE).read_text())
+        except (FileNotFoundError, ValueError):
+            # Publisher crashed before marking, or lost a concurrent publish
+            return self._mark_superseded(version_dir)
+
+    def _latest_version_number(self, video_id: str) -> int:
+        """Highest version number present on disk (0 if none)."""
+        video_dir = self.index_dir / video_id
+        numbers = [
+            int(p.name[1:]) for p in video_dir.glob("v*")
+            if p.is_dir() and p.name[1:].isdigit()
+        ]
+        return max(numbers, default=0)
+
+    def current_version(self, video_id: str) -> Optional[str]:
+        """Resolve the published version, 'legacy' for flat files, or None."""
+        try:
+            version = (self.index_dir / video_id / self.MANIFEST_NAME).read_text().strip()
+            if version:
+                return version
+        except FileNotFoundError:
+            pass
+        if (self.index_dir / f"{video_id}.faiss").exists():
+            return "legacy"
+        return None
+
+    def _version_paths(self, video_id: str, version: str) -> Tuple[Path, Path]:
+        """Index and chunk file paths for a version."""
+        if version == "legacy":
+            return (
+                self.index_dir / f"{video_id}.faiss",
+                self.index_dir / f"{video_id}_metadata.pkl"
+            )
+        version_dir = self.index_dir / video_id / version
+        return version_dir / self.INDEX_FILE, version_dir / self.CHUNKS_FILE
+
+    def _load_version(self, video_id: str, version: str) -> IndexVersion:
+        """Read an index version from disk."""
+        bundle_path = self.index_dir / video_id / version / self.BUNDLE_FILE
+        if version != "legacy" and bundle_path.exists():
+            with Bundle(bundle_path) as bundle:
+                index = faiss.deserialize_index(np.frombuffer(bundle.section("index"), dtype=np.uint8))
+                chunks = [DocumentChunk.from_dict(data) for data in json.loads(bytes(bundle.section("chunks")))]
+            return IndexVersion(video_id=video_id, version=version, index=index, chunks=chunks)
+
+        index_path, chunks_path = self._version_paths(video_id, version)
+        index = faiss.read_index(str(index_path))
+        with open(chunks_path, 'rb') as f:
+            chunks = pickle.load(f)
+        return IndexVersion(video_id=video_id, version=version, index=index, chunks=chunks)
+
+    def attach_bundle(self, video_id: str, bundle_path: Path) -> str:
+        """
+        Publish a verified bundle as the video's new index version.
+
+        The file is hard-linked into the version directory when it is on the
+        same filesystem (no copy on disk), otherwise copied byte for byte.
+        Nothing is unpacked on attach; like any version, the index and
+        chunks are read into memory on first use.
+
+        Returns:
+            Published version name
+        """
+        video_dir = self.index_dir / video_id
+        video_dir.mkdir(parents=True, exist_ok=True)
+        self.gc(video_id)
+        staging_dir = video_dir / f".staging-{uuid.uuid4().hex}"
+        staging_dir.mkdir()
+        try:
+            try:
+                os.link(bundle_path, staging_dir / self.BUNDLE_FILE)
+            except OSError:
+                shutil.copyfile(bundle_path, staging_dir / self.BUNDLE_FILE)
+            version = self._publish(video_id, staging_dir)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        self.gc(video_id)
+        return version
+
+    def export_sections(self, video_id: str) -> Dict[str, bytes]:
+        """
+        Serialized index and chunks of the current version, for bundling.
+
+        Returns:
+            {'index': FAISS serialization, 'chunks': JSON list of chunk dicts}
+        """
+        with self.pin(video_id) as loaded:
+            return {
+                "index": faiss.serialize_index(loaded.index).tobytes(),
+                "chunks": json.dumps([chunk.to_dict() for chunk in loaded.chunks]).encode("utf-8")
+            }
+
+    @contextmanager
+    def pin(self, video_id: str):
+        """
+        Pin the current index version for the duration of a query.
+
+        Yields:
+            IndexVersion that stays valid even if a rebuild publishes a
+            newer version meanwhile
+        """
+        for attempt in range(2):
+            version = self.current_version(video_id)
+            if version is None:
+                raise ValueError(f"Index not found for video_id: {video_id}")
+
+            with self._lock:
+                loaded = self._loaded.get(video_id)
+                if loaded is not None and loaded.version == version:
+                    # Refresh LRU position
+                    self._loaded[video_id] = self._loaded.pop(video_id)
+
+            if loaded is None or loaded.version != version:
+                try:
+                    with tracer.span("index_load", video_id=video_id, version=version), INDEX_LOAD_SECONDS.time():
+                        loaded = self._load_version(video_id, version)
+                except FileNotFoundError:
+                    if attempt == 0:
+                        continue  # Superseded and collected mid-load; re-resolve
+                    raise
+                with self._lock:
+                    self._loaded.pop(video_id, None)
+                    self._loaded[video_id] = loaded
+                    while len(self._loaded) > self.MAX_LOADED_INDEXES:
+                        self._loaded.pop(next(iter(self._loaded)))
+                # First use in this process: collect versions left by earlier runs
+                self._schedule_gc(video_id)
+            break
+
+        key = (video_id, loaded.version)
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            yield loaded
+        finally:
+            with self._lock:
+                self._pins[key] -= 1
+                released = self._pins[key] == 0
+                if released:
+                    del self._pins[key]
+            if released and self.current_version(video_id) != loaded.version:
+                # Last reader of a superseded version
+                self._schedule_gc(video_id)
+
+    def gc(self, video_id: str) -> List[str]:
+        """
+        Remove superseded versions that are no longer referenced.
+
+        A version is collected when it is not CURRENT, not pinned by a query
+        in this process, and was superseded (per its SUPERSEDED marker) more
+        than GC_GRACE_SECONDS ago, covering readers in other processes.
+        Versions still in their grace period are rescheduled on the
+        background collector; pinned ones when their last pin is released.
+        Abandoned staging directories are removed after the same grace period.
+
+        Returns:
+            Names of removed versions
+        """
+        video_dir = self.index_dir / video_id
+        manifest = video_dir / self.MANIFEST_NAME
+        if not manifest.exists():
+            return []
+        current = manifest.read_text().strip()
+
+        with self._lock:
+            pinned: Set[str] = {v for (vid, v) in self._pins if vid == video_id}
+
+        removed = []
+        next_due = None
+        for path in video_dir.iterdir():
+            if not path.is_dir() or path.name == current or path.name in pinned:
+                continue
+            if path.name.startswith(".staging-"):
+                age = time.time() - path.stat().st_mtime
+            else:
+                age = time.time() - self._superseded_at(path)
+            if age > self.GC_GRACE_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+                if not path.name.startswith(".staging-"):
+                    removed.append(path.name)
+            else:
+                wait = self.GC_GRACE_SECONDS - age
+                next_due = wait if next_due is None else min(next_due, wait)
+        if next_due is not None:
+            self._schedule_gc(video_id, next_due + 1.0)
+        return removed
+
+    def _schedule_gc(self, video_id: str, delay: float = 0.0):
+        """Have the background collector run gc(video_id) after `delay` seconds."""
+        due = time.monotonic() + delay
+        with self._lock:
+            if due < self._gc_due.get(video_id, float("inf")):
+                self._gc_due[video_id] = due
+            if self._gc_thread is None:
+                self._gc_thread = threading.Thread(target=self._collect, name="index-gc", daemon=True)
+                self._gc_thread.start()
+            self._gc_wakeup.notify()
+
+    def _collect(self):
+        """Collector thread: sweep every video once, then run scheduled gc() calls."""
+        for video_dir in list(self.index_dir.iterdir()):
+            if video_dir.is_dir():
+                try:
+                    self.gc(video_dir.name)
+                except OSError:
+                    pass
+        while True:
+            with self._lock:
+                while not self._gc_due:
+                    self._gc_wakeup.wait()
+                video_id, due = min(self._gc_due.items(), key=lambda item: item[1])
+                if due > time.monotonic():
+                    self._gc_wakeup.wait(due - time.monotonic())
+                    continue
+                del self._gc_due[video_id]
+            try:
+                self.gc(video_id)
+            except OSError:
+                pass  # Retried when the video is next published, loaded or released
     
     def search(
-        self, 
-        video_id: str, 
-        query: str, 
+        self,
+        video_id: str,
+        query: str,
         top_k: int = 5,
-        threshold: float = 0.3
+        threshold: float = 0.3,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
     ) -> List[Tuple[DocumentChunk, float]]:
         """
         Search for relevant chunks.
         
+        Args:
+            start_time, end_time: Only return chunks overlapping this window
+                (seconds); only that slice of the index is scored
+
         Returns:
             List of (DocumentChunk, similarity_score) tuples
         """
-        index_path = self.index_dir / f"{video_id}.faiss"
-        metadata_path = self.index_dir / f"{video_id}_metadata.pkl"
+        with tracer.span(
+            "vector_store.search", video_id=video_id, top_k=top_k,
+            start_time=start_time, end_time=end_time
+        ) as span:
+            query_embedding = self._encode_query(query)
+            with self.pin(video_id) as loaded:
+                results = self._search_loaded(loaded, query_embedding, top_k, threshold, start_time, end_time)
+            span.set(
+                index_version=loaded.version,
+                chunk_ids=[chunk.chunk_id for chunk, _ in results],
+                scores=[round(score, 4) for _, score in results]
+            )
+        return results
         
-        if not index_path.exists():
-            raise ValueError(f"Index not found for video_id: {video_id}")
+    def search_videos(
+        self,
+        video_ids: List[str],
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.3,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """
+        Search several videos with one query embedding.
         
-        # Load index and metadata
-        index = faiss.read_index(str(index_path))
-        with open(metadata_path, 'rb') as f:
-            chunks = pickle.load(f)
+        Videos without an index are skipped.
         
-        # Encode query
-        query_embedding = self.embedding_model.encode([query])[0]
+        Returns:
+            Best top_k (DocumentChunk, similarity_score) tuples overall
+        """
+        with tracer.span("vector_store.search_videos", videos=len(video_ids), top_k=top_k) as span:
+            query_embedding = self._encode_query(query)
+            results = []
+            for video_id in video_ids:
+                if not self.index_exists(video_id):
+                    continue
+                with self.pin(video_id) as loaded:
+                    results.extend(
+                        self._search_loaded(loaded, query_embedding, top_k, threshold, start_time, end_time)
+                    )
+            results.sort(key=lambda result: result[1], reverse=True)
+            span.set(chunk_ids=[chunk.chunk_id for chunk, _ in results[:top_k]])
+        return results[:top_k]
+
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Normalized (1, dimension) float32 query embedding."""
+        with tracer.span("embed_query", chars=len(query)), EMBEDDING_SECONDS.time(operation='query'), \
+                cpu_meter.track("embed_query"):
+            query_embedding = self.embedding_model.encode([query])[0]
         query_embedding = np.array([query_embedding]).astype('float32')
         faiss.normalize_L2(query_embedding)
+        return query_embedding
         
-        # Search
-        similarities, indices = index.search(query_embedding, top_k)
+    def _search_loaded(
+        self,
+        loaded: IndexVersion,
+        query_embedding: np.ndarray,
+        top_k: int,
+        threshold: float,
+        start_time: Optional[float],
+        end_time: Optional[float]
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """Top chunks of a pinned index version, optionally within a time window."""
+        if loaded.index.d != self.dimension:
+            raise ValueError(
+                f"Index for {loaded.video_id} has dimension {loaded.index.d} but the embedding "
+                f"backend produces {self.dimension}; re-ingest the video"
+            )
+        total = loaded.index.ntotal
+        filtered = start_time is not None or end_time is not None
+        search_k = top_k
+        if not filtered:
+            lo, hi = 0, total
+        elif loaded.time_sorted:
+            lo, hi = loaded.time_range(start_time, end_time)
+            SEARCH_CANDIDATE_FRACTION.observe((hi - lo) / total if total else 0.0)
+        else:
+            # Index built before chunks were stored in time order: score
+            # everything and filter afterwards
+            lo, hi, search_k = 0, total, total
         
-        # Filter by threshold and return results
+        with tracer.span("faiss_search", video_id=loaded.video_id, candidates=hi - lo, total=total), \
+                FAISS_SEARCH_SECONDS.time(), cpu_meter.track("faiss"):
+            if hi <= lo:
+                indices, similarities = [], []
+            elif filtered and loaded.vectors is not None:
+                # Flat index: score only the candidate slice
+                scores = loaded.vectors[lo:hi] @ query_embedding[0]
+                if start_time is not None:
+                    # Chunks in the slice that end before the window
+                    scores[loaded.ends[lo:hi] <= start_time] = -np.inf
+                k = min(search_k, hi - lo)
+                best = np.argpartition(-scores, k - 1)[:k]
+                best = best[np.argsort(-scores[best])]
+                indices, similarities = best + lo, scores[best]
+            else:
+                params = None
+                if (lo, hi) != (0, total):
+                    selector = faiss.IDSelectorRange(lo, hi)
+                    params = faiss.SearchParameters(sel=selector)
+                    if start_time is not None:
+                        # The range can hold chunks that end before the window,
+                        # dropped below; ask for enough extra that top_k survive
+                        stale = int(np.count_nonzero(loaded.ends[lo:hi] <= start_time))
+                        search_k = min(search_k + stale, hi - lo)
+                similarities, indices = loaded.index.search(query_embedding, search_k, params=params)
+                indices, similarities = indices[0], similarities[0]
+
+        # Filter by threshold and time window and return results
         results = []
-        for idx, similarity in zip(indices[0], similarities[0]):
-            if similarity >= threshold:
-                results.append((chunks[idx], float(similarity)))
+        for idx, similarity in zip(indices, similarities):
+            if idx < 0 or similarity < threshold:
+                continue
+            chunk = loaded.chunks[idx]
+            if start_time is not None and chunk.end_time <= start_time:
+                continue
+            if end_time is not None and chunk.start_time >= end_time:
+                continue
+            results.append((chunk, float(similarity)))
+            if len(results) == top_k:
+                break
         
         return results
     
     def index_exists(self, video_id: str) -> bool:
         """Check if index exists for video."""
-        index_path = self.index_dir / f"{video_id}.faiss"
-        return index_path.exists()
+        return self.current_version(video_id) is not None
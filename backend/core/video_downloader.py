@@ -1,52 +1,248 @@
 """YouTube video downloader using yt-dlp."""
 import yt_dlp
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional, Callable, Sequence
 import hashlib
 import os
+import re
+from backend.core.audio_cache import PARTIAL_SUFFIXES
+from backend.core.captions import parse_captions
+from backend.models import TranscriptSegment
+
+# Preferred caption formats; both carry cue-level timing
+CAPTION_FORMATS = ('srv3', 'vtt')
+
+_YOUTUBE_ID = re.compile(
+    r"(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|live/|v/)|youtu\.be/)([A-Za-z0-9_-]{11})"
+)
 
 class VideoDownloader:
     """Downloads audio from YouTube videos."""
     
-    def __init__(self, cache_dir: Path):
+    # original: keep the downloaded container as-is (no transcode; smallest)
+    # pcm16k:   one ffmpeg pass to 16 kHz mono WAV, Whisper's input format
+    #           (no decode/resample at transcription; larger on disk)
+    # mp3:      192 kbps MP3 re-encode (previous behaviour)
+    AUDIO_FORMATS = ('original', 'pcm16k', 'mp3')
+    
+    def __init__(self, cache_dir: Path, audio_format: str = 'original'):
+        if audio_format not in self.AUDIO_FORMATS:
+            raise ValueError(f"Unknown audio format: {audio_format}")
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.audio_format = audio_format
         self.ffmpeg_path = str(Path(__file__).parent.parent.parent / 'bin' / 'ffmpeg')
         self.ffprobe_path = str(Path(__file__).parent.parent.parent / 'bin' / 'ffprobe')
     
-    def download_audio(self, url: str) -> Tuple[str, dict]:
-        """Download audio from YouTube URL."""
-        video_id = hashlib.md5(url.encode()).hexdigest()[:12]
-        audio_path = self.cache_dir / f"{video_id}.mp3"
+    @staticmethod
+    def canonical_url(url: str) -> str:
+        """
+        One URL per YouTube video, so youtu.be, shorts, embed and
+        watch?v=...&t=... links all map to the same video_id.
+        
+        Non-YouTube URLs are returned unchanged (stripped).
+        """
+        match = _YOUTUBE_ID.search(url)
+        if match:
+            return f"https://www.youtube.com/watch?v={match.group(1)}"
+        return url.strip()
+    
+    @staticmethod
+    def get_video_id(url: str) -> str:
+        """Derive the stable video_id used for cache and index files."""
+        return hashlib.md5(VideoDownloader.canonical_url(url).encode()).hexdigest()[:12]
+    
+    def expand_url(self, url: str, max_videos: int = 500) -> List[dict]:
+        """
+        Expand a playlist or channel URL into its videos.
+        
+        A plain video URL is returned as-is without a network call.
+        
+        Returns:
+            [{'url': canonical video URL, 'title': str or None}], in playlist order
+        """
+        if _YOUTUBE_ID.search(url) and 'list=' not in url:
+            return [{'url': self.canonical_url(url), 'title': None}]
+        
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'extract_flat': 'in_playlist',  # List entries without resolving each video
+            'playlistend': max_videos,
+        }
+        videos: List[dict] = []
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            self._collect_entries(ydl, ydl.extract_info(url, download=False), videos, max_videos, depth=0)
+        return videos
+    
+    def _collect_entries(self, ydl, info: dict, videos: List[dict], max_videos: int, depth: int):
+        """Walk (possibly nested, e.g. channel tabs) playlist entries."""
+        if info.get('_type') not in ('playlist', 'multi_video'):
+            video_url = info.get('webpage_url') or info.get('url')
+            if video_url:
+                videos.append({'url': self.canonical_url(video_url), 'title': info.get('title')})
+            return
+        for entry in info.get('entries') or []:
+            if len(videos) >= max_videos:
+                return
+            if not entry:
+                continue
+            entry_url = entry.get('url') or ''
+            if _YOUTUBE_ID.search(entry_url) or (entry.get('ie_key') == 'Youtube' and entry.get('id')):
+                videos.append({
+                    'url': self.canonical_url(entry_url or f"https://www.youtube.com/watch?v={entry['id']}"),
+                    'title': entry.get('title')
+                })
+            elif entry.get('_type') == 'playlist':
+                self._collect_entries(ydl, entry, videos, max_videos, depth)
+            elif entry_url and depth < 2:
+                # Unresolved nested playlist, such as a channel's Videos tab
+                nested = ydl.extract_info(entry_url, download=False)
+                self._collect_entries(ydl, nested, videos, max_videos, depth + 1)
+    
+    def download_audio(
+        self, 
+        url: str, 
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None
+    ) -> Tuple[str, dict]:
+        """
+        Download audio from YouTube URL.
+        
+        Args:
+            url: YouTube URL
+            progress_callback: Called with (downloaded_bytes, total_bytes)
+        """
+        video_id = self.get_video_id(url)
         
-        if audio_path.exists():
+        # Any previously downloaded format is fine; Whisper decodes them all
+        audio_path = self.cached_audio(video_id)
+        if audio_path is not None:
             metadata = self._extract_metadata(url)
             return str(audio_path), {**metadata, 'video_id': video_id}
         
         ydl_opts = {
             'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
+            'postprocessors': self._postprocessors(),
+            # Resample in the same ffmpeg run that extracts the audio
+            'postprocessor_args': {
+                'extractaudio': ['-ar', '16000', '-ac', '1']
+            } if self.audio_format == 'pcm16k' else {},
             'outtmpl': str(self.cache_dir / f'{video_id}.%(ext)s'),
             'quiet': True,
             'no_warnings': True,
             'ffmpeg_location': str(Path(__file__).parent.parent.parent / 'bin'),
         }
         
+        if progress_callback:
+            def hook(d):
+                if d.get('status') == 'downloading':
+                    total = d.get('total_bytes') or d.get('total_bytes_estimate')
+                    progress_callback(d.get('downloaded_bytes', 0), total)
+            ydl_opts['progress_hooks'] = [hook]
+        
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=True)
             metadata = {
                 'video_id': video_id,
                 'title': info.get('title', 'Unknown'),
                 'duration': info.get('duration', 0),
+                'upload_date': self._upload_date(info),
                 'url': url
             }
+            downloads = info.get('requested_downloads') or [{}]
+            audio_path = downloads[0].get('filepath') or self.cached_audio(video_id)
         
         return str(audio_path), metadata
     
+    def fetch_captions(
+        self,
+        url: str,
+        languages: Sequence[str] = ('en',),
+        allow_auto: bool = True
+    ) -> Tuple[Optional[List[TranscriptSegment]], Optional[str], dict]:
+        """
+        Fetch and parse the video's subtitle track without downloading media.
+        
+        Manual subtitles are preferred over automatic captions.
+        
+        Args:
+            url: YouTube URL
+            languages: Language codes in preference order (prefix match, so
+                'en' also accepts 'en-US')
+            allow_auto: Fall back to YouTube's automatic captions
+        
+        Returns:
+            (segments, source, metadata); segments and source ('manual' or
+            'auto') are None when no usable track exists
+        """
+        video_id = self.get_video_id(url)
+        ydl_opts = {'quiet': True, 'no_warnings': True}
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            metadata = {
+                'video_id': video_id,
+                'title': info.get('title', 'Unknown'),
+                'duration': info.get('duration', 0),
+                'upload_date': self._upload_date(info),
+                'url': url
+            }
+            
+            tracks = [('manual', info.get('subtitles') or {})]
+            if allow_auto:
+                tracks.append(('auto', info.get('automatic_captions') or {}))
+            for source, by_language in tracks:
+                entry = self._pick_caption_track(by_language, languages)
+                if entry is None:
+                    continue
+                text = ydl.urlopen(entry['url']).read().decode('utf-8')
+                return parse_captions(text, entry['ext']), source, metadata
+        
+        return None, None, metadata
+    
+    @staticmethod
+    def _pick_caption_track(by_language: dict, languages: Sequence[str]) -> Optional[dict]:
+        """First track in a supported format for the preferred languages."""
+        for language in languages:
+            for code, entries in by_language.items():
+                # Accept regional variants such as en-US or en-GB
+                if code != language and not code.startswith(f"{language}-"):
+                    continue
+                by_ext = {entry.get('ext'): entry for entry in entries}
+                for fmt in CAPTION_FORMATS:
+                    if fmt in by_ext:
+                        return by_ext[fmt]
+        return None
+    
+    def cached_audio(self, video_id: str) -> Optional[Path]:
+        """Completed audio file for a video in the cache, if any."""
+        for path in self.cache_dir.glob(f"{video_id}.*"):
+            if path.suffix not in PARTIAL_SUFFIXES:
+                return path
+        return None
+    
+    def _postprocessors(self) -> list:
+        """yt-dlp postprocessing for the configured audio format."""
+        if self.audio_format == 'mp3':
+            return [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': '192',
+            }]
+        if self.audio_format == 'pcm16k':
+            return [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'wav',
+            }]
+        return []
+    
+    @staticmethod
+    def _upload_date(info: dict) -> Optional[str]:
+        """yt-dlp's YYYYMMDD upload date as ISO YYYY-MM-DD."""
+        raw = info.get('upload_date')
+        if not raw or len(raw) != 8:
+            return None
+        return f"{raw[:4]}-{raw[4:6]}-{raw[6:]}"
+    
     def _extract_metadata(self, url: str) -> dict:
         """Extract metadata without downloading."""
         ydl_opts = {'quiet': True, 'no_warnings': True}
@@ -55,5 +251,6 @@ class VideoDownloader:
             return {
                 'title': info.get('title', 'Unknown'),
                 'duration': info.get('duration', 0),
+                'upload_date': self._upload_date(info),
                 'url': url
             }
@@ -0,0 +1,126 @@
+"""Compact word-level timestamps for a transcript."""
+import os
+import re
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+_NON_WORD = re.compile(r"[^\w']+")
+
+def _normalize(word: str) -> str:
+    return _NON_WORD.sub("", word.lower())
+
+class WordTimings:
+    """
+    Word start/end times stored as flat numpy arrays.
+
+    Word i of segment s lives at index segment_offsets[s] + i, so a
+    transcript of N words costs ~8 bytes per word for timings plus the
+    word text, instead of a Python object per word. Words are in time
+    order, so time lookups are binary searches over `starts`.
+    """
+
+    def __init__(
+        self,
+        words: List[str],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        segment_offsets: np.ndarray
+    ):
+        self.words = words
+        self.starts = np.asarray(starts, dtype=np.float32)
+        self.ends = np.asarray(ends, dtype=np.float32)
+        self.segment_offsets = np.asarray(segment_offsets, dtype=np.int32)
+        self._normalized: Optional[List[str]] = None
+
+    @classmethod
+    def from_segments(cls, segment_words: Sequence[Sequence[Tuple[str, float, float]]]) -> "WordTimings":
+        """
+        Build from per-segment (word, start, end) lists.
+
+        Args:
+            segment_words: One list per transcript segment, in order
+        """
+        words, starts, ends, offsets = [], [], [], [0]
+        for segment in segment_words:
+            for word, start, end in segment:
+                words.append(word.strip())
+                starts.append(start)
+                ends.append(end)
+            offsets.append(len(words))
+        return cls(words, np.array(starts), np.array(ends), np.array(offsets))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def num_segments(self) -> int:
+        return len(self.segment_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the timings and word text."""
+        text = sum(len(w) for w in self.words)
+        return self.starts.nbytes + self.ends.nbytes + self.segment_offsets.nbytes + text
+
+    def segment_range(self, segment_index: int) -> Tuple[int, int]:
+        """Word index range [lo, hi) of one segment."""
+        return int(self.segment_offsets[segment_index]), int(self.segment_offsets[segment_index + 1])
+
+    def word_at(self, seconds: float) -> int:
+        """Index of the last word starting at or before `seconds`; -1 if none."""
+        return int(np.searchsorted(self.starts, seconds, side="right")) - 1
+
+    def window(self, start: float, end: float) -> Tuple[int, int]:
+        """Word index range [lo, hi) of words starting within [start, end]."""
+        lo = int(np.searchsorted(self.starts, start, side="left"))
+        hi = int(np.searchsorted(self.starts, end, side="right"))
+        return lo, hi
+
+    def find_phrase(self, phrase: str, start: float = 0.0, end: float = float("inf")) -> Optional[float]:
+        """
+        Time at which `phrase` is first spoken within [start, end].
+
+        Matching ignores case and punctuation.
+
+        Returns:
+            Start time of the phrase's first word in seconds, or None
+        """
+        target = [w for w in (_normalize(t) for t in phrase.split()) if w]
+        if not target:
+            return None
+        if self._normalized is None:
+            self._normalized = [_normalize(w) for w in self.words]
+
+        lo, hi = self.window(start, end)
+        first, n = target[0], len(target)
+        for i in range(lo, min(hi, len(self.words) - n + 1)):
+            if self._normalized[i] == first and self._normalized[i:i + n] == target:
+                return float(self.starts[i])
+        return None
+
+    def save(self, path: Path):
+        """Write atomically as an uncompressed .npz (loads with one read per array)."""
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                starts=self.starts,
+                ends=self.ends,
+                segment_offsets=self.segment_offsets,
+                text=np.frombuffer("\n".join(self.words).encode("utf-8"), dtype=np.uint8)
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "WordTimings":
+        with np.load(path) as data:
+            text = data["text"].tobytes().decode("utf-8")
+            return cls(
+                text.split("\n") if text else [],
+                data["starts"],
+                data["ends"],
+                data["segment_offsets"]
+            )
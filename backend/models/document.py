@@ -39,6 +39,8 @@ class VideoMetadata:
     duration: float  # seconds
     num_chunks: int
     processed_at: str  # ISO timestamp
+    transcript_source: str = "whisper"  # whisper | captions_manual | captions_auto
+    upload_date: Optional[str] = None  # YYYY-MM-DD
     
     def to_dict(self):
         return asdict(self)
@@ -62,6 +64,8 @@ class RAGResponse:
     answer: str
     sources: List[dict]  # [{text, start_time, end_time, similarity}]
     video_id: str
+    session_id: Optional[str] = None
+    trace_id: Optional[str] = None
     
     def to_dict(self):
         return asdict(self)
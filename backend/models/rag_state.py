@@ -10,6 +10,10 @@ class RAGState(TypedDict):
     retrieved_chunks: List[DocumentChunk]
     final_answer: str
     sources: List[dict]
-    conversation_history: List[dict]
+    conversation_history: List[dict]  # Compressed: optional {summary}, then {query, answer} turns
+    session_id: Optional[str]
+    turn: int  # Turns of the session answered before this query
+    start_time: Optional[float]  # Restrict retrieval to this window (seconds)
+    end_time: Optional[float]
     confidence: float
     retry_count: int
@@ -0,0 +1,240 @@
+"""Export, import and bulk sync of single-file video bundles."""
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from backend.core import TranscriptStore, VectorStore
+from backend.core.bundle import BUNDLE_SUFFIX, Bundle, BundleError, read_manifest, write_bundle
+from backend.models import VideoMetadata
+from backend.services.status_store import StatusStore
+from backend.utils.metrics import registry
+
+BUNDLE_OPERATIONS = registry.counter(
+    "videorag_bundle_operations_total", "Bundle exports and imports by result", ["operation", "result"]
+)
+BUNDLE_IMPORT_SECONDS = registry.histogram(
+    "videorag_bundle_import_seconds", "Time to verify and attach one bundle"
+)
+
+class BundleManager:
+    """
+    Packs everything needed to serve a video into one bundle file.
+
+    A bundle holds the FAISS index, chunk store, transcript, word timings
+    and metadata of one video. Importing verifies checksums, installs the
+    small transcript files and attaches the bundle itself as the video's
+    index version, so a node can serve a video without re-ingesting it.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        transcripts: TranscriptStore,
+        status_store: StatusStore,
+        metadata_dir: Path,
+        bundle_dir: Path,
+        embedding_model: str
+    ):
+        self.vector_store = vector_store
+        self.transcripts = transcripts
+        self.status_store = status_store
+        self.metadata_dir = Path(metadata_dir)
+        self.bundle_dir = Path(bundle_dir)
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        self.embedding_model = embedding_model
+
+    def export(self, video_id: str, path: Optional[Path] = None) -> Path:
+        """
+        Write a video's bundle.
+
+        Args:
+            path: Target file; defaults to {bundle_dir}/{video_id}.vrb
+
+        Returns:
+            Path of the written bundle
+        """
+        metadata_path = self.metadata_dir / f"{video_id}.json"
+        if not self.vector_store.index_exists(video_id) or not metadata_path.exists():
+            raise ValueError(f"Video {video_id} not processed or not found")
+
+        sections = self.vector_store.export_sections(video_id)
+        sections.update(self.transcripts.export_files(video_id))
+        metadata = VideoMetadata.load(metadata_path)
+        manifest = {
+            "video_id": video_id,
+            "created_at": datetime.now().isoformat(),
+            "embedding_model": self.embedding_model,
+            "dimension": self.vector_store.dimension,
+            "num_chunks": metadata.num_chunks,
+            "metadata": metadata.to_dict()
+        }
+
+        path = Path(path) if path else self.bundle_dir / f"{video_id}{BUNDLE_SUFFIX}"
+        write_bundle(path, manifest, sections)
+        BUNDLE_OPERATIONS.inc(operation="export", result="ok")
+        return path
+
+    def import_bundle(self, path: Path, verify: bool = True) -> dict:
+        """
+        Verify a bundle and start serving its video.
+
+        Args:
+            verify: Check section checksums (skip only for bundles this
+                node just wrote)
+
+        Returns:
+            {video_id, title, num_chunks, version}
+        """
+        path = Path(path)
+        with BUNDLE_IMPORT_SECONDS.time():
+            try:
+                with Bundle(path) as bundle:
+                    manifest = bundle.manifest
+                    self._check_compatible(manifest, path)
+                    if verify:
+                        bundle.verify()
+                    video_id = manifest["video_id"]
+                    transcript = bytes(bundle.section("transcript") or b"[]")
+                    words = bundle.section("words")
+                    words = bytes(words) if words is not None else None  # Release the view before the mapping closes
+
+                # Serve the new index before replacing the transcript, so a
+                # failed attach leaves the old build intact
+                version = self.vector_store.attach_bundle(video_id, path)
+                self.transcripts.import_files(video_id, transcript, words)
+                metadata = VideoMetadata.from_dict(manifest["metadata"])
+                self._save_metadata(metadata)
+                self.status_store.put(video_id, {
+                    'status': 'complete',
+                    'stage': 'complete',
+                    'progress': 1.0,
+                    'metadata': {'video_id': video_id, 'url': metadata.url, 'title': metadata.title},
+                    'transcript_source': metadata.transcript_source,
+                    'imported_from': path.name
+                })
+            except Exception:
+                BUNDLE_OPERATIONS.inc(operation="import", result="error")
+                raise
+        BUNDLE_OPERATIONS.inc(operation="import", result="ok")
+        return {
+            'video_id': video_id,
+            'title': metadata.title,
+            'num_chunks': metadata.num_chunks,
+            'version': version
+        }
+
+    def sync(self, directory: Path, verify: bool = True, workers: int = 4) -> dict:
+        """
+        Import every bundle in a directory that is newer than the local copy.
+
+        Only manifests are read to decide; bundles are imported in parallel.
+
+        Returns:
+            {imported: [video_id], skipped: [video_id], failed: {file: error}}
+        """
+        pending, skipped, failed = [], [], {}
+        for path in sorted(Path(directory).glob(f"*{BUNDLE_SUFFIX}")):
+            try:
+                manifest = read_manifest(path)
+            except (OSError, ValueError) as e:
+                failed[path.name] = str(e)
+                continue
+            if self._is_current(manifest):
+                skipped.append(manifest["video_id"])
+            else:
+                pending.append(path)
+
+        imported = []
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bundle-sync") as pool:
+            futures = {path: pool.submit(self.import_bundle, path, verify) for path in pending}
+            for path, future in futures.items():
+                try:
+                    imported.append(future.result()['video_id'])
+                except Exception as e:
+                    failed[path.name] = str(e)
+        return {'imported': imported, 'skipped': skipped, 'failed': failed}
+
+    def _is_current(self, manifest: dict) -> bool:
+        """Whether this node already serves the bundled (or a newer) build."""
+        video_id = manifest.get("video_id")
+        metadata_path = self.metadata_dir / f"{video_id}.json"
+        if not video_id or not metadata_path.exists() or not self.vector_store.index_exists(video_id):
+            return False
+        try:
+            local = VideoMetadata.load(metadata_path)
+        except (OSError, ValueError, TypeError):
+            return False
+        return local.processed_at >= manifest.get("metadata", {}).get("processed_at", "")
+
+    def _check_compatible(self, manifest: dict, path: Path):
+        """Vectors from another embedding model can't be searched with this one."""
+        if not re.fullmatch(r"[\w-]+", str(manifest.get("video_id", ""))):
+            raise BundleError(f"{path} has a missing or invalid video_id")
+        if manifest.get("embedding_model") != self.embedding_model:
+            raise BundleError(
+                f"{path} was built with {manifest.get('embedding_model')}; "
+                f"this node uses {self.embedding_model}"
+            )
+        if manifest.get("dimension") != self.vector_store.dimension:
+            raise BundleError(
+                f"{path} has {manifest.get('dimension')}-dimensional vectors; "
+                f"this node uses {self.vector_store.dimension}"
+            )
+
+    def _save_metadata(self, metadata: VideoMetadata):
+        """Write metadata last and atomically; its presence lists the video in the library."""
+        path = self.metadata_dir / f"{metadata.video_id}.json"
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(metadata.to_dict(), f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+def main():
+    """Command line: export, import or sync bundles against the local data directory."""
+    from backend.config import config
+
+    parser = argparse.ArgumentParser(description="Portable video bundles")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write bundles for processed videos")
+    export.add_argument("video_ids", nargs="*", help="Default: every processed video")
+    export.add_argument("--output-dir", type=Path, default=config.BUNDLE_DIR)
+    imports = commands.add_parser("import", help="Import bundle files")
+    imports.add_argument("paths", nargs="+", type=Path)
+    imports.add_argument("--no-verify", action="store_true")
+    sync = commands.add_parser("sync", help="Import newer bundles from a directory")
+    sync.add_argument("directory", type=Path)
+    sync.add_argument("--workers", type=int, default=config.BUNDLE_SYNC_WORKERS)
+    sync.add_argument("--no-verify", action="store_true")
+    args = parser.parse_args()
+
+    manager = BundleManager(
+        VectorStore(**config.vector_store_kwargs()),
+        TranscriptStore(config.TRANSCRIPT_DIR),
+        StatusStore(config.STATUS_DB),
+        config.METADATA_DIR,
+        config.BUNDLE_DIR,
+        config.EMBEDDING_MODEL
+    )
+
+    if args.command == "export":
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        video_ids = args.video_ids or sorted(p.stem for p in config.METADATA_DIR.glob("*.json"))
+        for video_id in video_ids:
+            path = manager.export(video_id, args.output_dir / f"{video_id}{BUNDLE_SUFFIX}")
+            print(f"{video_id}: {path} ({path.stat().st_size / 1e6:.1f} MB)")
+    elif args.command == "import":
+        for path in args.paths:
+            result = manager.import_bundle(path, verify=not args.no_verify)
+            print(f"{result['video_id']}: {result['title']} ({result['num_chunks']} chunks, {result['version']})")
+    else:
+        result = manager.sync(args.directory, verify=not args.no_verify, workers=args.workers)
+        print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
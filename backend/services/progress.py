@@ -0,0 +1,87 @@
+"""In-process pub/sub for ingestion progress events."""
+import asyncio
+import queue
+import threading
+from typing import Dict, List, Optional
+
+class Subscription:
+    """Receives progress events for one video.
+
+    Sync consumers (Streamlit) call get(); async consumers (SSE endpoint)
+    pass their event loop and await aget(), so no executor thread is held
+    per open stream.
+    """
+
+    def __init__(self, video_id: str, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 maxsize: int = 256):
+        self.video_id = video_id
+        self._loop = loop
+        if loop is not None:
+            self._queue = asyncio.Queue(maxsize=maxsize)
+        else:
+            self._queue = queue.Queue(maxsize=maxsize)
+
+    def _put(self, event: dict):
+        """Enqueue event, dropping the oldest one if the consumer lags."""
+        try:
+            self._queue.put_nowait(event)
+        except (queue.Full, asyncio.QueueFull):
+            try:
+                self._queue.get_nowait()
+            except (queue.Empty, asyncio.QueueEmpty):
+                pass
+            self._queue.put_nowait(event)
+
+    def deliver(self, event: dict):
+        """Thread-safe delivery from ingestion workers."""
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._put, event)
+            except RuntimeError:
+                pass  # Loop already closed; subscriber is gone
+        else:
+            self._put(event)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Block until the next event; None on timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Await the next event; None on timeout."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class ProgressBroker:
+    """Fans out progress events from ingestion workers to subscribers."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, video_id: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> Subscription:
+        """Register a subscriber for a video's events."""
+        subscription = Subscription(video_id, loop=loop)
+        with self._lock:
+            self._subscribers.setdefault(video_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber."""
+        with self._lock:
+            subs = self._subscribers.get(subscription.video_id, [])
+            if subscription in subs:
+                subs.remove(subscription)
+            if not subs:
+                self._subscribers.pop(subscription.video_id, None)
+
+    def publish(self, video_id: str, event: dict):
+        """Deliver event to every subscriber of video_id."""
+        with self._lock:
+            subs = list(self._subscribers.get(video_id, []))
+        for subscription in subs:
+            subscription.deliver(event)
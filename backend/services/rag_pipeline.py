@@ -1,7 +1,8 @@
 """RAG pipeline for query processing."""
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from backend.models import DocumentChunk, RAGResponse
 from backend.core import VectorStore, LLMAdapter
+from backend.core.prompts import SYSTEM_PROMPT, build_user_prompt, contextualize_query, format_timestamp
 
 class RAGPipeline:
     """Retrieval-Augmented Generation pipeline."""
@@ -15,7 +16,13 @@ class RAGPipeline:
         video_id: str, 
         question: str,
         top_k: int = 5,
-        threshold: float = 0.3
+        threshold: float = 0.3,
+        conversation_history: Optional[List[Dict]] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        session_id: Optional[str] = None,
+        turn: int = 0
     ) -> RAGResponse:
         """
         Process query using RAG.
@@ -25,13 +32,24 @@ class RAGPipeline:
         2. Construct prompt with strict constraints
         3. Generate answer using LLM
         4. Parse and return response with sources
+        
+        Args:
+            start_time, end_time: Only retrieve from this part of the video
+            on_token: Stream the answer; called with each piece of text
+                as the LLM produces it
+            session_id: Conversation id, so the LLM can continue its stored
+                context instead of being re-sent the history
+            turn: Turns of the session answered before this one; a stored
+                context is continued only if it covers exactly these
         """
         # Retrieve relevant chunks
         results = self.vector_store.search(
             video_id=video_id,
-            query=question,
+            query=contextualize_query(question, conversation_history),
             top_k=top_k,
-            threshold=threshold
+            threshold=threshold,
+            start_time=start_time,
+            end_time=end_time
         )
         
         if not results:
@@ -41,11 +59,24 @@ class RAGPipeline:
                 video_id=video_id
             )
         
-        # Construct prompt
-        prompt = self._build_prompt(question, results)
+        # Construct prompt; a continued LLM context already holds the history
+        if self.llm.has_context(session_id, turn):
+            conversation_history = None
+        prompt = self._build_prompt(question, results, conversation_history)
         
         # Generate answer
-        answer = self.llm.generate(prompt, max_tokens=500)
+        if on_token is None:
+            answer = self.llm.generate(
+                prompt, max_tokens=500, system=SYSTEM_PROMPT, conversation_id=session_id, turn=turn
+            )
+        else:
+            pieces = []
+            for piece in self.llm.generate_stream(
+                prompt, max_tokens=500, system=SYSTEM_PROMPT, conversation_id=session_id, turn=turn
+            ):
+                pieces.append(piece)
+                on_token(piece)
+            answer = "".join(pieces)
         
         # Format sources
         sources = [
@@ -68,50 +99,21 @@ class RAGPipeline:
     def _build_prompt(
         self, 
         question: str, 
-        results: List[Tuple[DocumentChunk, float]]
+        results: List[Tuple[DocumentChunk, float]],
+        conversation_history: Optional[List[Dict]] = None
     ) -> str:
         """
-        Build prompt with strict anti-hallucination constraints.
+        Build the per-request part of the prompt.
         
         Prompt engineering strategy:
-        - Explicit instruction to only use provided context
+        - Strict anti-hallucination rules live in SYSTEM_PROMPT, a stable
+          prefix the provider can cache
         - Include timestamps in context for reference
         - Request citation of timestamps in answer
         - Penalize speculation
         """
-        context_parts = []
-        for i, (chunk, _) in enumerate(results, 1):
-            timestamp = self._format_timestamp(chunk.start_time)
-            context_parts.append(
-                f"[{i}] (Timestamp: {timestamp})\n{chunk.text}"
-            )
-        
-        context = "\n\n".join(context_parts)
-        
-        prompt = f"""You are a video content assistant. Answer the question using ONLY the information from the video transcript provided below.
-
-STRICT RULES:
-1. Only use information explicitly stated in the transcript
-2. If the answer is not in the transcript, say "This information is not covered in the video"
-3. Reference timestamps when possible (e.g., "At 2:30, the speaker mentions...")
-4. Do not add external knowledge or speculation
-5. Be concise and direct
-
-TRANSCRIPT EXCERPTS:
-{context}
-
-QUESTION: {question}
-
-ANSWER:"""
-        
-        return prompt
+        return build_user_prompt(question, [chunk for chunk, _ in results], conversation_history)
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format seconds as MM:SS or HH:MM:SS."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{secs:02d}"
-        return f"{minutes}:{secs:02d}"
+        return format_timestamp(seconds)
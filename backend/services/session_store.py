@@ -0,0 +1,139 @@
+"""Server-side conversation sessions with bounded memory."""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+from backend.utils.conversation_memory import ConversationMemory
+from backend.utils.metrics import registry
+
+SESSIONS_ACTIVE = registry.gauge(
+    "videorag_sessions_active", "Conversation sessions held in memory"
+)
+SESSION_BYTES = registry.gauge(
+    "videorag_sessions_bytes", "Approximate bytes of conversation text held by sessions"
+)
+SESSION_EVICTIONS = registry.counter(
+    "videorag_session_evictions_total", "Sessions removed by reason", ["reason"]
+)
+
+@dataclass
+class Session:
+    """One conversation about one video."""
+    session_id: str
+    video_id: str
+    memory: ConversationMemory
+    last_access: float = field(default_factory=time.monotonic)
+    size_bytes: int = 0
+    # Serializes turns within a session so history stays ordered
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+class SessionStore:
+    """
+    LRU store of conversation sessions keyed by session id.
+
+    Bounded by session count, a global byte cap over all conversation
+    text, and idle expiry. Sessions live in this process only; with
+    several API workers, route a session to one worker (sticky sessions).
+    """
+
+    def __init__(self, max_sessions: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 idle_ttl: float = 1800.0, max_turns: int = 5):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.max_turns = max_turns
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Get a live session and mark it recently used."""
+        with self._lock:
+            self._expire_idle()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_access = time.monotonic()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: Optional[str], video_id: str) -> Session:
+        """
+        Resume a session, or start one if missing/expired.
+
+        A session that switches to another video starts a fresh history.
+        """
+        session = self.get(session_id) if session_id else None
+        if session is not None and session.video_id != video_id:
+            with session.lock:
+                session.memory.clear()
+                session.video_id = video_id
+            self.touch(session)
+        if session is None:
+            session = Session(
+                session_id=session_id or uuid.uuid4().hex,
+                video_id=video_id,
+                memory=ConversationMemory(max_history=self.max_turns)
+            )
+            with self._lock:
+                self._sessions[session.session_id] = session
+                SESSIONS_ACTIVE.set(len(self._sessions))
+                self._enforce_limits()
+        return session
+
+    def touch(self, session: Session):
+        """Re-account a session's size after its history changed."""
+        with self._lock:
+            if self._sessions.get(session.session_id) is not session:
+                return  # Evicted meanwhile
+            new_size = session.memory.size_bytes()
+            self._total_bytes += new_size - session.size_bytes
+            session.size_bytes = new_size
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session.session_id)
+            self._enforce_limits()
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; False if it didn't exist."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            self._remove(session, "deleted")
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self._total_bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes
+            }
+
+    def _remove(self, session: Session, reason: str):
+        """Drop a session (caller holds the lock)."""
+        del self._sessions[session.session_id]
+        self._total_bytes -= session.size_bytes
+        SESSION_EVICTIONS.inc(reason=reason)
+        SESSIONS_ACTIVE.set(len(self._sessions))
+        SESSION_BYTES.set(self._total_bytes)
+
+    def _expire_idle(self):
+        """Drop sessions idle past the TTL; oldest are at the front (caller holds the lock)."""
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_access >= cutoff:
+                break
+            self._remove(oldest, "idle")
+
+    def _enforce_limits(self):
+        """Evict least recently used sessions over the caps (caller holds the lock)."""
+        self._expire_idle()
+        while len(self._sessions) > self.max_sessions or (
+            self._total_bytes > self.max_bytes and len(self._sessions) > 1
+        ):
+            self._remove(next(iter(self._sessions.values())), "capacity")
+        SESSION_BYTES.set(self._total_bytes)
@@ -0,0 +1,258 @@
+"""Multi-process-safe job status store backed by SQLite (WAL mode)."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+class StatusStore:
+    """
+    Shared status/job registry for all API worker processes on one host.
+
+    WAL mode lets readers (status polls) proceed concurrently with the
+    single writer, so reads stay cheap while ingestion workers update
+    progress. Each row carries a version counter that increments on every
+    write, which lets event streams detect changes made by other processes.
+    """
+
+    def __init__(self, db_path: Path, busy_timeout: float = 30.0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        # Identifies this process even after its pid is reused
+        self._token = _process_token(os.getpid())
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    video_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    worker_pid INTEGER,
+                    worker_token TEXT,
+                    updated_at REAL NOT NULL,
+                    data TEXT NOT NULL
+                )"""
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'worker_token' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN worker_token TEXT")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS batches (
+                    batch_id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    data TEXT NOT NULL
+                )"""
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=self.busy_timeout,
+                isolation_level=None  # Explicit transactions below
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, video_id: str) -> Optional[dict]:
+        """Get status dict (including 'version'), or None if unknown."""
+        row = self._connect().execute(
+            "SELECT data, version FROM jobs WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[0]), 'version': row[1]}
+
+    def get_many(self, video_ids: List[str]) -> Dict[str, dict]:
+        """Statuses of several jobs in one query; unknown ids are omitted."""
+        if not video_ids:
+            return {}
+        placeholders = ",".join("?" * len(video_ids))
+        rows = self._connect().execute(
+            f"SELECT video_id, data, version FROM jobs WHERE video_id IN ({placeholders})",
+            list(video_ids)
+        )
+        return {video_id: {**json.loads(data), 'version': version} for video_id, data, version in rows}
+
+    def put_batch(self, batch_id: str, batch: dict):
+        """Record a bulk ingestion request (its member videos are ordinary jobs)."""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO batches (batch_id, created_at, data) VALUES (?, ?, ?)",
+            (batch_id, time.time(), json.dumps(batch, default=str))
+        )
+
+    def get_batch(self, batch_id: str) -> Optional[dict]:
+        row = self._connect().execute(
+            "SELECT data FROM batches WHERE batch_id = ?", (batch_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_version(self, video_id: str) -> int:
+        """Cheap change check: current version, or -1 if unknown."""
+        row = self._connect().execute(
+            "SELECT version FROM jobs WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        return row[0] if row else -1
+
+    def put(self, video_id: str, status: dict) -> dict:
+        """Create or replace a job's status, owned by this process."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT version FROM jobs WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            version = (row[0] if row else 0) + 1
+            conn.execute(
+                """INSERT OR REPLACE INTO jobs
+                   (video_id, status, version, worker_pid, worker_token, updated_at, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (video_id, status.get('status', 'processing'), version,
+                 os.getpid(), self._token, time.time(), json.dumps(status, default=str))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {**status, 'version': version}
+
+    def claim(self, video_id: str, status: dict) -> Optional[dict]:
+        """
+        Like put(), but only if no live process is already working on the job.
+
+        The check and write share one transaction, so of several processes
+        (or threads) claiming the same video at once exactly one succeeds.
+
+        Returns:
+            The new status, or None if the job is already in flight
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT status, version, worker_pid, worker_token FROM jobs WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is not None and row[0] == 'processing' and row[2] and _worker_alive(row[2], row[3]):
+                conn.execute("ROLLBACK")
+                return None
+            version = (row[1] if row else 0) + 1
+            conn.execute(
+                """INSERT OR REPLACE INTO jobs
+                   (video_id, status, version, worker_pid, worker_token, updated_at, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (video_id, status.get('status', 'processing'), version,
+                 os.getpid(), self._token, time.time(), json.dumps(status, default=str))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {**status, 'version': version}
+
+    def update(self, video_id: str, changes: dict, drop: Iterable[str] = ()) -> Optional[dict]:
+        """
+        Atomically merge changes into an existing job's status.
+
+        Returns the updated status, or None if the job doesn't exist.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data, version FROM jobs WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            status = json.loads(row[0])
+            status.update(changes)
+            for key in drop:
+                status.pop(key, None)
+            version = row[1] + 1
+            conn.execute(
+                """UPDATE jobs SET status = ?, version = ?, updated_at = ?, data = ?
+                   WHERE video_id = ?""",
+                (status.get('status', 'processing'), version, time.time(),
+                 json.dumps(status, default=str), video_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {**status, 'version': version}
+
+    def list_jobs(self, status: Optional[str] = None) -> Dict[str, dict]:
+        """List jobs, optionally filtered by status."""
+        query = "SELECT video_id, data, version FROM jobs"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        return {
+            video_id: {**json.loads(data), 'version': version}
+            for video_id, data, version in self._connect().execute(query, params)
+        }
+
+    def fail_orphaned_jobs(self) -> int:
+        """
+        Mark 'processing' jobs whose worker process has exited as errored.
+
+        Returns number of jobs marked.
+        """
+        rows = self._connect().execute(
+            "SELECT video_id, worker_pid, worker_token FROM jobs WHERE status = 'processing'"
+        ).fetchall()
+        failed = 0
+        for video_id, pid, token in rows:
+            if pid and not _worker_alive(pid, token):
+                self.update(video_id, {
+                    'status': 'error',
+                    'error': 'Worker process exited before processing finished'
+                })
+                failed += 1
+        return failed
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with this pid exists on this host."""
+    if os.name == 'nt':
+        return True  # Signal 0 is CTRL_C_EVENT on Windows; assume alive
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _process_token(pid: int) -> Optional[str]:
+    """
+    Boot id and start time of a running process (Linux), or None.
+
+    Pids are reused after restarts, and containers hand out the same small
+    pids every time; the start time tells a reused pid from the original.
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        boot_id = Path("/proc/sys/kernel/random/boot_id").read_text().strip()
+        # Fields after the parenthesised command name; starttime is field 22
+        start_time = stat.rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+    return f"{boot_id}:{start_time}"
+
+def _worker_alive(pid: int, token: Optional[str]) -> bool:
+    """Whether the process that wrote a job row (pid plus token) is still running."""
+    if not _pid_alive(pid):
+        return False
+    if token is None:
+        return True  # Written without a token; only the pid can be checked
+    current = _process_token(pid)
+    return current is None or current == token
@@ -1,85 +1,378 @@
 """Main service facade for video RAG operations."""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict
-from pathlib import Path
+import dataclasses
+import hashlib
+import json
 import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from pathlib import Path
 from backend.config import config
 from backend.models import VideoMetadata, RAGResponse
 from backend.core import (
     VideoDownloader, 
+    AudioCache,
     Transcriber, 
+    TranscriptStore,
     TranscriptChunker, 
     VectorStore,
     create_llm_adapter
 )
+from backend.services.bundles import BundleManager
 from backend.services.rag_pipeline import RAGPipeline
+from backend.services.progress import ProgressBroker, Subscription
+from backend.services.session_store import SessionStore
+from backend.services.status_store import StatusStore
+from backend.core.prompts import build_summary_prompt, format_timestamp
+from backend.core.captions import assess_captions
 from backend.workflows import RAGGraph
+from backend.utils.admission import BacklogLimit, Overloaded
+from backend.utils.cpu_budget import cpu_meter
+from backend.utils.metrics import registry
+from backend.utils.profiler import profiler
+from backend.utils.singleflight import SINGLE_FLIGHT_CALLS, SingleFlight
+from backend.utils.tracing import tracer
+
+INGEST_STAGE_SECONDS = registry.histogram(
+    "videorag_ingest_stage_seconds", "Duration of each ingestion stage", ["stage"]
+)
+INGEST_JOBS_TOTAL = registry.counter(
+    "videorag_ingest_jobs_total", "Finished ingestion jobs by result", ["result"]
+)
+INGEST_JOBS_QUEUED = registry.gauge(
+    "videorag_ingest_jobs_queued", "Ingestion jobs waiting for a worker in this process"
+)
+INGEST_JOBS_IN_PROGRESS = registry.gauge(
+    "videorag_ingest_jobs_in_progress", "Ingestion jobs currently running in this process"
+)
+AUDIO_SECONDS_TRANSCRIBED = registry.counter(
+    "videorag_audio_seconds_transcribed_total", "Seconds of audio transcribed"
+)
+TRANSCRIPTION_SPEED = registry.histogram(
+    "videorag_transcription_speed_ratio",
+    "Audio seconds transcribed per wall-clock second",
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128)
+)
+INGEST_TRANSCRIPT_SOURCE = registry.counter(
+    "videorag_ingest_transcript_source_total",
+    "Transcripts by source (whisper, captions_manual, captions_auto)",
+    ["source"]
+)
+QUERY_SECONDS = registry.histogram(
+    "videorag_query_seconds", "End-to-end query latency", ["engine"]
+)
+HISTORY_SUMMARIZATIONS = registry.counter(
+    "videorag_history_summarizations_total", "Older conversation turns folded into a session summary"
+)
 
 class VideoRAGService:
     """Facade for all video RAG operations."""
     
     def __init__(self):
+        tracer.configure(
+            enabled=config.TRACING_ENABLED,
+            slow_threshold=config.TRACE_SLOW_SECONDS,
+            log_path=config.TRACE_LOG_PATH,
+            max_bytes=int(config.TRACE_LOG_MAX_MB * 1024 * 1024),
+            backups=config.TRACE_LOG_BACKUPS
+        )
+        profiler.configure(
+            enabled=config.PROFILING_ENABLED,
+            interval=config.PROFILE_INTERVAL_MS / 1000,
+            output_dir=config.PROFILE_DIR,
+            request_rate=config.PROFILE_REQUEST_RATE,
+            job_rate=config.PROFILE_INGEST_RATE,
+            max_files=config.PROFILE_MAX_FILES
+        )
+        
+        # Split the cores between query serving and ingestion before any
+        # engine starts its thread pools
+        self.cpu_budget = config.cpu_budget()
+        if self.cpu_budget:
+            self.cpu_budget.apply()
+        ingest_workers = self.cpu_budget.ingest_workers if self.cpu_budget else config.INGEST_WORKERS
+        
         # Initialize components
-        self.downloader = VideoDownloader(config.CACHE_DIR)
+        self.downloader = VideoDownloader(config.CACHE_DIR, audio_format=config.AUDIO_FORMAT)
         self.transcriber = Transcriber(
             model_size=config.WHISPER_MODEL,
-            device=config.WHISPER_DEVICE
+            device=config.WHISPER_DEVICE,
+            word_timestamps=config.WHISPER_WORD_TIMESTAMPS,
+            profile=config.WHISPER_PROFILE,
+            cpu_threads=self.cpu_budget.whisper_threads if self.cpu_budget else config.WHISPER_CPU_THREADS,
+            num_workers=config.WHISPER_NUM_WORKERS or (ingest_workers if self.cpu_budget else None)
         )
+        self.transcripts = TranscriptStore(config.TRANSCRIPT_DIR)
+        self.audio_cache = AudioCache(
+            config.CACHE_DIR,
+            max_bytes=int(config.AUDIO_CACHE_MAX_MB * 1024 * 1024),
+            has_transcript=self.transcripts.exists,
+            orphan_grace=config.AUDIO_CACHE_ORPHAN_HOURS * 3600
+        )
+        self.audio_cache.enforce_budget()
         self.chunker = TranscriptChunker(
             chunk_size=config.CHUNK_SIZE,
             overlap=config.CHUNK_OVERLAP
         )
-        self.vector_store = VectorStore(
-            embedding_model=config.EMBEDDING_MODEL,
-            dimension=config.EMBEDDING_DIMENSION,
-            index_dir=config.FAISS_DIR
-        )
-        self.llm = create_llm_adapter(
-            provider=config.LLM_PROVIDER,
-            api_key=config.GROQ_API_KEY,
-            model=config.GROQ_MODEL if config.LLM_PROVIDER == "groq" else config.OLLAMA_MODEL,
-            base_url=config.OLLAMA_BASE_URL
-        )
+        self.vector_store = VectorStore(**config.vector_store_kwargs())
+        self.llm = create_llm_adapter(**config.llm_kwargs())
         self.rag_pipeline = RAGPipeline(self.vector_store, self.llm)
-        self.rag_graph = RAGGraph()
+        # One adapter for both engines, so they continue the same LLM contexts
+        self.rag_graph = RAGGraph(self.llm)
+        self.query_flights = SingleFlight("query")
+        # Library search reads video metadata; cached by file mtime
+        self._catalog: Dict[str, tuple] = {}
         
-        # Processing status tracking
-        self._processing_status: Dict[str, dict] = {}
-        self._lock = threading.Lock()
-    
-    def ingest_video(self, url: str) -> str:
-        """Start video ingestion process."""
-        audio_path, metadata = self.downloader.download_audio(url)
-        video_id = metadata['video_id']
+        # Processing status tracking, shared by all worker processes
+        self.status_store = StatusStore(config.STATUS_DB)
+        self.status_store.fail_orphaned_jobs()
+        self.progress = ProgressBroker()
+        # Bounded ingestion fan-out; workers share the loaded Whisper and embedding models
+        self.ingest_pool = ThreadPoolExecutor(
+            max_workers=ingest_workers,
+            thread_name_prefix="ingest"
+        )
+        # The pool's queue is unbounded; submissions past this backlog are refused
+        self.ingest_backlog = BacklogLimit("ingest", ingest_workers, config.INGEST_MAX_QUEUE)
         
-        with self._lock:
-            self._processing_status[video_id] = {
-                'status': 'processing',
-                'stage': 'downloading',
-                'progress': 0.1,
-                'metadata': metadata
-            }
+        # Multi-turn conversations, bounded by count, bytes and idle time
+        self.sessions = SessionStore(
+            max_sessions=config.SESSION_MAX_SESSIONS,
+            max_bytes=int(config.SESSION_MAX_MEMORY_MB * 1024 * 1024),
+            idle_ttl=config.SESSION_IDLE_TTL,
+            max_turns=config.SESSION_MAX_TURNS
+        )
         
-        thread = threading.Thread(
-            target=self._process_video,
-            args=(video_id, audio_path, metadata)
+        # Portable bundles; a fresh node pulls the shared library in the background
+        self.bundles = BundleManager(
+            self.vector_store,
+            self.transcripts,
+            self.status_store,
+            metadata_dir=config.METADATA_DIR,
+            bundle_dir=config.BUNDLE_DIR,
+            embedding_model=config.EMBEDDING_MODEL
         )
-        thread.daemon = True
-        thread.start()
+        self.last_bundle_sync: Optional[dict] = None
+        if config.BUNDLE_SYNC_DIR:
+            threading.Thread(
+                target=self.sync_bundles, args=(config.BUNDLE_SYNC_DIR,),
+                name="bundle-sync", daemon=True
+            ).start()
+    
+    def ingest_video(self, url: str, profile: bool = False) -> str:
+        """
+        Start video ingestion process.
         
+        Args:
+            profile: Capture a sampling profile of this job (needs
+                PROFILING_ENABLED); listed by list_profiles()
+        """
+        url = self.downloader.canonical_url(url)
+        video_id = self.downloader.get_video_id(url)
+        # A concurrent ingest of the same video is joined rather than repeated
+        self._enqueue(video_id, url, profile)
         return video_id
     
-    def _process_video(self, video_id: str, audio_path: str, metadata: dict):
-        """Background processing of video."""
+    def ingest_batch(self, urls: List[str], force: bool = False) -> dict:
+        """
+        Ingest videos, playlists and channels in one request.
+        
+        URLs are expanded to individual videos and deduplicated by video_id.
+        Videos that are already indexed or already being processed are not
+        queued again unless force is set.
+        
+        Returns:
+            Aggregate batch status (see get_batch_status)
+        
+        Raises:
+            Overloaded: The videos to queue don't fit in the ingestion backlog
+        """
+        videos, seen = [], set()
+        for url in urls:
+            for entry in self.downloader.expand_url(url, max_videos=config.BULK_MAX_VIDEOS):
+                video_id = self.downloader.get_video_id(entry['url'])
+                if video_id in seen or len(videos) >= config.BULK_MAX_VIDEOS:
+                    continue
+                seen.add(video_id)
+                videos.append({'video_id': video_id, 'url': entry['url'], 'title': entry.get('title')})
+        
+        existing = self.status_store.get_many([v['video_id'] for v in videos])
+        if force:
+            reserved = len(videos)
+        else:
+            reserved = sum(
+                1 for v in videos
+                if existing.get(v['video_id'], {}).get('status') != 'processing'
+                and not self.vector_store.index_exists(v['video_id'])
+            )
+        # All or nothing, so a concurrent submitter can't fill the backlog
+        # while this batch is half queued
+        self.ingest_backlog.acquire(reserved)
         try:
-            self._update_status(video_id, 'transcribing', 0.3)
-            segments = self.transcriber.transcribe(audio_path)
+            for video in videos:
+                status = existing.get(video['video_id'], {})
+                if not force and status.get('status') == 'processing':
+                    video['action'] = 'in_progress'
+                elif not force and self.vector_store.index_exists(video['video_id']):
+                    video['action'] = 'already_indexed'
+                else:
+                    try:
+                        queued = self._enqueue(video['video_id'], video['url'], reserved=reserved > 0)
+                    except Overloaded:
+                        # Needed a slot beyond the reservation (its status changed meanwhile)
+                        video['action'] = 'rejected'
+                        continue
+                    finally:
+                        reserved = max(0, reserved - 1)
+                    # Not queued: started concurrently elsewhere
+                    video['action'] = 'queued' if queued else 'in_progress'
+        finally:
+            if reserved:
+                self.ingest_backlog.release(count=reserved)
+        
+        batch_id = uuid.uuid4().hex[:12]
+        self.status_store.put_batch(batch_id, {
+            'batch_id': batch_id,
+            'urls': urls,
+            'created_at': datetime.now().isoformat(),
+            'videos': videos
+        })
+        return self.get_batch_status(batch_id)
+    
+    def get_batch_status(self, batch_id: str) -> Optional[dict]:
+        """
+        Aggregate progress of a bulk ingestion.
+        
+        Returns:
+            {batch_id, status, total, counts, progress, videos} or None if
+            the batch is unknown. status is 'processing' while any video is,
+            then 'complete' or 'partial' (some videos failed or were rejected).
+        """
+        batch = self.status_store.get_batch(batch_id)
+        if batch is None:
+            return None
+        
+        statuses = self.status_store.get_many([v['video_id'] for v in batch['videos']])
+        counts = {'processing': 0, 'complete': 0, 'error': 0}
+        videos, progress = [], 0.0
+        for video in batch['videos']:
+            status = statuses.get(video['video_id'])
+            if video.get('action') == 'rejected':
+                status = {'status': 'rejected', 'progress': 0.0, 'error': 'Ingestion backlog was full'}
+            elif status is None:
+                # Indexed before status tracking existed (or store was reset)
+                status = {'status': 'complete', 'stage': 'complete', 'progress': 1.0}
+            state = status.get('status', 'processing')
+            counts[state] = counts.get(state, 0) + 1
+            progress += status.get('progress', 0.0) if state == 'processing' else 1.0
+            videos.append({
+                **video,
+                'status': state,
+                'stage': status.get('stage'),
+                'progress': status.get('progress', 0.0),
+                'error': status.get('error'),
+                'transcript_source': status.get('transcript_source')
+            })
+        
+        total = len(videos)
+        if counts['processing']:
+            state = 'processing'
+        else:
+            state = 'partial' if counts['error'] or counts.get('rejected') else 'complete'
+        return {
+            'batch_id': batch_id,
+            'status': state,
+            'total': total,
+            'counts': counts,
+            'progress': progress / total if total else 1.0,
+            'videos': videos
+        }
+    
+    def _enqueue(self, video_id: str, url: str, profile: bool = False, reserved: bool = False) -> bool:
+        """
+        Register a job and hand it to the bounded ingestion pool.
+        
+        Args:
+            reserved: The caller already holds a backlog slot for this job;
+                it is used (or released) either way
+        
+        Returns:
+            False if the video is already being processed (by any worker
+            process); the caller then follows that job instead of racing it
+        
+        Raises:
+            Overloaded: The ingestion backlog is full
+        """
+        if not reserved:
+            self.ingest_backlog.acquire()
+        try:
+            status = self.status_store.claim(video_id, {
+                'status': 'processing',
+                'stage': 'queued',
+                'progress': 0.0,
+                'metadata': {'video_id': video_id, 'url': url}
+            })
+        except Exception:
+            self.ingest_backlog.release()
+            raise
+        if status is None:
+            self.ingest_backlog.release()
+            SINGLE_FLIGHT_CALLS.inc(kind='ingest', role='follower')
+            return False
+        SINGLE_FLIGHT_CALLS.inc(kind='ingest', role='leader')
+        self._publish(video_id, 'status', status)
+        INGEST_JOBS_QUEUED.inc()
+        try:
+            self.ingest_pool.submit(self._process_video, video_id, url, profile)
+        except Exception as e:
+            # Don't leave a claimed job that no worker will ever finish
+            INGEST_JOBS_QUEUED.dec()
+            self.ingest_backlog.release()
+            self._update_status(video_id, 'error', 0.0, error=f"Could not start ingestion: {e}")
+            raise
+        return True
+    
+    def _process_video(self, video_id: str, url: str, profile: bool = False):
+        """Background processing of video; sampled by the profiler if requested."""
+        started = time.monotonic()
+        try:
+            with profiler.session("ingest", video_id, enabled=profiler.selected(profile, profiler.job_rate)):
+                self._ingest(video_id, url)
+        finally:
+            self.ingest_backlog.release(time.monotonic() - started)
+    
+    def _ingest(self, video_id: str, url: str):
+        """Transcribe, chunk and index one video, reporting progress."""
+        INGEST_JOBS_QUEUED.dec()
+        INGEST_JOBS_IN_PROGRESS.inc()
+        try:
+            # Stage progress ranges: download 0-0.3, transcribe 0.3-0.6,
+            # chunk 0.6, embed/index 0.8-0.95
+            transcript = self._caption_transcript(video_id, url) if config.CAPTIONS_FIRST else None
+            if transcript is not None:
+                segments, metadata, source = transcript
+                self.transcripts.save(video_id, segments)
+            else:
+                segments, metadata = self._transcribe_audio(video_id, url)
+                source = 'whisper'
+            INGEST_TRANSCRIPT_SOURCE.inc(source=source)
+            self.status_store.update(video_id, {'metadata': metadata, 'transcript_source': source})
             
             self._update_status(video_id, 'chunking', 0.6)
-            chunks = self.chunker.chunk(segments, video_id)
+            with INGEST_STAGE_SECONDS.time(stage='chunk'):
+                chunks = self.chunker.chunk(segments, video_id)
+            
+            def on_embed(embedded: int, total: int):
+                self._report_progress(
+                    video_id, 'indexing', 0.8 + 0.15 * embedded / total,
+                    chunks_embedded=embedded, total_chunks=total
+                )
             
             self._update_status(video_id, 'indexing', 0.8)
-            self.vector_store.create_index(video_id, chunks)
+            with INGEST_STAGE_SECONDS.time(stage='index'):
+                self.vector_store.create_index(video_id, chunks, progress_callback=on_embed)
             
             video_metadata = VideoMetadata(
                 video_id=video_id,
@@ -87,45 +380,409 @@ class VideoRAGService:
                 title=metadata['title'],
                 duration=metadata['duration'],
                 num_chunks=len(chunks),
-                processed_at=datetime.now().isoformat()
+                processed_at=datetime.now().isoformat(),
+                transcript_source=source,
+                upload_date=metadata.get('upload_date')
             )
             metadata_path = config.METADATA_DIR / f"{video_id}.json"
             video_metadata.save(metadata_path)
             
             self._update_status(video_id, 'complete', 1.0)
+            INGEST_JOBS_TOTAL.inc(result='complete')
             
         except Exception as e:
             self._update_status(video_id, 'error', 0.0, error=str(e))
+            INGEST_JOBS_TOTAL.inc(result='error')
+        finally:
+            INGEST_JOBS_IN_PROGRESS.dec()
+    
+    def _caption_transcript(self, video_id: str, url: str):
+        """
+        Use the video's subtitles as the transcript if they look reliable.
+        
+        Returns:
+            (segments, metadata, source) with source 'captions_manual' or
+            'captions_auto', or None to fall back to Whisper
+        """
+        self._update_status(video_id, 'fetching_captions', 0.0)
+        try:
+            with INGEST_STAGE_SECONDS.time(stage='captions'):
+                segments, kind, metadata = self.downloader.fetch_captions(
+                    url,
+                    languages=config.CAPTIONS_LANGUAGES,
+                    allow_auto=config.CAPTIONS_ALLOW_AUTO
+                )
+        except Exception as e:
+            self.status_store.update(video_id, {'captions_rejected': f"fetch failed: {e}"})
+            return None
+        
+        usable, reason = assess_captions(segments or [], metadata.get('duration') or 0)
+        if not usable:
+            self.status_store.update(video_id, {'captions_rejected': reason})
+            return None
+        return segments, metadata, f"captions_{kind}"
+    
+    def _transcribe_audio(self, video_id: str, url: str):
+        """Download audio and run Whisper; returns (segments, metadata)."""
+        last_pct = [-1]
+        
+        def on_download(downloaded: int, total: Optional[int]):
+            fraction = downloaded / total if total else 0.0
+            pct = int(fraction * 100)
+            if pct != last_pct[0]:
+                last_pct[0] = pct
+                self._report_progress(
+                    video_id, 'downloading', 0.3 * fraction,
+                    downloaded_bytes=downloaded, total_bytes=total
+                )
+        
+        def on_transcribe(seconds: float, total: float):
+            fraction = min(seconds / total, 1.0) if total else 0.0
+            self._report_progress(
+                video_id, 'transcribing', 0.3 + 0.3 * fraction,
+                transcribed_seconds=round(seconds, 1), total_seconds=round(total, 1)
+            )
+        
+        # Audio can't be evicted until its transcript is saved
+        with self.audio_cache.pin(video_id):
+            self.audio_cache.lookup(video_id)  # Refresh LRU position / count hit
+            self._update_status(video_id, 'downloading', 0.0)
+            with INGEST_STAGE_SECONDS.time(stage='download'):
+                audio_path, metadata = self.downloader.download_audio(url, progress_callback=on_download)
+            self.status_store.update(video_id, {'metadata': metadata})
+            
+            self._update_status(video_id, 'transcribing', 0.3)
+            started = time.perf_counter()
+            with cpu_meter.track("whisper"):
+                segments, words = self.transcriber.transcribe_with_words(audio_path, progress_callback=on_transcribe)
+            elapsed = time.perf_counter() - started
+            self.transcripts.save(video_id, segments, words)
+        self.audio_cache.enforce_budget()
+        
+        INGEST_STAGE_SECONDS.observe(elapsed, stage='transcribe')
+        audio_seconds = segments[-1].end if segments else 0.0
+        AUDIO_SECONDS_TRANSCRIBED.inc(audio_seconds)
+        if elapsed > 0 and audio_seconds > 0:
+            TRANSCRIPTION_SPEED.observe(audio_seconds / elapsed)
+        return segments, metadata
     
     def get_status(self, video_id: str) -> dict:
         """Get processing status for video."""
-        with self._lock:
-            return self._processing_status.get(video_id, {
-                'status': 'unknown',
-                'stage': 'unknown',
-                'progress': 0.0
-            })
+        return self.status_store.get(video_id) or {
+            'status': 'unknown',
+            'stage': 'unknown',
+            'progress': 0.0
+        }
     
-    def query(self, video_id: str, question: str, use_langgraph: bool = True) -> RAGResponse:
-        """Query video content."""
-        if not self.vector_store.index_exists(video_id):
-            raise ValueError(f"Video {video_id} not processed or not found")
-        
-        if use_langgraph:
-            result = self.rag_graph.query(video_id, question)
-            return RAGResponse(
-                answer=result["answer"],
-                sources=result["sources"],
-                video_id=video_id
-            )
-        else:
-            return self.rag_pipeline.query(
-                video_id=video_id,
-                question=question,
-                top_k=config.TOP_K_RETRIEVAL,
-                threshold=config.SIMILARITY_THRESHOLD
+    def subscribe(self, video_id: str, loop=None) -> Subscription:
+        """
+        Subscribe to live progress events for a video.
+        
+        Subscribe before reading get_status() so no transition is missed.
+        Pass an asyncio loop for async consumers.
+        """
+        return self.progress.subscribe(video_id, loop=loop)
+    
+    def unsubscribe(self, subscription: Subscription):
+        """Stop receiving progress events."""
+        self.progress.unsubscribe(subscription)
+    
+    def query(
+        self,
+        video_id: str,
+        question: str,
+        use_langgraph: bool = True,
+        session_id: Optional[str] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        trace_id: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> RAGResponse:
+        """
+        Query video content.
+        
+        Args:
+            session_id: Continue this conversation; a new session is
+                started if omitted or expired. Returned on the response.
+            start_time, end_time: Answer only from this part of the video
+                (seconds), e.g. a chapter
+            trace_id: Id for this request's trace (generated if omitted);
+                returned on the response
+            on_token: Stream the answer through this callback as it is
+                generated. Streaming uses the single-pass pipeline, since
+                the LangGraph validator may rewrite an answer after the fact.
+        """
+        use_langgraph = use_langgraph and on_token is None
+        engine = 'langgraph' if use_langgraph else 'pipeline'
+        with tracer.trace("query", trace_id=trace_id, video_id=video_id, engine=engine) as trace, \
+                profiler.session("query", trace.trace_id, enabled=profiler.requested()) as profile:
+            if profile is not None:
+                trace.root.set(profile=profile.name)
+            if not self.vector_store.index_exists(video_id):
+                raise ValueError(f"Video {video_id} not processed or not found")
+            
+            session = self.sessions.get_or_create(session_id, video_id)
+            # Turns of one session are serialized; time spent queued shows up here
+            with tracer.span("session_wait", session=self._session_ref(session.session_id)):
+                session.lock.acquire()
+            try:
+                with tracer.span("history") as span:
+                    history = session.memory.compressed_history(
+                        config.SESSION_HISTORY_TOKENS,
+                        summarize=self._summarize_history,
+                        count_tokens=lambda text: len(self.chunker.tokenizer.encode(text))
+                    )
+                    span.set(turns=len(history))
+                turn = len(session.memory)
+                
+                def answer():
+                    if use_langgraph:
+                        with QUERY_SECONDS.time(engine='langgraph'):
+                            result = self.rag_graph.query(
+                                video_id, question,
+                                conversation_history=history,
+                                session_id=session.session_id,
+                                turn=turn,
+                                start_time=start_time,
+                                end_time=end_time
+                            )
+                        return RAGResponse(
+                            answer=result["answer"],
+                            sources=result["sources"],
+                            video_id=video_id
+                        ), result["intent"]
+                    with QUERY_SECONDS.time(engine='pipeline'):
+                        return self.rag_pipeline.query(
+                            video_id=video_id,
+                            question=question,
+                            top_k=config.TOP_K_RETRIEVAL,
+                            threshold=config.SIMILARITY_THRESHOLD,
+                            conversation_history=history,
+                            start_time=start_time,
+                            end_time=end_time,
+                            on_token=on_token,
+                            session_id=session.session_id,
+                            turn=turn
+                        ), ""
+                
+                # Identical concurrent questions (same video, window and
+                # history) share one retrieval and LLM call
+                key = self._query_key(video_id, question, engine, start_time, end_time, history)
+                with tracer.span("single_flight") as span:
+                    (response, intent), shared = self.query_flights.do(key, answer)
+                    span.set(coalesced=shared)
+                if shared:
+                    response = dataclasses.replace(response)
+                    if on_token is not None:
+                        on_token(response.answer)
+                
+                session.memory.add_turn(question, response.answer, intent)
+            finally:
+                session.lock.release()
+            self.sessions.touch(session)
+            trace.root.set(session=self._session_ref(session.session_id), intent=intent, sources=len(response.sources))
+        
+        response.session_id = session.session_id
+        response.trace_id = trace.trace_id
+        return response
+    
+    @staticmethod
+    def _query_key(
+        video_id: str,
+        question: str,
+        engine: str,
+        start_time: Optional[float],
+        end_time: Optional[float],
+        history: List[Dict]
+    ) -> str:
+        """Questions differing only in case or spacing coalesce."""
+        normalized = " ".join(question.lower().split())
+        payload = json.dumps([video_id, normalized, engine, start_time, end_time, history], default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    
+    def search_library(
+        self,
+        query: str,
+        top_k: int = 10,
+        video_ids: Optional[List[str]] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        min_duration: Optional[float] = None,
+        max_duration: Optional[float] = None,
+        published_after: Optional[str] = None,
+        published_before: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Semantic search across all processed videos.
+        
+        Videos are first narrowed by metadata (duration in seconds, upload
+        date as YYYY-MM-DD, inclusive), then only chunks inside the
+        start_time/end_time window of each remaining video are scored.
+        
+        Returns:
+            Best matching passages, highest similarity first
+        """
+        with profiler.session("search", uuid.uuid4().hex[:12], enabled=profiler.requested()):
+            return self._search_library(
+                query, top_k, video_ids, start_time, end_time,
+                min_duration, max_duration, published_after, published_before
             )
     
+    def _search_library(
+        self,
+        query: str,
+        top_k: int,
+        video_ids: Optional[List[str]],
+        start_time: Optional[float],
+        end_time: Optional[float],
+        min_duration: Optional[float],
+        max_duration: Optional[float],
+        published_after: Optional[str],
+        published_before: Optional[str]
+    ) -> List[dict]:
+        wanted = set(video_ids) if video_ids is not None else None
+        videos = {}
+        for metadata in self._library():
+            if wanted is not None and metadata.video_id not in wanted:
+                continue
+            if min_duration is not None and metadata.duration < min_duration:
+                continue
+            if max_duration is not None and metadata.duration > max_duration:
+                continue
+            if published_after or published_before:
+                if not metadata.upload_date:
+                    continue
+                if published_after and metadata.upload_date < published_after:
+                    continue
+                if published_before and metadata.upload_date > published_before:
+                    continue
+            videos[metadata.video_id] = metadata
+        
+        results = self.vector_store.search_videos(
+            list(videos), query,
+            top_k=top_k,
+            threshold=config.SIMILARITY_THRESHOLD,
+            start_time=start_time,
+            end_time=end_time
+        )
+        return [
+            {
+                'video_id': chunk.video_id,
+                'title': videos[chunk.video_id].title,
+                'text': chunk.text,
+                'start_time': chunk.start_time,
+                'end_time': chunk.end_time,
+                'similarity': similarity,
+                'timestamp_url': format_timestamp(chunk.start_time)
+            }
+            for chunk, similarity in results
+        ]
+    
+    def _library(self) -> List[VideoMetadata]:
+        """Metadata of every processed video, re-read only when a file changes."""
+        catalog = {}
+        for path in config.METADATA_DIR.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            cached = self._catalog.get(path.name)
+            if cached is None or cached[0] != mtime:
+                try:
+                    cached = (mtime, VideoMetadata.load(path))
+                except (OSError, ValueError, TypeError):
+                    continue  # Being rewritten or not a metadata file
+            catalog[path.name] = cached
+        self._catalog = catalog
+        return [metadata for _, metadata in catalog.values()]
+    
+    @staticmethod
+    def _session_ref(session_id: str) -> str:
+        """
+        Stand-in for a session id in traces and logs.
+        
+        The id is the only credential for a conversation, so traces carry a
+        hash that groups a session's requests without revealing it.
+        """
+        return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16]
+    
+    def end_session(self, session_id: str) -> bool:
+        """Discard a conversation; False if it was unknown or already expired."""
+        return self.sessions.delete(session_id)
+    
+    def _summarize_history(self, previous_summary: str, turns: List[Dict]) -> str:
+        """Fold older turns into the running summary with one LLM call."""
+        HISTORY_SUMMARIZATIONS.inc()
+        try:
+            return self.llm.generate(build_summary_prompt(previous_summary, turns), max_tokens=150).strip()
+        except Exception:
+            # Losing old turns is better than failing the user's question
+            return previous_summary
+    
+    def locate_phrase(
+        self,
+        video_id: str,
+        phrase: str,
+        start: float = 0.0,
+        end: float = float("inf")
+    ) -> Optional[float]:
+        """
+        Second at which a phrase is spoken, e.g. within a cited source's range.
+        
+        Returns:
+            Start time of the phrase, or None if not found or the video
+            was transcribed without word timestamps
+        """
+        words = self.transcripts.load_words(video_id)
+        if words is None:
+            return None
+        return words.find_phrase(phrase, start, end)
+    
+    def export_bundle(self, video_id: str) -> Path:
+        """Write a video's single-file bundle under BUNDLE_DIR and return its path."""
+        return self.bundles.export(video_id)
+    
+    def import_bundle(self, path: Path) -> dict:
+        """Verify a bundle and serve its video from this node."""
+        return self.bundles.import_bundle(path)
+    
+    def sync_bundles(self, directory: Optional[Path] = None) -> dict:
+        """
+        Import every bundle in a directory that is newer than the local copy.
+        
+        Returns:
+            {imported, skipped, failed}; also kept as last_bundle_sync
+        """
+        result = self.bundles.sync(
+            directory or config.BUNDLE_SYNC_DIR, workers=config.BUNDLE_SYNC_WORKERS
+        )
+        self.last_bundle_sync = {**result, 'finished_at': datetime.now().isoformat()}
+        return result
+    
+    def slow_traces(self, limit: int = 20) -> List[dict]:
+        """Most recent traces over TRACE_SLOW_SECONDS, newest first."""
+        return tracer.recent_slow(limit)
+    
+    def list_profiles(self, kind: Optional[str] = None, limit: int = 100) -> List[dict]:
+        """Captured sampling profiles (ingest, query, search), newest first."""
+        return profiler.list_profiles(kind, limit)
+    
+    def profile_path(self, name: str) -> Optional[Path]:
+        """Collapsed-stack file of a captured profile, or None."""
+        return profiler.profile_path(name)
+    
+    def admission_stats(self) -> dict:
+        """Ingestion backlog usage (request queues are reported by the API)."""
+        return {'ingest': self.ingest_backlog.stats()}
+    
+    def cpu_stats(self) -> dict:
+        """CPU budget, per-engine busy time and utilization of each engine's core pool."""
+        return cpu_meter.report(self.cpu_budget)
+    
+    def cache_stats(self) -> dict:
+        """Disk usage of the audio cache."""
+        return self.audio_cache.stats()
+    
     def get_metadata(self, video_id: str) -> Optional[VideoMetadata]:
         """Get video metadata."""
         metadata_path = config.METADATA_DIR / f"{video_id}.json"
@@ -135,11 +792,24 @@ class VideoRAGService:
     
     def _update_status(self, video_id: str, stage: str, progress: float, error: str = None):
         """Update processing status."""
-        with self._lock:
-            if video_id in self._processing_status:
-                self._processing_status[video_id].update({
-                    'stage': stage,
-                    'progress': progress,
-                    'status': 'error' if error else ('complete' if stage == 'complete' else 'processing'),
-                    'error': error
-                })
+        status = self.status_store.update(video_id, {
+            'stage': stage,
+            'progress': progress,
+            'status': 'error' if error else ('complete' if stage == 'complete' else 'processing'),
+            'error': error
+        }, drop=('detail',))
+        self._publish(video_id, 'status', status)
+    
+    def _report_progress(self, video_id: str, stage: str, progress: float, **detail):
+        """Record fine-grained progress within a stage and push it to subscribers."""
+        status = self.status_store.update(video_id, {
+            'stage': stage,
+            'progress': round(progress, 4),
+            'detail': detail
+        })
+        self._publish(video_id, 'progress', status)
+    
+    def _publish(self, video_id: str, event_type: str, status: Optional[dict]):
+        """Push a snapshot of the current status to in-process subscribers."""
+        if status is not None:
+            self.progress.publish(video_id, {'type': event_type, 'video_id': video_id, **status})
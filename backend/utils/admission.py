@@ -0,0 +1,197 @@
+"""Admission control: bounded concurrency and queues, rejecting work past capacity."""
+import asyncio
+import math
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+from backend.utils.metrics import registry
+
+T = TypeVar("T")
+
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "videorag_admission_in_flight", "Admitted requests or jobs currently running", ["queue"]
+)
+ADMISSION_QUEUE_DEPTH = registry.gauge(
+    "videorag_admission_queue_depth", "Requests or jobs waiting for a slot", ["queue"]
+)
+ADMISSION_REJECTIONS = registry.counter(
+    "videorag_admission_rejections_total", "Work rejected with 429 by queue and reason", ["queue", "reason"]
+)
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "videorag_admission_wait_seconds", "Time admitted requests spent queued", ["queue"]
+)
+
+class Overloaded(Exception):
+    """Work was not admitted; retry after `retry_after` seconds."""
+
+    def __init__(self, queue: str, reason: str, retry_after: float):
+        super().__init__(f"{queue} capacity exceeded ({reason}); retry in {retry_after:.0f}s")
+        self.queue = queue
+        self.reason = reason
+        self.retry_after = retry_after
+
+class _ServiceTime:
+    """Moving average of how long admitted work holds its slot."""
+
+    def __init__(self, initial: float):
+        self.average = initial
+
+    def observe(self, seconds: float):
+        self.average += 0.2 * (seconds - self.average)
+
+    def retry_after(self, ahead: int, concurrency: int) -> float:
+        """Seconds until a request arriving behind `ahead` others would likely start."""
+        return max(1, math.ceil(self.average * (ahead + 1) / max(1, concurrency)))
+
+class AdmissionQueue:
+    """
+    Concurrency limit with a bounded, deadline-limited wait queue for API requests.
+
+    At most `concurrency` requests run at once; up to `max_queue` more wait
+    for at most `queue_timeout` seconds. Anything beyond is rejected at once
+    with an estimate of when capacity frees up, instead of piling up behind
+    blocked LLM calls. Limits apply per API worker process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        initial_estimate: float = 1.0
+    ):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.service_time = _ServiceTime(initial_estimate)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._waiting = 0
+        self._running = 0
+
+    def _reject(self, reason: str):
+        ADMISSION_REJECTIONS.inc(queue=self.name, reason=reason)
+        ahead = max(0, self._running + self._waiting - self.concurrency)
+        raise Overloaded(self.name, reason, self.service_time.retry_after(ahead, self.concurrency))
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot; pair with release().
+
+        Returns:
+            Start time to pass to release()
+
+        Raises:
+            Overloaded: The queue is full or the wait exceeded queue_timeout
+        """
+        if self._running + self._waiting >= self.concurrency + self.max_queue:
+            self._reject("queue_full")
+
+        queued = time.monotonic()
+        self._waiting += 1
+        ADMISSION_QUEUE_DEPTH.inc(queue=self.name)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject("queue_timeout")
+        finally:
+            self._waiting -= 1
+            ADMISSION_QUEUE_DEPTH.dec(queue=self.name)
+
+        started = time.monotonic()
+        ADMISSION_WAIT_SECONDS.observe(started - queued, queue=self.name)
+        self._running += 1
+        ADMISSION_IN_FLIGHT.inc(queue=self.name)
+        return started
+
+    def release(self, started: float):
+        self._running -= 1
+        ADMISSION_IN_FLIGHT.dec(queue=self.name)
+        self.service_time.observe(time.monotonic() - started)
+        self._semaphore.release()
+
+    async def run_in_thread(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run fn in a worker thread under a slot (see acquire).
+
+        The slot is held until the thread finishes, not until the caller
+        stops waiting: a client that disconnects cancels the request, but
+        the thread keeps using its CPU and LLM capacity, so releasing then
+        would admit more work than `concurrency` allows.
+        """
+        started = await self.acquire()
+
+        async def run():
+            try:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            finally:
+                self.release(started)
+
+        return await asyncio.shield(asyncio.create_task(run()))
+
+    def stats(self) -> dict:
+        return {
+            'concurrency': self.concurrency,
+            'in_flight': self._running,
+            'waiting': self._waiting,
+            'max_queue': self.max_queue,
+            'estimated_service_seconds': round(self.service_time.average, 3)
+        }
+
+class BacklogLimit:
+    """
+    Bound on background jobs accepted but not yet finished (thread-safe).
+
+    Jobs are run by a fixed worker pool; this caps the pool's otherwise
+    unbounded backlog so a burst of submissions is refused up front.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int, initial_estimate: float = 60.0):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_pending = self.workers + max_queue
+        self.service_time = _ServiceTime(initial_estimate)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def check(self, count: int = 1):
+        """Raise Overloaded if `count` more jobs would not fit."""
+        with self._lock:
+            self._check(count)
+
+    def _check(self, count: int):
+        if self._pending + count > self.max_pending:
+            ADMISSION_REJECTIONS.inc(queue=self.name, reason="queue_full")
+            raise Overloaded(
+                self.name, "queue_full",
+                self.service_time.retry_after(self._pending - self.workers, self.workers)
+            )
+
+    def acquire(self, count: int = 1):
+        """Reserve room for `count` jobs, all or none; raises Overloaded when full."""
+        with self._lock:
+            self._check(count)
+            self._pending += count
+            self._report()
+
+    def release(self, seconds: Optional[float] = None, count: int = 1):
+        """Jobs finished (or were never started); `seconds` is a finished job's run time."""
+        with self._lock:
+            self._pending -= count
+            self._report()
+            if seconds is not None:
+                self.service_time.observe(seconds)
+
+    def _report(self):
+        ADMISSION_IN_FLIGHT.set(min(self._pending, self.workers), queue=self.name)
+        ADMISSION_QUEUE_DEPTH.set(max(0, self._pending - self.workers), queue=self.name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'estimated_service_seconds': round(self.service_time.average, 3)
+            }
@@ -1,16 +1,28 @@
 """Conversation memory management."""
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 
+# summarize(previous_summary, turns) -> new summary
+Summarizer = Callable[[str, List[Dict]], str]
+
 class ConversationMemory:
     """Manages conversation history for context-aware retrieval."""
     
     def __init__(self, max_history: int = 5):
         self.history: List[Dict] = []
         self.max_history = max_history
+        # Rolling summary of turns that no longer fit, computed once per turn
+        self.summary: str = ""
+        self._unsummarized: List[Dict] = []
+        # Every turn added since the last clear, summarized or not
+        self.turns = 0
+    
+    def __len__(self) -> int:
+        return self.turns
     
     def add_turn(self, query: str, answer: str, intent: str = ""):
         """Add a query-answer pair to history."""
+        self.turns += 1
         self.history.append({
             "query": query,
             "answer": answer,
@@ -18,8 +30,9 @@ class ConversationMemory:
             "timestamp": datetime.now().isoformat()
         })
         
-        # Keep only recent turns
+        # Keep only recent turns; older ones wait to be folded into the summary
         if len(self.history) > self.max_history:
+            self._unsummarized.extend(self.history[:-self.max_history])
             self.history = self.history[-self.max_history:]
     
     def get_context(self, k: int = 3) -> str:
@@ -35,9 +48,70 @@ class ConversationMemory:
         
         return "\n\n".join(context_parts)
     
+    def compressed_history(
+        self,
+        token_budget: int,
+        summarize: Optional[Summarizer] = None,
+        count_tokens: Optional[Callable[[str], int]] = None
+    ) -> List[Dict]:
+        """
+        History that fits within token_budget.
+        
+        The most recent turns are kept verbatim. Older turns are folded into
+        a rolling summary exactly once (the summary is cached on this
+        object), so repeated queries don't re-summarize. Without a
+        summarizer, turns that don't fit are dropped; a summary that is
+        itself over budget is cut to fit.
+        
+        Returns:
+            [{"summary": str}] (if any) followed by verbatim turns
+        """
+        count = count_tokens or (lambda text: len(text) // 4)
+        
+        budget = token_budget - count(self.summary)
+        kept: List[Dict] = []
+        for turn in reversed(self.history):
+            cost = count(turn["query"]) + count(turn["answer"])
+            if cost > budget:
+                break
+            kept.insert(0, turn)
+            budget -= cost
+        
+        overflow = self._unsummarized + self.history[:len(self.history) - len(kept)]
+        if overflow:
+            if summarize is not None:
+                self.summary = summarize(self.summary, overflow)
+            self._unsummarized = []
+            self.summary = self._clip(self.summary, token_budget, count)
+            # The new summary may be longer than the old one; turns that no
+            # longer fit are folded into it on the next call
+            budget = token_budget - count(self.summary)
+            while kept and sum(count(t["query"]) + count(t["answer"]) for t in kept) > budget:
+                self._unsummarized.append(kept.pop(0))
+            self.history = kept
+        
+        result = [{"summary": self.summary}] if self.summary else []
+        return result + [{"query": t["query"], "answer": t["answer"]} for t in kept]
+    
+    @staticmethod
+    def _clip(text: str, token_budget: int, count: Callable[[str], int]) -> str:
+        """Cut text down until it fits within token_budget."""
+        while text and count(text) > token_budget:
+            cost = count(text)
+            text = text[:min(len(text) - 1, len(text) * max(0, token_budget) // cost)].rstrip()
+        return text
+    
+    def size_bytes(self) -> int:
+        """Approximate memory held by this conversation's text."""
+        turns = self.history + self._unsummarized
+        return len(self.summary) + sum(len(t["query"]) + len(t["answer"]) + 64 for t in turns)
+    
     def clear(self):
         """Clear conversation history."""
         self.history = []
+        self.summary = ""
+        self._unsummarized = []
+        self.turns = 0
     
     def get_history(self) -> List[Dict]:
         """Get full conversation history."""
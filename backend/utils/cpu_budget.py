@@ -0,0 +1,226 @@
+"""CPU budget: thread counts per engine, with cores reserved for query serving."""
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+from backend.utils.metrics import registry
+
+CPU_ENGINE_THREADS = registry.gauge(
+    "videorag_cpu_engine_threads", "Threads the CPU budget gives one call of each engine", ["engine"]
+)
+CPU_ENGINE_ACTIVE = registry.gauge(
+    "videorag_cpu_engine_active", "Calls currently running in each engine", ["engine"]
+)
+CPU_ENGINE_BUSY_SECONDS = registry.counter(
+    "videorag_cpu_engine_busy_seconds_total",
+    "Wall time spent inside each engine, summed over concurrent calls",
+    ["engine"]
+)
+
+# Core pool each engine draws from
+ENGINE_POOLS = {
+    'whisper': 'ingest',
+    'embed_index': 'ingest',
+    'embed_query': 'query',
+    'faiss': 'query'
+}
+
+def available_cores() -> int:
+    """CPUs this process may use: its affinity mask, capped by a cgroup v2 quota."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota != "max":
+            cores = min(cores, max(1, math.floor(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cores)
+
+@dataclass(frozen=True)
+class CPUBudget:
+    """
+    How this process's cores are split between query serving and ingestion.
+
+    Query cores run query embedding and FAISS search; the rest run Whisper,
+    divided evenly between concurrent ingestion jobs, and index embedding
+    when it runs in worker processes. By default index embedding runs
+    in-process, where PyTorch's per-process thread pool puts it on the
+    query threads; embedding workers keep it off the query cores at the
+    cost of one more model copy each. Each engine gets a fixed
+    thread count instead of its library default of one thread per core,
+    so concurrent engines no longer oversubscribe the machine. A one-core
+    host reserves nothing for queries.
+    """
+    total_cores: int
+    query_cores: int
+    ingest_cores: int
+    ingest_workers: int  # Concurrent ingestion jobs
+    whisper_threads: int  # Per transcription
+    embed_workers: int  # Index embedding processes; 0 = in-process
+    embed_threads: int  # Per embedding worker process, or in-process threads
+    query_threads: int  # PyTorch / ONNX intra-op threads in this process
+    faiss_threads: int  # OpenMP threads per search
+
+    @classmethod
+    def plan(
+        cls,
+        total_cores: int = 0,
+        query_cores: int = 0,
+        ingest_workers: int = 2,
+        embed_workers: int = 0,
+        query_concurrency: int = 8,
+        whisper_threads: Optional[int] = None,
+        query_threads: int = 0
+    ) -> "CPUBudget":
+        """
+        Args:
+            total_cores: Cores to budget; 0 = available_cores()
+            query_cores: Reserved for queries; 0 = a quarter of the cores
+            embed_workers: Index embedding processes, capped at the ingest
+                cores; 0 = embed in-process
+            query_concurrency: Queries admitted at once (FAISS threads are split between them)
+            whisper_threads: Explicit Whisper threads (-1 = all cores); None = budgeted
+            query_threads: Explicit embedding threads; 0 = budgeted
+        """
+        total = total_cores or available_cores()
+        # At least one core is left for ingestion
+        query = min(query_cores or max(1, total // 4), total - 1)
+        ingest = total - query
+        workers = max(1, min(ingest_workers, ingest))
+        if whisper_threads is None or whisper_threads == 0:
+            whisper_threads = max(1, ingest // workers)
+        elif whisper_threads < 0:
+            whisper_threads = total
+        embed_workers = min(embed_workers, ingest) if embed_workers > 0 else 0
+        query_threads = query_threads or max(1, query)
+        return cls(
+            total_cores=total,
+            query_cores=query,
+            ingest_cores=ingest,
+            ingest_workers=workers,
+            whisper_threads=whisper_threads,
+            embed_workers=embed_workers,
+            embed_threads=max(1, ingest // embed_workers) if embed_workers else query_threads,
+            query_threads=query_threads,
+            faiss_threads=max(1, query // max(1, query_concurrency))
+        )
+
+    def engine_threads(self) -> Dict[str, int]:
+        """Threads one call of each engine uses."""
+        return {
+            'whisper': self.whisper_threads,
+            'embed_index': max(1, self.embed_workers) * self.embed_threads,
+            'embed_query': self.query_threads,
+            'faiss': self.faiss_threads
+        }
+
+    def apply(self):
+        """
+        Set the process-wide thread pools (FAISS OpenMP, PyTorch).
+
+        Call before the embedding model is loaded: PyTorch not yet imported
+        picks its thread count up from OMP_NUM_THREADS / MKL_NUM_THREADS,
+        which are only set here when the environment leaves them unset.
+        """
+        try:
+            import faiss
+            faiss.omp_set_num_threads(self.faiss_threads)
+        except ImportError:
+            pass
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(self.query_threads)
+        else:
+            os.environ.setdefault("OMP_NUM_THREADS", str(self.query_threads))
+            os.environ.setdefault("MKL_NUM_THREADS", str(self.query_threads))
+        for engine, threads in self.engine_threads().items():
+            CPU_ENGINE_THREADS.set(threads, engine=engine)
+
+class EngineMeter:
+    """
+    Time spent in each engine, for utilization against the CPU budget.
+
+    The engines run in native threads that cannot be attributed CPU time
+    individually, so an engine's core-seconds are its busy wall time times
+    the threads each call was given; process CPU time is reported alongside
+    as the measured total.
+    """
+
+    def __init__(self):
+        self._started = time.monotonic()
+        self._cpu_started = self._process_cpu()
+        self._engines: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _process_cpu() -> float:
+        times = os.times()
+        return times.user + times.system
+
+    @contextmanager
+    def track(self, engine: str):
+        """Count the block as busy time of `engine`."""
+        CPU_ENGINE_ACTIVE.inc(engine=engine)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            CPU_ENGINE_ACTIVE.dec(engine=engine)
+            CPU_ENGINE_BUSY_SECONDS.inc(seconds, engine=engine)
+            with self._lock:
+                stats = self._engines.setdefault(engine, {'calls': 0, 'busy_seconds': 0.0})
+                stats['calls'] += 1
+                stats['busy_seconds'] += seconds
+
+    def report(self, budget: Optional[CPUBudget] = None) -> dict:
+        """
+        Per-engine busy time and, given a budget, utilization of the engine's
+        core pool (core-seconds held / pool cores x elapsed seconds).
+        """
+        elapsed = max(1e-9, time.monotonic() - self._started)
+        cpu_seconds = self._process_cpu() - self._cpu_started
+        threads = budget.engine_threads() if budget else {}
+        with self._lock:
+            engines = {engine: dict(stats) for engine, stats in self._engines.items()}
+
+        report = {}
+        for engine in {**ENGINE_POOLS, **engines}:
+            stats = engines.get(engine, {'calls': 0, 'busy_seconds': 0.0})
+            entry = {'calls': int(stats['calls']), 'busy_seconds': round(stats['busy_seconds'], 3)}
+            if budget and engine in threads:
+                pool = ENGINE_POOLS.get(engine, 'ingest')
+                if engine == 'embed_index' and not budget.embed_workers:
+                    # In-process index embedding runs on the query threads
+                    pool = 'query'
+                # With one core nothing is reserved; queries share it
+                pool_cores = (budget.query_cores if pool == 'query' else budget.ingest_cores) or budget.total_cores
+                core_seconds = stats['busy_seconds'] * threads[engine]
+                entry.update(
+                    pool=pool,
+                    threads=threads[engine],
+                    core_seconds=round(core_seconds, 3),
+                    utilization=round(core_seconds / (pool_cores * elapsed), 4)
+                )
+            report[engine] = entry
+
+        total_cores = budget.total_cores if budget else available_cores()
+        return {
+            'budget': asdict(budget) if budget else None,
+            'engines': report,
+            'process': {
+                'elapsed_seconds': round(elapsed, 3),
+                'cpu_seconds': round(cpu_seconds, 3),
+                'utilization': round(cpu_seconds / (total_cores * elapsed), 4)
+            }
+        }
+
+# Process-wide meter used by the service and vector store
+cpu_meter = EngineMeter()
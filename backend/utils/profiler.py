@@ -0,0 +1,235 @@
+"""Opt-in sampling profiler writing collapsed-stack (flamegraph) artifacts."""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from backend.utils.metrics import registry
+
+PROFILES_CAPTURED = registry.counter(
+    "videorag_profiles_captured_total", "Sampling profiles written, by kind", ["kind"]
+)
+PROFILE_SAMPLES = registry.counter(
+    "videorag_profile_samples_total", "Stack samples taken by the sampling profiler"
+)
+
+COLLAPSED_SUFFIX = ".collapsed"
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+# Set per request by the API middleware; service entry points consult it
+_requested: ContextVar[bool] = ContextVar("videorag_profile_requested", default=False)
+
+class ProfileSession:
+    """Stack counts gathered for one job or request on one thread."""
+
+    def __init__(self, kind: str, target: str, thread_id: int):
+        self.kind = kind
+        self.target = target
+        self.thread_id = thread_id
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        self.stacks: StackCounter = StackCounter()
+        self.samples = 0
+
+    @property
+    def name(self) -> str:
+        stamp = self.started_at.strftime("%Y%m%d-%H%M%S-%f")
+        return f"{self.kind}-{_UNSAFE.sub('_', self.target)[:64]}-{stamp}-{os.getpid()}"
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of registered threads with sys._current_frames().
+
+    Only threads inside a session() are sampled, and the sampler thread
+    sleeps while no session is active, so leaving profiling enabled costs
+    nothing until a job or request opts in. Each session is written as a
+    collapsed-stack file (flamegraph.pl / speedscope input) plus a JSON
+    sidecar describing it.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.interval = 0.01
+        self.request_rate = 0.0
+        self.job_rate = 0.0
+        self.output_dir: Optional[Path] = None
+        self.max_files = 200
+        self._sessions: Dict[int, List[ProfileSession]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._frame_names: Dict[object, str] = {}
+
+    def configure(
+        self,
+        enabled: bool = False,
+        interval: float = 0.01,
+        output_dir: Optional[Path] = None,
+        request_rate: float = 0.0,
+        job_rate: float = 0.0,
+        max_files: int = 200
+    ):
+        """
+        Args:
+            interval: Seconds between samples (0.01 = 100 Hz)
+            request_rate: Fraction of API requests profiled without asking
+            job_rate: Fraction of ingestion jobs profiled without asking
+            max_files: Oldest profiles beyond this many are deleted
+        """
+        self.enabled = enabled and output_dir is not None
+        self.interval = max(interval, 0.001)
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.request_rate = request_rate
+        self.job_rate = job_rate
+        self.max_files = max_files
+
+    def selected(self, forced: bool, rate: float) -> bool:
+        """Profile if asked to, or for a random fraction `rate` of candidates."""
+        return self.enabled and (forced or (rate > 0 and random.random() < rate))
+
+    def mark_request(self, forced: bool = False):
+        """
+        Decide whether the current request is profiled (header or sampling).
+
+        Returns:
+            Token for reset_request()
+        """
+        return _requested.set(self.selected(forced, self.request_rate))
+
+    def reset_request(self, token):
+        _requested.reset(token)
+
+    def requested(self) -> bool:
+        """Whether the current request was selected for profiling."""
+        return _requested.get()
+
+    @contextmanager
+    def session(self, kind: str, target: str, enabled: bool = True):
+        """
+        Profile the calling thread for the duration of a block.
+
+        Yields:
+            The ProfileSession, or None when profiling is off
+        """
+        if not (self.enabled and enabled):
+            yield None
+            return
+
+        session = ProfileSession(kind, target, threading.get_ident())
+        with self._lock:
+            self._sessions.setdefault(session.thread_id, []).append(session)
+            self._ensure_sampler()
+        self._wake.set()
+        try:
+            yield session
+        finally:
+            with self._lock:
+                sessions = self._sessions.get(session.thread_id, [])
+                sessions.remove(session)
+                if not sessions:
+                    self._sessions.pop(session.thread_id, None)
+            try:
+                self._write(session, time.perf_counter() - session.started)
+            except OSError:
+                pass  # Never fail a job over its diagnostics
+
+    def _ensure_sampler(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                targets = {tid: list(sessions) for tid, sessions in self._sessions.items()}
+                if not targets:
+                    self._wake.clear()
+            if not targets:
+                self._wake.wait()
+                continue
+
+            frames = sys._current_frames()
+            for thread_id, sessions in targets.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = self._collapse(frame)
+                for session in sessions:
+                    session.stacks[stack] += 1
+                    session.samples += 1
+                PROFILE_SAMPLES.inc()
+            del frames
+            time.sleep(self.interval)
+
+    def _collapse(self, frame) -> str:
+        """Root-to-leaf 'func (file:line);...' for one thread's current stack."""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            name = self._frame_names.get(code)
+            if name is None:
+                name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                name = self._frame_names[code] = name.replace(";", ":")
+            names.append(name)
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _write(self, session: ProfileSession, duration: float):
+        if not session.samples or self.output_dir is None:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = session.name
+        lines = [f"{stack} {count}\n" for stack, count in session.stacks.most_common()]
+        (self.output_dir / f"{name}{COLLAPSED_SUFFIX}").write_text("".join(lines))
+        (self.output_dir / f"{name}.json").write_text(json.dumps({
+            'name': name,
+            'kind': session.kind,
+            'target': session.target,
+            'started_at': session.started_at.isoformat(),
+            'duration_seconds': round(duration, 3),
+            'samples': session.samples,
+            'interval_ms': self.interval * 1000,
+            'pid': os.getpid()
+        }))
+        PROFILES_CAPTURED.inc(kind=session.kind)
+        self._prune()
+
+    def _prune(self):
+        sidecars = sorted(self.output_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for sidecar in sidecars[:max(0, len(sidecars) - self.max_files)]:
+            sidecar.with_suffix(COLLAPSED_SUFFIX).unlink(missing_ok=True)
+            sidecar.unlink(missing_ok=True)
+
+    def list_profiles(self, kind: Optional[str] = None, limit: int = 100) -> List[dict]:
+        """Captured profiles, newest first."""
+        if self.output_dir is None or not self.output_dir.exists():
+            return []
+        profiles = []
+        for sidecar in self.output_dir.glob("*.json"):
+            try:
+                info = json.loads(sidecar.read_text())
+            except (OSError, ValueError):
+                continue
+            if kind and info.get('kind') != kind:
+                continue
+            profiles.append(info)
+        profiles.sort(key=lambda info: info.get('started_at', ''), reverse=True)
+        return profiles[:limit]
+
+    def profile_path(self, name: str) -> Optional[Path]:
+        """Collapsed-stack file for a listed profile name, if it exists."""
+        if self.output_dir is None or _UNSAFE.search(name):
+            return None
+        path = self.output_dir / f"{name}{COLLAPSED_SUFFIX}"
+        return path if path.exists() else None
+
+# Process-wide profiler
+profiler = SamplingProfiler()
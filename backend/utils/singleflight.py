@@ -0,0 +1,66 @@
+"""Coalesce concurrent identical calls into one execution."""
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from backend.utils.metrics import registry
+
+SINGLE_FLIGHT_CALLS = registry.counter(
+    "videorag_single_flight_calls_total",
+    "Calls that executed (leader) or reused an in-flight call's result (follower)",
+    ["kind", "role"]
+)
+
+T = TypeVar("T")
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Per-key deduplication of concurrent calls within one process.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait and receive the same result (or exception). Nothing is cached:
+    once the call finishes, the next caller runs it again.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Returns:
+            (result, shared): shared is True if another caller's execution
+            produced the result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        SINGLE_FLIGHT_CALLS.inc(kind=self.kind, role="leader" if leader else "follower")
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
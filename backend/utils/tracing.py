@@ -0,0 +1,249 @@
+"""Per-request tracing with a rotating slow-query log."""
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from backend.utils.metrics import registry
+
+SLOW_TRACES = registry.counter(
+    "videorag_slow_traces_total", "Traces over the slow threshold written to the slow log", ["name"]
+)
+
+@dataclass
+class Span:
+    """One timed operation within a trace."""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float  # perf_counter
+    duration: Optional[float] = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+class _NoopSpan:
+    """Returned outside a trace so instrumented code needn't check."""
+
+    def set(self, **attributes):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class Trace:
+    """
+    Spans recorded for one request.
+
+    Spans may be added from worker threads that inherited the context
+    (e.g. LangGraph nodes), so appends are locked.
+    """
+
+    def __init__(self, name: str, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = datetime.now().isoformat()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    def to_dict(self) -> dict:
+        """Spans as offsets from the trace start, in milliseconds."""
+        with self._lock:
+            spans = list(self.spans)
+        origin = spans[0].start
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'started_at': self.started_at,
+            'duration_ms': round((spans[0].duration or 0.0) * 1000, 3),
+            'attributes': spans[0].attributes,
+            'error': spans[0].error,
+            'spans': [
+                {
+                    'name': s.name,
+                    'span_id': s.span_id,
+                    'parent_id': s.parent_id,
+                    'start_ms': round((s.start - origin) * 1000, 3),
+                    'duration_ms': round(s.duration * 1000, 3) if s.duration is not None else None,
+                    'attributes': s.attributes,
+                    'error': s.error
+                }
+                for s in spans[1:]
+            ]
+        }
+
+# (trace, current span) for the running request
+_current: ContextVar[Optional[Tuple[Trace, Span]]] = ContextVar("videorag_trace", default=None)
+
+class SlowTraceLog:
+    """
+    Append-only JSONL file of slow traces, rotated by size.
+
+    {path}, {path}.1 ... {path}.{backups}; safe for threads of one process,
+    and lines stay whole across processes because each is one append write.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 10 * 1024 * 1024, backups: int = 3):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def write(self, record: dict):
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if self.max_bytes and size + len(line) > self.max_bytes:
+                self._rotate()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def _rotate(self):
+        for i in range(self.backups, 0, -1):
+            source = self.path if i == 1 else Path(f"{self.path}.{i - 1}")
+            if source.exists():
+                os.replace(source, f"{self.path}.{i}")
+        if not self.backups:
+            self.path.unlink(missing_ok=True)
+
+    def recent(self, limit: int = 20) -> List[dict]:
+        """Most recent traces first, reading older files only as needed."""
+        records: List[dict] = []
+        paths = [self.path] + [Path(f"{self.path}.{i}") for i in range(1, self.backups + 1)]
+        for path in paths:
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except FileNotFoundError:
+                continue
+            for line in reversed(lines):
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # Partially written line
+                if len(records) >= limit:
+                    return records
+        return records
+
+class Tracer:
+    """Starts traces and spans; traces slower than the threshold go to the slow log."""
+
+    def __init__(self):
+        self.enabled = True
+        self.slow_threshold = 2.0
+        self.slow_log: Optional[SlowTraceLog] = None
+
+    def configure(
+        self,
+        enabled: bool = True,
+        slow_threshold: float = 2.0,
+        log_path: Optional[Path] = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3
+    ):
+        """
+        Args:
+            slow_threshold: Seconds; traces at or above it are logged
+            log_path: Slow-query JSONL file; None keeps no log
+        """
+        self.enabled = enabled
+        self.slow_threshold = slow_threshold
+        self.slow_log = SlowTraceLog(log_path, max_bytes, backups) if log_path else None
+
+    @contextmanager
+    def trace(self, name: str, trace_id: Optional[str] = None, **attributes):
+        """
+        Trace a request. Nested calls join the active trace as a span.
+
+        Yields:
+            The Trace (trace_id is available immediately)
+        """
+        active = _current.get()
+        if active is not None:
+            with self.span(name, **attributes):
+                yield active[0]
+            return
+
+        trace = Trace(name, trace_id)
+        root = Span(name, uuid.uuid4().hex[:8], None, time.perf_counter(), attributes=dict(attributes))
+        trace.add(root)
+        if not self.enabled:
+            yield trace
+            return
+
+        token = _current.set((trace, root))
+        try:
+            yield trace
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            root.duration = time.perf_counter() - root.start
+            _current.reset(token)
+            self._finish(trace)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a block as a child of the current span; no-op outside a trace."""
+        active = _current.get()
+        if active is None:
+            yield NOOP_SPAN
+            return
+        trace, parent = active
+        span = Span(name, uuid.uuid4().hex[:8], parent.span_id, time.perf_counter(), attributes=dict(attributes))
+        trace.add(span)
+        token = _current.set((trace, span))
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            _current.reset(token)
+
+    def annotate(self, **attributes):
+        """Add attributes to the current span (no-op outside a trace)."""
+        active = _current.get()
+        if active is not None:
+            active[1].set(**attributes)
+
+    def current_trace_id(self) -> Optional[str]:
+        active = _current.get()
+        return active[0].trace_id if active else None
+
+    def recent_slow(self, limit: int = 20) -> List[dict]:
+        return self.slow_log.recent(limit) if self.slow_log else []
+
+    def _finish(self, trace: Trace):
+        if self.slow_log is None or trace.root.duration < self.slow_threshold:
+            return
+        SLOW_TRACES.inc(name=trace.name)
+        try:
+            self.slow_log.write(trace.to_dict())
+        except OSError:
+            pass  # Never fail a request over its diagnostics
+
+# Process-wide tracer
+tracer = Tracer()
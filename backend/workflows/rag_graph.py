@@ -1,15 +1,42 @@
 """LangGraph workflow for RAG."""
+from typing import Callable, Optional
 from langgraph.graph import StateGraph, END
 from backend.models.rag_state import RAGState
 from backend.agents import QueryAnalyzer, RetrievalAgent, AnswerGenerator, ValidatorAgent
+from backend.core import LLMAdapter
+from backend.utils.metrics import registry
+from backend.utils.tracing import tracer
+
+NODE_SECONDS = registry.histogram(
+    "videorag_graph_node_seconds", "LangGraph node execution time", ["node"]
+)
+NODE_ERRORS = registry.counter(
+    "videorag_graph_node_errors_total", "LangGraph node failures", ["node"]
+)
+
+def _instrument(name: str, node: Callable[[RAGState], RAGState]) -> Callable[[RAGState], RAGState]:
+    """Wrap a node function with timing, tracing and error metrics."""
+    def wrapper(state: RAGState) -> RAGState:
+        with tracer.span(f"graph.{name}"), NODE_SECONDS.time(node=name):
+            try:
+                return node(state)
+            except Exception:
+                NODE_ERRORS.inc(node=name)
+                raise
+    return wrapper
 
 class RAGGraph:
     """LangGraph workflow for RAG pipeline."""
     
-    def __init__(self):
+    def __init__(self, llm: Optional[LLMAdapter] = None):
+        """
+        Args:
+            llm: Adapter for answer generation; share the pipeline's so both
+                engines continue the same per-conversation LLM context
+        """
         self.query_analyzer = QueryAnalyzer()
         self.retrieval_agent = RetrievalAgent()
-        self.answer_generator = AnswerGenerator()
+        self.answer_generator = AnswerGenerator(llm)
         self.validator_agent = ValidatorAgent()
         self.graph = self._build_graph()
     
@@ -18,10 +45,10 @@ class RAGGraph:
         workflow = StateGraph(RAGState)
         
         # Add nodes
-        workflow.add_node("analyze_query", self.query_analyzer.analyze)
-        workflow.add_node("retrieve", self.retrieval_agent.retrieve)
-        workflow.add_node("generate_answer", self.answer_generator.generate)
-        workflow.add_node("validate", self.validator_agent.validate)
+        workflow.add_node("analyze_query", _instrument("analyze_query", self.query_analyzer.analyze))
+        workflow.add_node("retrieve", _instrument("retrieve", self.retrieval_agent.retrieve))
+        workflow.add_node("generate_answer", _instrument("generate_answer", self.answer_generator.generate))
+        workflow.add_node("validate", _instrument("validate", self.validator_agent.validate))
         
         # Add edges
         workflow.set_entry_point("analyze_query")
@@ -32,7 +59,16 @@ class RAGGraph:
         
         return workflow.compile()
     
-    def query(self, video_id: str, question: str, conversation_history: list = None) -> dict:
+    def query(
+        self,
+        video_id: str,
+        question: str,
+        conversation_history: list = None,
+        session_id: str = None,
+        turn: int = 0,
+        start_time: float = None,
+        end_time: float = None
+    ) -> dict:
         """Execute RAG workflow."""
         initial_state: RAGState = {
             "query": question,
@@ -42,6 +78,10 @@ class RAGGraph:
             "final_answer": "",
             "sources": [],
             "conversation_history": conversation_history or [],
+            "session_id": session_id,
+            "turn": turn,
+            "start_time": start_time,
+            "end_time": end_time,
             "confidence": 0.0,
             "retry_count": 0
         }
@@ -0,0 +1 @@
+"""Offline benchmarks for Video RAG components."""
@@ -0,0 +1,96 @@
+"""
+Download-stage audio format cost: CPU seconds and disk bytes per hour.
+
+Starting from an audio file as yt-dlp downloads it (e.g. .webm/opus or
+.m4a), prepares it the way each AUDIO_FORMAT does and then decodes it
+the way Whisper does (16 kHz mono float32), and reports the transcode
+CPU, decode CPU and file size normalised to one hour of audio.
+
+Usage:
+    python -m benchmarks.audio_format_bench --audio downloaded.webm
+"""
+import argparse
+import json
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from faster_whisper import decode_audio
+
+# ffmpeg arguments matching what the downloader's postprocessing runs
+FORMATS = {
+    "original": None,
+    "pcm16k": (".wav", ["-ar", "16000", "-ac", "1"]),
+    "mp3": (".mp3", ["-b:a", "192k"]),
+}
+
+def find_ffmpeg() -> str:
+    bundled = Path(__file__).parent.parent / "bin" / "ffmpeg"
+    return str(bundled) if bundled.exists() else "ffmpeg"
+
+def children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def prepare(source: Path, target_dir: Path, name: str, ffmpeg: str) -> tuple:
+    """Produce the cached file for a format; return (path, transcode CPU seconds)."""
+    spec = FORMATS[name]
+    if spec is None:
+        target = target_dir / f"original{source.suffix}"
+        shutil.copyfile(source, target)
+        return target, 0.0
+    suffix, args = spec
+    target = target_dir / f"{name}{suffix}"
+    before = children_cpu()
+    subprocess.run(
+        [ffmpeg, "-nostdin", "-loglevel", "error", "-y", "-i", str(source), "-vn", *args, str(target)],
+        check=True
+    )
+    return target, children_cpu() - before
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio format CPU/disk benchmark")
+    parser.add_argument("--audio", type=Path, required=True, help="Audio as downloaded (bestaudio)")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--output", type=Path, default=Path("audio_format_results.json"))
+    args = parser.parse_args()
+
+    ffmpeg = find_ffmpeg()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.formats.split(","):
+            path, transcode_cpu = prepare(args.audio, Path(tmp), name, ffmpeg)
+
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            samples = decode_audio(str(path), sampling_rate=16000)
+            decode_cpu = time.process_time() - cpu_start
+            decode_wall = time.perf_counter() - wall_start
+
+            hours = len(samples) / 16000 / 3600
+            size = path.stat().st_size
+            results[name] = {
+                "audio_hours": hours,
+                "bytes": size,
+                "bytes_per_hour": size / hours,
+                "transcode_cpu_per_hour": transcode_cpu / hours,
+                "decode_cpu_per_hour": decode_cpu / hours,
+                "decode_wall_per_hour": decode_wall / hours,
+                "total_cpu_per_hour": (transcode_cpu + decode_cpu) / hours
+            }
+            r = results[name]
+            print(f"{name:<9} {r['bytes_per_hour'] / 1e6:8.1f} MB/h  transcode={r['transcode_cpu_per_hour']:6.1f} "
+                  f"cpu-s/h  decode={r['decode_cpu_per_hour']:6.1f} cpu-s/h  total={r['total_cpu_per_hour']:6.1f} cpu-s/h")
+
+    if "mp3" in results:
+        baseline = results["mp3"]
+        for name, r in results.items():
+            r["cpu_saved_per_hour_vs_mp3"] = baseline["total_cpu_per_hour"] - r["total_cpu_per_hour"]
+            r["bytes_saved_per_hour_vs_mp3"] = baseline["bytes_per_hour"] - r["bytes_per_hour"]
+
+    args.output.write_text(json.dumps({"source": str(args.audio), "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+Exits with status 1 when any benchmark's p50/p95 latency grew, or its
+throughput dropped, by more than the threshold fraction. Works for both
+component benchmark and load test results (where the absolute error
+rate increase is also checked).
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+LATENCY_KEYS = ("p50_ms", "p95_ms")
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> List[Dict]:
+    """Return one row per shared benchmark with relative changes and verdict."""
+    rows = []
+    for name, base in baseline["results"].items():
+        cand = candidate["results"].get(name)
+        if cand is None:
+            continue
+        changes = {}
+        regressed = False
+        for key in LATENCY_KEYS:
+            if base.get(key, 0) > 0 and key in cand:
+                changes[key] = (cand[key] - base[key]) / base[key]
+                regressed |= changes[key] > threshold
+        if base.get("error_rate") is not None and "error_rate" in cand:
+            changes["error_rate"] = cand["error_rate"] - base["error_rate"]
+            regressed |= changes["error_rate"] > threshold
+        if base["throughput"] > 0:
+            changes["throughput"] = (cand["throughput"] - base["throughput"]) / base["throughput"]
+            regressed |= changes["throughput"] < -threshold
+        rows.append({"name": name, "changes": changes, "regressed": regressed})
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag regressions between two benchmark runs")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    if baseline["meta"].get("params") != candidate["meta"].get("params"):
+        print("warning: runs used different parameters; comparison may be misleading")
+
+    rows = compare(baseline, candidate, args.threshold)
+    for row in rows:
+        changes = "  ".join(f"{key}={value:+.1%}" for key, value in row["changes"].items())
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(f"{row['name']:<28} {changes}  [{flag}]")
+
+    sys.exit(1 if any(row["regressed"] for row in rows) else 0)
+
+if __name__ == "__main__":
+    main()
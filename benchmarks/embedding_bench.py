@@ -0,0 +1,100 @@
+"""
+Embedding backend throughput, latency and agreement.
+
+Embeds synthetic transcript chunks with each EMBEDDING_BACKEND and
+reports batch throughput, single-query latency and cosine agreement with
+the PyTorch sentence-transformers vectors, plus how often each backend
+returns the same top-k chunks for the same questions.
+
+Usage:
+    python -m benchmarks.embedding_bench --texts 2000 --threads 4
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+import numpy as np
+from backend.config import config
+from backend.core.embeddings import create_embedding_backend
+from benchmarks.fakes import synthetic_questions, synthetic_transcript
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-queries @ corpus.T, axis=1)[:, :k]
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend benchmark")
+    parser.add_argument("--model", default=config.EMBEDDING_MODEL)
+    parser.add_argument("--backends", default="sentence-transformers,onnx,onnx-int8")
+    parser.add_argument("--texts", type=int, default=2000, help="Synthetic chunk texts to embed")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime threads (0 = default)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("embedding_results.json"))
+    args = parser.parse_args()
+
+    # ~4 segments per chunk, roughly the default CHUNK_SIZE
+    segments = synthetic_transcript(args.texts * 4, seed=args.seed)
+    texts = [" ".join(s.text for s in segments[i:i + 4]) for i in range(0, len(segments), 4)]
+    questions = synthetic_questions(args.queries, seed=args.seed + 1)
+
+    results, vectors = {}, {}
+    for name in args.backends.split(","):
+        backend = create_embedding_backend(
+            name, args.model, threads=args.threads, cache_dir=config.DATA_DIR / "models"
+        )
+        backend.encode(texts[:32])  # Warm up
+
+        start = time.perf_counter()
+        corpus = normalize(backend.encode(texts, batch_size=32))
+        batch_seconds = time.perf_counter() - start
+
+        latencies = []
+        query_vectors = []
+        for question in questions:
+            start = time.perf_counter()
+            query_vectors.append(backend.encode([question])[0])
+            latencies.append(time.perf_counter() - start)
+
+        vectors[name] = (corpus, normalize(np.array(query_vectors)))
+        results[name] = {
+            "dimension": backend.dimension,
+            "texts_per_second": len(texts) / batch_seconds,
+            "query_p50_ms": float(np.percentile(latencies, 50) * 1000),
+            "query_p95_ms": float(np.percentile(latencies, 95) * 1000)
+        }
+
+    reference = "sentence-transformers"
+    if reference in vectors:
+        ref_corpus, ref_queries = vectors[reference]
+        ref_top = top_k(ref_corpus, ref_queries, args.top_k)
+        for name, (corpus, queries) in vectors.items():
+            if corpus.shape != ref_corpus.shape:
+                continue  # Different vector space (e.g. hashing)
+            cosine = np.sum(corpus * ref_corpus, axis=1)
+            overlap = [
+                len(set(a) & set(b)) / args.top_k
+                for a, b in zip(top_k(corpus, queries, args.top_k), ref_top)
+            ]
+            results[name].update({
+                "cosine_mean": float(cosine.mean()),
+                "cosine_min": float(cosine.min()),
+                "top_k_overlap": float(np.mean(overlap))
+            })
+
+    for name, r in results.items():
+        line = (f"{name:<22} {r['texts_per_second']:9.1f} texts/s  "
+                f"query p50={r['query_p50_ms']:7.2f}ms p95={r['query_p95_ms']:7.2f}ms")
+        if "cosine_mean" in r:
+            line += f"  cosine mean={r['cosine_mean']:.4f} min={r['cosine_min']:.4f}  top-{args.top_k}={r['top_k_overlap']:.3f}"
+        print(line)
+
+    args.output.write_text(json.dumps({"model": args.model, "texts": len(texts), "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Local fake LLM server with fault injection.
+
+Speaks enough of the Ollama (/api/generate) and Groq/OpenAI
+(/openai/v1/chat/completions) HTTP APIs for the real adapters to talk to
+it, and injects configurable latency, slow tails, stalls and error
+responses (e.g. 429 with Retry-After).
+
+It also models a local model server: a cold-load penalty once the model
+has been idle past its keep_alive, prompt processing time for the part
+of the prompt that doesn't share a prefix with the previous request
+(or continued context), and NDJSON streaming so time-to-first-token can
+be measured.
+
+Usage:
+    python -m benchmarks.fake_llm_server --port 11500 --latency 0.2 --error-rate 0.1 --error-status 429
+    OLLAMA_BASE_URL=http://127.0.0.1:11500 LLM_PROVIDER=ollama uvicorn backend.api:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+@dataclass
+class FaultProfile:
+    """Latency and failure behaviour of the fake server."""
+    latency: float = 0.1          # Base seconds before the first token
+    tail_rate: float = 0.0        # Fraction of requests that are slow
+    tail_latency: float = 2.0     # Extra seconds for slow requests
+    stall_rate: float = 0.0       # Fraction of requests that hang
+    stall_seconds: float = 120.0
+    error_rate: float = 0.0       # Fraction answered with error_status
+    error_status: int = 429
+    retry_after: float = 1.0
+    tokens_per_second: float = 0.0
+    answer_tokens: int = 32
+    cold_load: float = 0.0        # Seconds to load an evicted model
+    default_keep_alive: float = 300.0
+    prompt_eval_rate: float = 0.0  # Prompt tokens/s for uncached prefix; 0 = instant
+
+def parse_keep_alive(value, default: float) -> float:
+    """Ollama keep_alive ("30m", "10s", 300, -1) to seconds; inf = forever."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        units = {"s": 1, "m": 60, "h": 3600}
+        text = str(value).strip()
+        seconds = float(text[:-1]) * units[text[-1]] if text[-1] in units else float(text)
+    return float("inf") if seconds < 0 else seconds
+
+class ModelState:
+    """Residency and prompt prefix cache of the simulated model server."""
+
+    def __init__(self):
+        self.loaded_until = 0.0
+        self.last_text = ""
+        self.lock = threading.Lock()
+
+    def admit(self, profile: FaultProfile, keep_alive, text: str, continued: bool) -> tuple:
+        """Return (load_seconds, prompt_eval_seconds) and update state."""
+        with self.lock:
+            now = time.monotonic()
+            load = profile.cold_load if now >= self.loaded_until else 0.0
+            if load:
+                self.last_text = ""  # Evicted model lost its KV cache
+            cached = 0
+            if not continued:
+                # With continued context only the new turn is evaluated
+                limit = min(len(text), len(self.last_text))
+                while cached < limit and text[cached] == self.last_text[cached]:
+                    cached += 1
+                self.last_text = text
+            evaluate = (len(text) - cached) / 4
+            prompt_eval = evaluate / profile.prompt_eval_rate if profile.prompt_eval_rate > 0 else 0.0
+            self.loaded_until = now + load + parse_keep_alive(keep_alive, profile.default_keep_alive)
+            return load, prompt_eval
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    profile = FaultProfile()
+    model = ModelState()
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _roll(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _inject_faults(self, extra_delay: float = 0.0) -> bool:
+        """Sleep and/or send an error; True if the request was answered."""
+        profile = self.profile
+        if self._roll() < profile.error_rate:
+            headers = {"Retry-After": str(profile.retry_after)} if profile.error_status == 429 else {}
+            self._send_json(profile.error_status, {"error": "injected failure"}, headers)
+            return True
+        delay = profile.latency + extra_delay
+        if self._roll() < profile.tail_rate:
+            delay += profile.tail_latency
+        if self._roll() < profile.stall_rate:
+            delay += profile.stall_seconds
+        time.sleep(delay)
+        return False
+
+    def _generation_delay(self) -> float:
+        if self.profile.tokens_per_second > 0:
+            return self.profile.answer_tokens / self.profile.tokens_per_second
+        return 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path not in ("/api/generate", "/openai/v1/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+        extra, load = 0.0, 0.0
+        if self.path == "/api/generate":
+            text = (body.get("system") or "") + body.get("prompt", "")
+            load, prompt_eval = self.model.admit(
+                self.profile, body.get("keep_alive"), text, continued=bool(body.get("context"))
+            )
+            extra = load + prompt_eval
+            if "prompt" not in body:
+                # Preload request: load the model, generate nothing
+                time.sleep(load)
+                self._send_json(200, {"model": body.get("model"), "response": "", "done": True,
+                                      "load_duration": int(load * 1e9)})
+                return
+        if self._inject_faults(extra):
+            return
+
+        answer_words = [f"tok{i}" for i in range(self.profile.answer_tokens)]
+        if self.path == "/api/generate":
+            final = {
+                "model": body.get("model"),
+                "done": True,
+                "load_duration": int(load * 1e9),
+                "prompt_eval_count": len(body.get("prompt", "")) // 4,
+                "eval_count": self.profile.answer_tokens,
+                "context": list(range(len(body.get("context") or []) + len(body.get("prompt", "")) // 4))
+            }
+            if body.get("stream", True):
+                self._stream_ndjson(body.get("model"), answer_words, final)
+            else:
+                time.sleep(self._generation_delay())
+                self._send_json(200, {**final, "response": " ".join(answer_words)})
+        else:
+            time.sleep(self._generation_delay())
+            answer = " ".join(answer_words)
+            prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []))
+            self._send_json(200, {
+                "id": "fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_chars // 4,
+                    "completion_tokens": self.profile.answer_tokens,
+                    "total_tokens": prompt_chars // 4 + self.profile.answer_tokens
+                }
+            })
+
+    def _stream_ndjson(self, model: str, words, final: dict):
+        """Ollama-style streaming: one JSON object per token, then a done record."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        per_token = 1.0 / self.profile.tokens_per_second if self.profile.tokens_per_second > 0 else 0.0
+        for i, word in enumerate(words):
+            if i and per_token:
+                time.sleep(per_token)
+            chunk = {"model": model, "response": word + " ", "done": False}
+            self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            self.wfile.flush()
+        self.wfile.write(json.dumps({**final, "response": ""}).encode() + b"\n")
+
+def start_server(profile: FaultProfile, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the fake server on a background thread; port 0 picks a free one."""
+    handler = type("ProfiledHandler", (FakeLLMHandler,), {"profile": profile, "model": ModelState()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    defaults = FaultProfile()
+    for name, value in vars(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama/Groq server with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profile = FaultProfile(**{k: getattr(args, k) for k in vars(FaultProfile())})
+    server = start_server(profile, args.host, args.port)
+    print(f"Fake LLM server on http://{args.host}:{server.server_port} ({profile})", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Offline stand-ins for benchmarks and load tests."""
+import random
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+from backend.core.captions import parse_caption_file, parse_vtt
+from backend.core.embeddings import HashingBackend
+from backend.core.video_downloader import VideoDownloader
+from backend.core.word_timings import WordTimings
+from backend.models import TranscriptSegment
+
+_VOCABULARY = (
+    "model data training layer network gradient loss function input output "
+    "vector index search query answer video speaker example result method "
+    "system memory cache latency throughput token sentence chapter topic "
+    "python code library function class module test deploy server request"
+).split()
+
+def synthetic_transcript(
+    num_segments: int,
+    words_per_segment: int = 18,
+    seconds_per_segment: float = 4.0,
+    seed: int = 0
+) -> List[TranscriptSegment]:
+    """Generate a deterministic transcript resembling Whisper output."""
+    rng = random.Random(seed)
+    segments = []
+    for i in range(num_segments):
+        words = [rng.choice(_VOCABULARY) for _ in range(words_per_segment)]
+        start = i * seconds_per_segment
+        segments.append(TranscriptSegment(
+            text=" ".join(words).capitalize() + ".",
+            start=start,
+            end=start + seconds_per_segment
+        ))
+    return segments
+
+def synthetic_word_timings(segments: List[TranscriptSegment]) -> WordTimings:
+    """Spread each segment's words evenly over its duration."""
+    segment_words = []
+    for segment in segments:
+        words = segment.text.split()
+        step = (segment.end - segment.start) / max(len(words), 1)
+        segment_words.append([
+            (word, segment.start + i * step, segment.start + (i + 1) * step)
+            for i, word in enumerate(words)
+        ])
+    return WordTimings.from_segments(segment_words)
+
+def _vtt_time(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+def synthetic_vtt(segments: List[TranscriptSegment]) -> str:
+    """Render segments as YouTube-style roll-up auto-caption WebVTT."""
+    cues = ["WEBVTT\nKind: captions\nLanguage: en"]
+    previous = " "
+    for segment in segments:
+        cues.append(f"{_vtt_time(segment.start)} --> {_vtt_time(segment.end)} align:start position:0%\n"
+                    f"{previous}\n{segment.text}")
+        # 10 ms transition cue repeating the line, as YouTube emits
+        cues.append(f"{_vtt_time(segment.end)} --> {_vtt_time(segment.end + 0.01)} align:start position:0%\n"
+                    f"{segment.text}\n ")
+        previous = segment.text
+    return "\n\n".join(cues) + "\n"
+
+def synthetic_questions(num_questions: int, seed: int = 1) -> List[str]:
+    """Generate deterministic questions over the synthetic vocabulary."""
+    rng = random.Random(seed)
+    return [
+        f"What does the speaker say about {rng.choice(_VOCABULARY)} and {rng.choice(_VOCABULARY)}?"
+        for _ in range(num_questions)
+    ]
+
+# Kept under its original name for benchmark scripts
+HashingEncoder = HashingBackend
+
+class FakeDownloader:
+    """Stands in for VideoDownloader: sleeps instead of fetching audio."""
+
+    def __init__(
+        self,
+        delay: float = 0.5,
+        duration: float = 1200.0,
+        captions_dir: Optional[Path] = None,
+        caption_segments: int = 0
+    ):
+        """
+        Args:
+            captions_dir: Serve `{video_id}.vtt|.srv3` (or `default.*`) fixtures
+            caption_segments: Otherwise, serve synthetic auto-captions of this
+                many segments; 0 means videos have no captions
+        """
+        self.delay = delay
+        self.duration = duration
+        self.captions_dir = Path(captions_dir) if captions_dir else None
+        self.caption_segments = caption_segments
+
+    get_video_id = staticmethod(VideoDownloader.get_video_id)
+    canonical_url = staticmethod(VideoDownloader.canonical_url)
+
+    def expand_url(self, url: str, max_videos: int = 500, playlist_size: int = 20) -> List[dict]:
+        """Playlist URLs (containing list=) expand to deterministic synthetic videos."""
+        if "list=" not in url:
+            return [{'url': self.canonical_url(url), 'title': None}]
+        videos = []
+        for i in range(min(playlist_size, max_videos)):
+            digest = zlib.crc32(f"{url}#{i}".encode())
+            videos.append({'url': f"https://www.youtube.com/watch?v={digest:011d}", 'title': f"Item {i}"})
+        return videos
+
+    def fetch_captions(self, url: str, languages=('en',), allow_auto: bool = True):
+        video_id = self.get_video_id(url)
+        metadata = {
+            'video_id': video_id,
+            'title': f"Synthetic video {video_id}",
+            'duration': self.duration,
+            'url': url
+        }
+        if self.captions_dir:
+            for name in (video_id, "default"):
+                for fmt in ("srv3", "vtt"):
+                    path = self.captions_dir / f"{name}.{fmt}"
+                    if path.exists():
+                        return parse_caption_file(path), 'manual', metadata
+        elif self.caption_segments and allow_auto:
+            segments = synthetic_transcript(self.caption_segments, seed=zlib.crc32(video_id.encode()))
+            return parse_vtt(synthetic_vtt(segments)), 'auto', metadata
+        return None, None, metadata
+
+    def download_audio(self, url: str, progress_callback=None):
+        total = int(self.duration * 24000)  # ~192 kbps
+        steps = 10
+        for step in range(1, steps + 1):
+            time.sleep(self.delay / steps)
+            if progress_callback:
+                progress_callback(total * step // steps, total)
+        video_id = self.get_video_id(url)
+        return f"/dev/null/{video_id}.mp3", {
+            'video_id': video_id,
+            'title': f"Synthetic video {video_id}",
+            'duration': self.duration,
+            'url': url
+        }
+
+class FakeTranscriber:
+    """Stands in for Transcriber: returns a synthetic transcript after a delay."""
+
+    def __init__(self, delay: float = 2.0, num_segments: int = 300, word_timestamps: bool = False):
+        self.delay = delay
+        self.num_segments = num_segments
+        self.word_timestamps = word_timestamps
+
+    def transcribe_with_words(
+        self, audio_path: str, progress_callback=None
+    ) -> Tuple[List[TranscriptSegment], Optional[WordTimings]]:
+        segments = self.transcribe(audio_path, progress_callback)
+        return segments, synthetic_word_timings(segments) if self.word_timestamps else None
+
+    def transcribe(self, audio_path: str, progress_callback=None) -> List[TranscriptSegment]:
+        segments = synthetic_transcript(self.num_segments, seed=zlib.crc32(audio_path.encode()))
+        total = segments[-1].end if segments else 0.0
+        step = max(1, len(segments) // 10)
+        for i in range(0, len(segments), step):
+            time.sleep(self.delay * step / len(segments))
+            if progress_callback:
+                progress_callback(segments[min(i + step, len(segments)) - 1].end, total)
+        return segments
@@ -0,0 +1,83 @@
+"""
+Exercise the LLM resilience layer against the fault-injecting fake server.
+
+Sends the same burst of requests through a plain OllamaAdapter, a
+retrying adapter and a retrying + hedged adapter, and reports success
+rate and latency percentiles for each.
+
+Usage:
+    python -m benchmarks.llm_resilience_bench --requests 200 --concurrency 16 \\
+        --error-rate 0.1 --error-status 429 --tail-rate 0.05 --tail-latency 3
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from backend.core.llm_adapter import create_llm_adapter
+from backend.core import llm_resilience
+from benchmarks.fake_llm_server import FaultProfile, add_profile_arguments, start_server
+from benchmarks.run_benchmarks import summarize
+
+def drive(adapter, requests: int, concurrency: int) -> dict:
+    """Fire requests concurrently; return latency summary and error counts."""
+    def one(i):
+        start = time.perf_counter()
+        try:
+            adapter.generate(f"Question {i}: what is covered?", max_tokens=64)
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, type(e).__name__
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+
+    latencies = [latency for latency, error in outcomes if error is None]
+    errors = {}
+    for _, error in outcomes:
+        if error:
+            errors[error] = errors.get(error, 0) + 1
+    result = summarize(latencies, unit="requests") if latencies else {}
+    result.update({"success_rate": len(latencies) / requests, "errors": errors})
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM resilience layer benchmark")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--hedge-after", type=float, default=0.5)
+    parser.add_argument("--rpm", type=float, default=0.0, help="Client-side requests per minute limit")
+    parser.add_argument("--output", type=Path, default=Path("llm_resilience_results.json"))
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profile = FaultProfile(**{k: getattr(args, k) for k in vars(FaultProfile())})
+    server = start_server(profile)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    variants = {
+        "plain": None,
+        "retry": {"max_retries": 3, "deadline": 30.0, "max_concurrency": args.concurrency,
+                  "requests_per_minute": args.rpm},
+        "retry+hedge": {"max_retries": 3, "deadline": 30.0, "max_concurrency": args.concurrency,
+                        "requests_per_minute": args.rpm, "hedge_after": args.hedge_after},
+    }
+    results = {}
+    for name, resilience in variants.items():
+        # Each variant gets fresh per-provider limiters
+        llm_resilience._limiters.clear()
+        adapter = create_llm_adapter(
+            "ollama", base_url=base_url, model="fake", timeout=args.timeout, resilience=resilience
+        )
+        results[name] = drive(adapter, args.requests, args.concurrency)
+        r = results[name]
+        latency = f"p50={r['p50_ms']:8.1f}ms p99={r['p99_ms']:8.1f}ms" if 'p50_ms' in r else ""
+        print(f"{name:<12} success={r['success_rate']:6.1%} {latency} errors={r['errors']}")
+
+    server.shutdown()
+    args.output.write_text(json.dumps({"profile": vars(profile), "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
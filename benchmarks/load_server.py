@@ -0,0 +1,58 @@
+"""
+Run backend.api with local stand-ins for every external dependency.
+
+YouTube download and Whisper are replaced by fakes from benchmarks.fakes,
+the embedding model by the hashing backend and the LLM by the fake provider, so the real API,
+service, status store, vector store and LangGraph workflow can be driven
+under load without network access.
+
+Usage:
+    python -m benchmarks.load_server --port 8765 --llm-latency 0.4 --llm-tps 80
+"""
+import argparse
+import os
+import tempfile
+
+def main():
+    parser = argparse.ArgumentParser(description="Video RAG API with fake providers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Fake LLM time-to-first-token (s)")
+    parser.add_argument("--llm-tps", type=float, default=100.0, help="Fake LLM tokens per second")
+    parser.add_argument("--download-seconds", type=float, default=0.5)
+    parser.add_argument("--transcribe-seconds", type=float, default=2.0)
+    parser.add_argument("--segments", type=int, default=300, help="Synthetic segments per video")
+    parser.add_argument("--caption-segments", type=int, default=0,
+                        help="Serve synthetic auto-captions of this many segments (0 = no captions)")
+    parser.add_argument("--captions-dir", default=None, help="Serve caption fixtures from this directory")
+    parser.add_argument("--data-dir", default=None, help="Override DATA_DIR (defaults to a temp dir)")
+    args = parser.parse_args()
+
+    # Must be set before backend.config is imported
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="videorag-load-")
+    os.environ["DATA_DIR"] = data_dir
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["EMBEDDING_BACKEND"] = "hashing"
+    os.environ["FAKE_LLM_LATENCY"] = str(args.llm_latency)
+    os.environ["FAKE_LLM_TOKENS_PER_SECOND"] = str(args.llm_tps)
+
+    from benchmarks import fakes
+    import backend.services.video_rag_service as service_module
+
+    service_module.VideoDownloader = lambda cache_dir, **kwargs: fakes.FakeDownloader(
+        delay=args.download_seconds,
+        captions_dir=args.captions_dir,
+        caption_segments=args.caption_segments
+    )
+    service_module.Transcriber = lambda **kwargs: fakes.FakeTranscriber(
+        delay=args.transcribe_seconds, num_segments=args.segments,
+        word_timestamps=kwargs.get("word_timestamps", False)
+    )
+
+    import uvicorn
+    from backend.api import app
+    print(f"Serving fake-backed API on http://{args.host}:{args.port} (data: {data_dir})", flush=True)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
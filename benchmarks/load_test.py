@@ -0,0 +1,243 @@
+"""
+End-to-end load generator for the FastAPI service.
+
+Replays a mix of ingest/status/query traffic at a fixed open-loop rate
+and reports throughput, error rate and latency percentiles per endpoint.
+Latency is measured from each request's scheduled send time, so queueing
+inside the generator (a saturated server) shows up in the numbers rather
+than silently lowering the offered load.
+
+By default it starts benchmarks.load_server (fake LLM, downloader,
+transcriber and embedder) in a subprocess; pass --base-url to target an
+already running server.
+
+Usage:
+    python -m benchmarks.load_test --qps 20 --duration 60 --mix ingest=1,status=4,query=5
+    python -m benchmarks.load_test --qps 40 --llm-latency 0.8 --output load.json
+"""
+import argparse
+import itertools
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import requests
+from benchmarks.fakes import synthetic_questions
+from benchmarks.run_benchmarks import summarize
+
+class LoadGenerator:
+    """Schedules requests at a target rate and records per-endpoint outcomes."""
+
+    def __init__(self, base_url: str, concurrency: int, seed: int = 0):
+        self.base_url = base_url.rstrip('/')
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+        self.rng = random.Random(seed)
+        self.questions = synthetic_questions(200, seed=seed)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._url_counter = itertools.count()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.ingested: List[str] = []
+        self.ready: List[str] = []
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _record(self, endpoint: str, scheduled: float, error: Optional[str]):
+        elapsed = time.perf_counter() - scheduled
+        with self._lock:
+            if error:
+                self.errors[endpoint][error] += 1
+            else:
+                self.latencies[endpoint].append(elapsed)
+
+    def _call(self, endpoint: str, scheduled: float, method: str, path: str, **kwargs) -> Optional[dict]:
+        try:
+            response = self._session().request(method, f"{self.base_url}{path}", timeout=60, **kwargs)
+            if response.status_code >= 400:
+                self._record(endpoint, scheduled, f"http_{response.status_code}")
+                return None
+            self._record(endpoint, scheduled, None)
+            return response.json()
+        except requests.RequestException as e:
+            self._record(endpoint, scheduled, type(e).__name__)
+            return None
+
+    def ingest(self, scheduled: float):
+        url = f"https://www.youtube.com/watch?v=load{next(self._url_counter):07d}"
+        body = self._call("ingest", scheduled, "POST", "/api/ingest", json={"url": url})
+        if body:
+            with self._lock:
+                self.ingested.append(body["video_id"])
+
+    def status(self, scheduled: float):
+        with self._lock:
+            candidates = self.ingested or self.ready
+            video_id = self.rng.choice(candidates) if candidates else None
+        if video_id is None:
+            return
+        body = self._call("status", scheduled, "GET", f"/api/status/{video_id}")
+        if body and body.get("status") == "complete":
+            with self._lock:
+                if video_id not in self.ready:
+                    self.ready.append(video_id)
+
+    def query(self, scheduled: float):
+        with self._lock:
+            video_id = self.rng.choice(self.ready) if self.ready else None
+            question = self.rng.choice(self.questions)
+        if video_id is None:
+            return
+        self._call("query", scheduled, "POST", "/api/query",
+                   json={"video_id": video_id, "question": question})
+
+    def warm_up(self, videos: int, timeout: float = 300.0):
+        """Ingest videos and wait for them so queries have targets."""
+        for _ in range(videos):
+            self.ingest(time.perf_counter())
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            for video_id in list(self.ingested):
+                self.status(time.perf_counter())
+            if len(self.ready) >= videos:
+                break
+            time.sleep(0.5)
+        # Warm-up traffic is not part of the measurement
+        self.latencies.clear()
+        self.errors.clear()
+
+    def run(self, qps: float, duration: float, mix: Dict[str, float]):
+        """Open-loop schedule: one request every 1/qps seconds for duration."""
+        operations = list(mix)
+        weights = [mix[op] for op in operations]
+        interval = 1.0 / qps
+        start = time.perf_counter()
+        for n in itertools.count():
+            scheduled = start + n * interval
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            operation = self.rng.choices(operations, weights)[0]
+            self.pool.submit(getattr(self, operation), scheduled)
+        self.pool.shutdown(wait=True)
+        return time.perf_counter() - start
+
+    def report(self, wall_seconds: float) -> Dict:
+        endpoints = {}
+        for endpoint in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies.get(endpoint, [])
+            errors = dict(self.errors.get(endpoint, {}))
+            total = len(samples) + sum(errors.values())
+            result = summarize(samples, unit="requests") if samples else {}
+            result.update({
+                "requests": total,
+                "errors": errors,
+                "error_rate": sum(errors.values()) / total if total else 0.0,
+                # Successful requests over the whole run, not per-request service time
+                "throughput": len(samples) / wall_seconds,
+                "throughput_unit": "requests/s"
+            })
+            endpoints[endpoint] = result
+        return endpoints
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'ingest=1,status=4,query=5' into weights."""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ("ingest", "status", "query"):
+            raise ValueError(f"Unknown operation in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def wait_for_server(base_url: str, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Video RAG API")
+    parser.add_argument("--base-url", default=None, help="Target an existing server instead of starting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--qps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of measured load")
+    parser.add_argument("--mix", default="ingest=1,status=4,query=5")
+    parser.add_argument("--concurrency", type=int, default=256, help="Max in-flight requests")
+    parser.add_argument("--warm-videos", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-tps", type=float, default=100.0)
+    parser.add_argument("--transcribe-seconds", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("load_results.json"))
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen([
+            sys.executable, "-m", "benchmarks.load_server",
+            "--port", str(args.port),
+            "--llm-latency", str(args.llm_latency),
+            "--llm-tps", str(args.llm_tps),
+            "--transcribe-seconds", str(args.transcribe_seconds)
+        ])
+
+    try:
+        wait_for_server(base_url)
+        generator = LoadGenerator(base_url, args.concurrency, seed=args.seed)
+        generator.warm_up(args.warm_videos)
+        wall = generator.run(args.qps, args.duration, parse_mix(args.mix))
+        endpoints = generator.report(wall)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    document = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "params": {
+                "qps": args.qps,
+                "duration": args.duration,
+                "mix": args.mix,
+                "concurrency": args.concurrency,
+                "llm_latency": args.llm_latency,
+                "llm_tps": args.llm_tps,
+                "external_server": args.base_url is not None
+            }
+        },
+        "results": endpoints
+    }
+    args.output.write_text(json.dumps(document, indent=2))
+
+    for name, result in endpoints.items():
+        latency = (
+            f"p50={result['p50_ms']:8.1f}ms p95={result['p95_ms']:8.1f}ms p99={result['p99_ms']:8.1f}ms"
+            if 'p50_ms' in result else "no successful requests"
+        )
+        print(f"{name:<8} n={result['requests']:<6} err={result['error_rate']:6.2%} "
+              f"{result['throughput']:7.2f} req/s  {latency}")
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Measure Ollama time-to-first-token under residency and prompt strategies.
+
+Runs a multi-turn conversation against the fake server (which models
+cold loads, keep_alive eviction and prompt prefix caching) with:
+
+- no keep_alive: the server default evicts the model between turns
+- keep_alive: the adapter asks the server to keep the model resident
+- keep_alive + preload: the first turn doesn't pay the cold load either
+- keep_alive + preload + context reuse across turns
+
+Usage:
+    python -m benchmarks.ollama_latency_bench --cold-load 3 --prompt-eval-rate 400 --idle-gap 1.5
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+import requests
+from backend.config import config
+from backend.core.chunker import TranscriptChunker
+from backend.core.llm_adapter import OllamaAdapter
+from backend.core.prompts import SYSTEM_PROMPT, build_user_prompt
+from benchmarks.fake_llm_server import FaultProfile, start_server
+from benchmarks.fakes import synthetic_questions, synthetic_transcript
+from benchmarks.run_benchmarks import summarize
+
+def time_to_first_token(adapter: OllamaAdapter, prompt: str, system: str, context=None) -> tuple:
+    """Stream one request; return (ttft seconds, final context)."""
+    payload = adapter.build_payload(prompt, 256, system, stream=True, context=context)
+    start = time.perf_counter()
+    ttft = None
+    final_context = None
+    with requests.post(f"{adapter.base_url}/api/generate", json=payload, stream=True, timeout=120) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if ttft is None and chunk.get("response"):
+                ttft = time.perf_counter() - start
+            if chunk.get("done"):
+                final_context = chunk.get("context")
+    return ttft, final_context
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama TTFT benchmark against the fake server")
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--idle-gap", type=float, default=1.5, help="Seconds between turns")
+    parser.add_argument("--server-keep-alive", type=float, default=1.0, help="Server default residency (s)")
+    parser.add_argument("--cold-load", type=float, default=3.0)
+    parser.add_argument("--prompt-eval-rate", type=float, default=400.0, help="Prompt tokens/s")
+    parser.add_argument("--output", type=Path, default=Path("ollama_latency_results.json"))
+    args = parser.parse_args()
+
+    chunks = TranscriptChunker(config.CHUNK_SIZE, config.CHUNK_OVERLAP).chunk(
+        synthetic_transcript(200), "benchvideo00"
+    )
+    questions = synthetic_questions(args.turns)
+    prompts = [
+        build_user_prompt(q, chunks[i % len(chunks):i % len(chunks) + config.TOP_K_RETRIEVAL])
+        for i, q in enumerate(questions)
+    ]
+
+    variants = {
+        "no_keep_alive": dict(keep_alive=None, preload=False, reuse=False),
+        "keep_alive": dict(keep_alive="30m", preload=False, reuse=False),
+        "keep_alive+preload": dict(keep_alive="30m", preload=True, reuse=False),
+        "keep_alive+preload+context": dict(keep_alive="30m", preload=True, reuse=True),
+    }
+    results = {}
+    for name, variant in variants.items():
+        profile = FaultProfile(
+            latency=0.0, cold_load=args.cold_load, default_keep_alive=args.server_keep_alive,
+            prompt_eval_rate=args.prompt_eval_rate, tokens_per_second=50.0
+        )
+        server = start_server(profile)
+        adapter = OllamaAdapter(
+            base_url=f"http://127.0.0.1:{server.server_port}", model="fake", keep_alive=variant["keep_alive"]
+        )
+        if variant["preload"]:
+            adapter.preload()
+            time.sleep(args.idle_gap)  # Startup happens well before the first user
+
+        samples, context = [], None
+        for i, prompt in enumerate(prompts):
+            if i:
+                time.sleep(args.idle_gap)
+            ttft, new_context = time_to_first_token(
+                adapter, prompt, SYSTEM_PROMPT, context=context if variant["reuse"] else None
+            )
+            context = new_context
+            samples.append(ttft)
+        server.shutdown()
+
+        results[name] = {**summarize(samples, unit="turns"), "first_turn_ms": samples[0] * 1000}
+        r = results[name]
+        print(f"{name:<28} first={r['first_turn_ms']:8.1f}ms p50={r['p50_ms']:8.1f}ms p95={r['p95_ms']:8.1f}ms")
+
+    args.output.write_text(json.dumps({"params": vars(args) | {"output": str(args.output)}, "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Index-build embedding speedup from length-sorted batches and worker processes.
+
+Embeds the chunks of a synthetic multi-hour transcript three ways:
+in-process in transcript order (the old behaviour), in-process with
+length-sorted batches, and with an EmbeddingPool of each requested size.
+Reports chunks/s, speedup over the baseline and the largest difference
+from the baseline vectors (rows must come back in chunk order).
+
+Usage:
+    python -m benchmarks.parallel_embedding_bench --hours 3 --workers 2,4
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+import numpy as np
+from backend.config import config
+from backend.core.embedding_pool import EmbeddingPool, embed_in_order
+from backend.core.embeddings import create_embedding_backend
+from benchmarks.fakes import synthetic_transcript
+
+def synthetic_chunks(hours: float, seed: int = 0):
+    """Chunk texts of uneven length (2-8 segments), like chunker output at segment boundaries."""
+    segments = synthetic_transcript(int(hours * 3600 / 4.0), seed=seed)
+    rng = random.Random(seed)
+    texts, i = [], 0
+    while i < len(segments):
+        size = rng.randint(2, 8)
+        texts.append(" ".join(s.text for s in segments[i:i + size]))
+        i += size
+    return texts
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel index embedding benchmark")
+    parser.add_argument("--backend", default=config.EMBEDDING_BACKEND)
+    parser.add_argument("--model", default=config.EMBEDDING_MODEL)
+    parser.add_argument("--hours", type=float, default=3.0, help="Synthetic transcript length")
+    parser.add_argument("--batch-size", type=int, default=config.EMBED_BATCH_SIZE)
+    parser.add_argument("--workers", default="2,4", help="Comma-separated pool sizes to try")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("parallel_embedding_results.json"))
+    args = parser.parse_args()
+
+    texts = synthetic_chunks(args.hours, seed=args.seed)
+    options = {"cache_dir": config.DATA_DIR / "models"}
+    encoder = create_embedding_backend(args.backend, args.model, **options)
+    encode = lambda batch: encoder.encode(batch, batch_size=len(batch), show_progress_bar=False)
+    encode(texts[:args.batch_size])  # Warm up
+
+    results = {}
+
+    def record(name: str, seconds: float, vectors: np.ndarray, reference: np.ndarray):
+        results[name] = {
+            "seconds": seconds,
+            "chunks_per_second": len(texts) / seconds,
+            "speedup": results["in_order"]["seconds"] / seconds if "in_order" in results else 1.0,
+            "max_abs_diff": float(np.abs(vectors - reference).max()) if reference is not None else 0.0
+        }
+        r = results[name]
+        print(f"{name:<16} {r['chunks_per_second']:9.1f} chunks/s  {r['speedup']:5.2f}x  "
+              f"max|diff|={r['max_abs_diff']:.2e}")
+
+    start = time.perf_counter()
+    baseline = embed_in_order(texts, encode, args.batch_size, sort_by_length=False)
+    record("in_order", time.perf_counter() - start, baseline, None)
+
+    start = time.perf_counter()
+    vectors = embed_in_order(texts, encode, args.batch_size)
+    record("length_sorted", time.perf_counter() - start, vectors, baseline)
+
+    for workers in (int(w) for w in args.workers.split(",") if w):
+        pool = EmbeddingPool(args.backend, args.model, options=options, workers=workers)
+        try:
+            pool.encode(texts[:args.batch_size * workers], args.batch_size)  # Spawn and load models
+            start = time.perf_counter()
+            vectors = pool.encode(texts, args.batch_size)
+            record(f"pool_{workers}", time.perf_counter() - start, vectors, baseline)
+        finally:
+            pool.close()
+
+    args.output.write_text(json.dumps({
+        "backend": args.backend,
+        "model": args.model,
+        "chunks": len(texts),
+        "batch_size": args.batch_size,
+        "results": results
+    }, indent=2))
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
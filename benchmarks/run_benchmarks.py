@@ -0,0 +1,166 @@
+"""
+Offline component micro-benchmarks.
+
+Runs chunking, index build, search, prompt/context building and the RAG
+pipeline against synthetic transcripts, a hashing embedder and the fake
+LLM adapter, then writes throughput and latency percentiles to JSON.
+
+Usage:
+    python -m benchmarks.run_benchmarks --segments 2000 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+import argparse
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+import numpy as np
+from backend.config import config
+from backend.core.chunker import TranscriptChunker
+from backend.core.llm_adapter import FakeAdapter
+from backend.core.vector_store import VectorStore
+from backend.services.rag_pipeline import RAGPipeline
+from benchmarks.fakes import HashingEncoder, synthetic_questions, synthetic_transcript
+
+def summarize(samples: List[float], items_per_sample: float = 1.0, unit: str = "ops") -> Dict:
+    """Latency percentiles (ms) and throughput (unit/s) for timed samples."""
+    values = np.array(samples)
+    total = float(values.sum())
+    return {
+        "samples": len(samples),
+        "p50_ms": float(np.percentile(values, 50) * 1000),
+        "p95_ms": float(np.percentile(values, 95) * 1000),
+        "p99_ms": float(np.percentile(values, 99) * 1000),
+        "mean_ms": float(values.mean() * 1000),
+        "throughput": items_per_sample * len(samples) / total if total > 0 else 0.0,
+        "throughput_unit": f"{unit}/s"
+    }
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 1) -> List[float]:
+    """Time repeated calls of fn after warmup."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def run(args) -> Dict:
+    """Run all benchmarks and return the results document."""
+    results = {}
+    segments = synthetic_transcript(args.segments, seed=args.seed)
+    questions = synthetic_questions(args.queries, seed=args.seed + 1)
+    video_id = "benchvideo00"
+
+    chunker = TranscriptChunker(chunk_size=config.CHUNK_SIZE, overlap=config.CHUNK_OVERLAP)
+    chunks = chunker.chunk(segments, video_id)
+    results["chunker.chunk"] = summarize(
+        measure(lambda: chunker.chunk(segments, video_id), args.iterations),
+        items_per_sample=len(segments), unit="segments"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = VectorStore(
+            embedding_model=config.EMBEDDING_MODEL,
+            dimension=None,
+            index_dir=Path(tmp),
+            encoder=HashingEncoder(config.EMBEDDING_DIMENSION or 384)
+        )
+        results["vector_store.create_index"] = summarize(
+            measure(lambda: store.create_index(video_id, chunks), args.iterations),
+            items_per_sample=len(chunks), unit="chunks"
+        )
+
+        query_iter = iter(questions * (args.iterations + 2))
+        results["vector_store.search"] = summarize(
+            measure(
+                lambda: store.search(video_id, next(query_iter), top_k=config.TOP_K_RETRIEVAL, threshold=0.0),
+                len(questions)
+            ),
+            unit="queries"
+        )
+
+        # First tenth of the video, e.g. "what did they say in the first 10 minutes"
+        window_end = chunks[-1].end_time / 10
+        query_iter = iter(questions * 2)
+        results["vector_store.search_window"] = summarize(
+            measure(
+                lambda: store.search(
+                    video_id, next(query_iter), top_k=config.TOP_K_RETRIEVAL, threshold=0.0,
+                    start_time=0.0, end_time=window_end
+                ),
+                len(questions)
+            ),
+            unit="queries"
+        )
+
+        llm = FakeAdapter(latency=args.llm_latency, tokens_per_second=args.llm_tps)
+        pipeline = RAGPipeline(store, llm)
+        retrieved = store.search(video_id, questions[0], top_k=config.TOP_K_RETRIEVAL, threshold=0.0)
+        results["rag_pipeline.build_prompt"] = summarize(
+            measure(lambda: pipeline._build_prompt(questions[0], retrieved), len(questions)),
+            unit="prompts"
+        )
+
+        prompt = pipeline._build_prompt(questions[0], retrieved)
+        results["llm.fake_generate"] = summarize(
+            measure(lambda: llm.generate(prompt, max_tokens=500), args.llm_calls),
+            unit="calls"
+        )
+
+        query_iter = iter(questions * 2)
+        results["rag_pipeline.query"] = summarize(
+            measure(
+                lambda: pipeline.query(video_id, next(query_iter), top_k=config.TOP_K_RETRIEVAL, threshold=0.0),
+                args.llm_calls
+            ),
+            unit="queries"
+        )
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "segments": args.segments,
+                "chunks": len(chunks),
+                "queries": args.queries,
+                "iterations": args.iterations,
+                "llm_latency": args.llm_latency,
+                "llm_tps": args.llm_tps,
+                "seed": args.seed
+            }
+        },
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Video RAG component benchmarks")
+    parser.add_argument("--segments", type=int, default=2000, help="Synthetic transcript segments (~4s each)")
+    parser.add_argument("--queries", type=int, default=200, help="Search queries per run")
+    parser.add_argument("--iterations", type=int, default=5, help="Repetitions for chunking/indexing")
+    parser.add_argument("--llm-calls", type=int, default=50, help="Fake LLM / end-to-end calls")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM time-to-first-token (s)")
+    parser.add_argument("--llm-tps", type=float, default=0.0, help="Fake LLM tokens per second (0 = instant)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    args = parser.parse_args()
+
+    document = run(args)
+    args.output.write_text(json.dumps(document, indent=2))
+
+    for name, result in document["results"].items():
+        print(
+            f"{name:<28} p50={result['p50_ms']:9.3f}ms p95={result['p95_ms']:9.3f}ms "
+            f"p99={result['p99_ms']:9.3f}ms  {result['throughput']:12.1f} {result['throughput_unit']}"
+        )
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Transcription profile benchmark: real-time factor and word error rate.
+
+Transcribes each sample with every profile and reports RTF (wall seconds
+per audio second; lower is faster) and WER against a reference
+transcript. Samples are audio files with a same-named .txt reference,
+e.g. samples/lecture.wav + samples/lecture.txt. Audio isn't shipped with
+the repo; use any licensed clips that resemble your workload.
+
+Usage:
+    python -m benchmarks.transcription_bench --samples benchmarks/samples --model base
+    python -m benchmarks.transcription_bench --samples clips/ --profiles fast,balanced --cpu-threads 8
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import List
+from backend.core.transcriber import TRANSCRIPTION_PROFILES, Transcriber
+
+AUDIO_SUFFIXES = {".wav", ".mp3", ".m4a", ".webm", ".opus", ".ogg", ".flac"}
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase words without punctuation, for WER."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """(substitutions + deletions + insertions) / reference words."""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    # Levenshtein distance over words, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+def find_samples(directory: Path) -> List[Path]:
+    return sorted(
+        path for path in directory.iterdir()
+        if path.suffix.lower() in AUDIO_SUFFIXES and path.with_suffix(".txt").exists()
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcription profile RTF/WER benchmark")
+    parser.add_argument("--samples", type=Path, default=Path(__file__).parent / "samples")
+    parser.add_argument("--profiles", default=",".join(TRANSCRIPTION_PROFILES))
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--cpu-threads", type=int, default=None)
+    parser.add_argument("--output", type=Path, default=Path("transcription_results.json"))
+    args = parser.parse_args()
+
+    samples = find_samples(args.samples) if args.samples.is_dir() else []
+    if not samples:
+        parser.error(f"No audio files with .txt references in {args.samples}")
+
+    results = {}
+    for profile in args.profiles.split(","):
+        load_start = time.perf_counter()
+        transcriber = Transcriber(
+            model_size=args.model, device=args.device, profile=profile, cpu_threads=args.cpu_threads
+        )
+        load_seconds = time.perf_counter() - load_start
+
+        wall, audio, errors, words = 0.0, 0.0, 0.0, 0
+        per_sample = {}
+        for sample in samples:
+            start = time.perf_counter()
+            segments = transcriber.transcribe(str(sample))
+            elapsed = time.perf_counter() - start
+            reference = sample.with_suffix(".txt").read_text()
+            wer = word_error_rate(reference, " ".join(s.text for s in segments))
+            duration = segments[-1].end if segments else 0.0
+            per_sample[sample.name] = {"seconds": elapsed, "audio_seconds": duration, "wer": wer}
+
+            ref_words = len(normalize_words(reference))
+            wall += elapsed
+            audio += duration
+            errors += wer * ref_words
+            words += ref_words
+
+        results[profile] = {
+            "model_load_seconds": load_seconds,
+            "rtf": wall / audio if audio else None,
+            "wer": errors / words if words else None,
+            "samples": per_sample
+        }
+        r = results[profile]
+        print(f"{profile:<10} rtf={r['rtf']:.3f} wer={r['wer']:.2%} load={load_seconds:.1f}s")
+
+    args.output.write_text(json.dumps({"model": args.model, "device": args.device, "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Word-level timestamp cost and lookup benchmark.
+
+Without --audio, measures the compact word timing store on a synthetic
+transcript: build, save/load, storage size against a JSON list of word
+dicts, and phrase lookups within a citation's time range.
+
+With --audio, also transcribes the file with word timestamps off and on
+to show what the alignment pass costs (real-time factor = wall seconds
+per audio second).
+
+Usage:
+    python -m benchmarks.word_timing_bench --segments 2000
+    python -m benchmarks.word_timing_bench --audio talk.m4a --model base
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from backend.core.word_timings import WordTimings
+from benchmarks.fakes import synthetic_transcript, synthetic_word_timings
+from benchmarks.run_benchmarks import measure, summarize
+
+def bench_store(num_segments: int, lookups: int, seed: int) -> dict:
+    segments = synthetic_transcript(num_segments, seed=seed)
+    words = synthetic_word_timings(segments)
+    rng = random.Random(seed)
+    results = {}
+
+    results["build"] = summarize(
+        measure(lambda: synthetic_word_timings(segments), 5), items_per_sample=len(words), unit="words"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "words.npz"
+        results["save"] = summarize(measure(lambda: words.save(path), 5), items_per_sample=len(words), unit="words")
+        results["load"] = summarize(
+            measure(lambda: WordTimings.load(path), 5), items_per_sample=len(words), unit="words"
+        )
+        npz_bytes = path.stat().st_size
+
+    as_json = json.dumps([
+        {"word": w, "start": float(s), "end": float(e)}
+        for w, s, e in zip(words.words, words.starts, words.ends)
+    ])
+
+    # Phrase lookups scoped to a ~4-segment citation, as for a retrieved chunk
+    def lookup():
+        index = rng.randrange(len(segments) - 4)
+        lo, _ = words.segment_range(index + 2)
+        phrase = " ".join(words.words[lo:lo + 3])
+        assert words.find_phrase(phrase, segments[index].start, segments[index + 4].end) is not None
+
+    results["find_phrase"] = summarize(measure(lookup, lookups), unit="lookups")
+    results["word_at"] = summarize(
+        measure(lambda: words.word_at(rng.uniform(0, segments[-1].end)), lookups), unit="lookups"
+    )
+    results["storage"] = {
+        "words": len(words),
+        "npz_bytes": npz_bytes,
+        "json_bytes": len(as_json.encode()),
+        "bytes_per_word_npz": npz_bytes / len(words),
+        "bytes_per_word_json": len(as_json.encode()) / len(words),
+        "in_memory_bytes": words.nbytes
+    }
+    return results
+
+def bench_transcription(audio: Path, model: str, device: str) -> dict:
+    from backend.core.transcriber import Transcriber
+    results = {}
+    for enabled in (False, True):
+        transcriber = Transcriber(model_size=model, device=device, word_timestamps=enabled)
+        start = time.perf_counter()
+        segments, words = transcriber.transcribe_with_words(str(audio))
+        elapsed = time.perf_counter() - start
+        audio_seconds = segments[-1].end if segments else 0.0
+        results["words_on" if enabled else "words_off"] = {
+            "seconds": elapsed,
+            "audio_seconds": audio_seconds,
+            "rtf": elapsed / audio_seconds if audio_seconds else None,
+            "words": len(words) if words is not None else 0
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Word timestamp cost and lookup benchmark")
+    parser.add_argument("--segments", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--audio", type=Path, help="Audio file to transcribe with word timestamps off/on")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("word_timing_results.json"))
+    args = parser.parse_args()
+
+    document = {"store": bench_store(args.segments, args.lookups, args.seed)}
+    for name, result in document["store"].items():
+        if "p50_ms" in result:
+            print(f"{name:<12} p50={result['p50_ms']:9.3f}ms p99={result['p99_ms']:9.3f}ms "
+                  f"{result['throughput']:14.1f} {result['throughput_unit']}")
+    storage = document["store"]["storage"]
+    print(f"storage      {storage['words']} words: npz {storage['bytes_per_word_npz']:.1f} B/word, "
+          f"json {storage['bytes_per_word_json']:.1f} B/word")
+
+    if args.audio:
+        document["transcription"] = bench_transcription(args.audio, args.model, args.device)
+        for name, result in document["transcription"].items():
+            print(f"{name:<12} {result['seconds']:8.1f}s  rtf={result['rtf']:.3f}  words={result['words']}")
+
+    args.output.write_text(json.dumps(document, indent=2))
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
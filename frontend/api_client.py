@@ -0,0 +1,159 @@
+"""HTTP client for the FastAPI backend, used by the Streamlit thin-client mode."""
+import json
+from typing import Iterator, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.models import RAGResponse, VideoMetadata
+
+class APIError(RuntimeError):
+    """Backend returned an error status."""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+class VideoRAGClient:
+    """
+    Same calls the frontend makes on VideoRAGService, over HTTP.
+
+    One pooled keep-alive session is shared by all Streamlit sessions of a
+    process (requests.Session is safe for concurrent requests once its
+    adapters are mounted). Idempotent GETs are retried on connection errors;
+    POSTs never are, so an ingest or question is not sent twice.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 120.0, pool_size: int = 16):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.2, allowed_methods=frozenset(["GET"]))
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            response.close()
+            raise APIError(response.status_code, str(detail))
+        return response
+
+    def ingest_video(self, url: str) -> str:
+        """Start ingestion; returns the video_id."""
+        return self._request("POST", "/api/ingest", json={"url": url}).json()["video_id"]
+
+    def get_status(self, video_id: str) -> dict:
+        try:
+            return self._request("GET", f"/api/status/{video_id}").json()
+        except APIError as e:
+            if e.status == 404:
+                return {'status': 'unknown'}
+            raise
+
+    def status_events(self, video_id: str) -> Iterator[dict]:
+        """Current status, then progress events until the video is complete or errored."""
+        try:
+            response = self._request("GET", f"/api/status/{video_id}/events", stream=True, timeout=(10, self.timeout))
+        except APIError as e:
+            if e.status == 404:
+                yield {'status': 'unknown', 'error': e.detail}
+                return
+            raise
+        with response:
+            for _, data in _iter_sse(response):
+                yield data
+
+    def get_metadata(self, video_id: str) -> Optional[VideoMetadata]:
+        try:
+            return VideoMetadata.from_dict(self._request("GET", f"/api/metadata/{video_id}").json())
+        except APIError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def query(
+        self,
+        video_id: str,
+        question: str,
+        session_id: Optional[str] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
+    ) -> RAGResponse:
+        data = self._request("POST", "/api/query", json={
+            "video_id": video_id,
+            "question": question,
+            "session_id": session_id,
+            "start_time": start_time,
+            "end_time": end_time
+        }).json()
+        return RAGResponse(**data)
+
+    def query_stream(
+        self,
+        video_id: str,
+        question: str,
+        session_id: Optional[str] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Stream an answer.
+
+        Yields:
+            ('token', {text}) pieces, then ('done', QueryResponse fields)
+
+        Raises:
+            APIError: If the backend reports an error mid-stream
+        """
+        with self._request(
+            "POST", "/api/query/stream",
+            json={
+                "video_id": video_id,
+                "question": question,
+                "session_id": session_id,
+                "start_time": start_time,
+                "end_time": end_time
+            },
+            stream=True,
+            timeout=(10, self.timeout)
+        ) as response:
+            for event, data in _iter_sse(response):
+                if event == 'error':
+                    raise APIError(data.get('status', 500), data.get('detail', 'Unknown error'))
+                yield event, data
+
+    def end_session(self, session_id: str) -> bool:
+        try:
+            self._request("DELETE", f"/api/sessions/{session_id}")
+            return True
+        except APIError as e:
+            if e.status == 404:
+                return False
+            raise
+
+def _iter_sse(response: requests.Response) -> Iterator[Tuple[str, dict]]:
+    """Parse a text/event-stream body into (event, JSON data) pairs."""
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue  # Keep-alive comment
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
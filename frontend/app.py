@@ -1,14 +1,12 @@
 """Streamlit frontend for Video RAG system."""
 import streamlit as st
-import time
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.services import VideoRAGService
+from backend.config import config
 from backend.models import RAGResponse
-from backend.utils.conversation_memory import ConversationMemory
 
 st.set_page_config(
     page_title="Chat with Video",
@@ -18,6 +16,14 @@ st.set_page_config(
 
 @st.cache_resource
 def get_service():
+    """
+    The in-process service, or in api mode a pooled HTTP client, so UI
+    replicas load no models and scale separately from the backend.
+    """
+    if config.FRONTEND_MODE == "api":
+        from frontend.api_client import VideoRAGClient
+        return VideoRAGClient(config.API_BASE_URL, timeout=config.API_TIMEOUT, pool_size=config.API_POOL_SIZE)
+    from backend.services import VideoRAGService
     return VideoRAGService()
 
 service = get_service()
@@ -30,8 +36,32 @@ if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'metadata' not in st.session_state:
     st.session_state.metadata = None
-if 'memory' not in st.session_state:
-    st.session_state.memory = ConversationMemory()
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = None  # Server-side conversation, started by the first question
+
+def status_updates(video_id: str):
+    """Current processing status, then each pushed progress event until it ends."""
+    if config.FRONTEND_MODE == "api":
+        yield from service.status_events(video_id)
+        return
+    
+    subscription = service.subscribe(video_id)
+    try:
+        status = service.get_status(video_id)
+        while True:
+            yield status
+            if status.get('status') in ('complete', 'error', 'unknown'):
+                return
+            event = subscription.get(timeout=30)
+            status = event if event is not None else service.get_status(video_id)
+    finally:
+        service.unsubscribe(subscription)
+
+def end_conversation():
+    """Drop the server-side conversation history for the current video."""
+    if st.session_state.session_id:
+        service.end_session(st.session_state.session_id)
+    st.session_state.session_id = None
 
 st.title("🎥 Chat with Video")
 st.markdown("Ask questions about YouTube videos using AI-powered retrieval")
@@ -52,7 +82,7 @@ with st.sidebar:
                 st.session_state.video_id = video_id
                 st.session_state.status = 'processing'
                 st.session_state.messages = []
-                st.session_state.memory.clear()
+                end_conversation()
                 st.rerun()
             except Exception as e:
                 st.error(f"Error: {str(e)}")
@@ -63,11 +93,6 @@ with st.sidebar:
         st.divider()
         st.subheader("Processing...")
         
-        status = service.get_status(st.session_state.video_id)
-        progress = status.get('progress', 0.0)
-        st.progress(progress)
-        
-        stage = status.get('stage', 'unknown')
         stage_emoji = {
             'downloading': '⬇️',
             'transcribing': '🎤',
@@ -75,20 +100,37 @@ with st.sidebar:
             'indexing': '📊',
             'complete': '✅'
         }
-        st.write(f"{stage_emoji.get(stage, '⏳')} {stage.capitalize()}")
+        progress_bar = st.progress(0.0)
+        stage_text = st.empty()
+        detail_text = st.empty()
+        
+        # Block on pushed progress events instead of sleep-and-rerun polling
+        status = {}
+        for status in status_updates(st.session_state.video_id):
+            progress_bar.progress(min(status.get('progress', 0.0), 1.0))
+            stage = status.get('stage', 'unknown')
+            stage_text.write(f"{stage_emoji.get(stage, '⏳')} {stage.capitalize()}")
+            
+            detail = status.get('detail') or {}
+            if 'downloaded_bytes' in detail:
+                total = detail.get('total_bytes')
+                mb = detail['downloaded_bytes'] / 1e6
+                detail_text.caption(f"{mb:.1f} MB" + (f" / {total / 1e6:.1f} MB" if total else ""))
+            elif 'transcribed_seconds' in detail:
+                detail_text.caption(f"{detail['transcribed_seconds']:.0f}s / {detail['total_seconds']:.0f}s of audio")
+            elif 'chunks_embedded' in detail:
+                detail_text.caption(f"{detail['chunks_embedded']} / {detail['total_chunks']} chunks embedded")
+            else:
+                detail_text.empty()
         
         if status.get('status') == 'complete':
             st.session_state.status = 'ready'
             st.session_state.metadata = service.get_metadata(st.session_state.video_id)
             st.success("Video processed successfully!")
-            time.sleep(1)
             st.rerun()
-        elif status.get('status') == 'error':
+        else:
             st.session_state.status = 'error'
             st.error(f"Error: {status.get('error', 'Unknown error')}")
-        else:
-            time.sleep(2)
-            st.rerun()
     
     if st.session_state.status == 'ready' and st.session_state.metadata:
         st.divider()
@@ -97,13 +139,24 @@ with st.sidebar:
         st.write(f"**Title:** {metadata.title}")
         st.write(f"**Duration:** {int(metadata.duration // 60)}:{int(metadata.duration % 60):02d}")
         st.write(f"**Chunks:** {metadata.num_chunks}")
+        st.write(f"**Transcript:** {metadata.transcript_source.replace('_', ' ')}")
+        
+        # Narrow answers to part of the video, e.g. one chapter
+        total_minutes = max(round(metadata.duration / 60, 1), 0.1)
+        range_start, range_end = st.slider(
+            "Focus on (minutes)", 0.0, total_minutes, (0.0, total_minutes), step=0.5
+        )
+        st.session_state.query_window = (
+            range_start * 60 if range_start > 0 else None,
+            range_end * 60 if range_end < total_minutes else None
+        )
         
         if st.button("Process New Video"):
             st.session_state.video_id = None
             st.session_state.status = 'idle'
             st.session_state.messages = []
             st.session_state.metadata = None
-            st.session_state.memory.clear()
+            end_conversation()
             st.rerun()
 
 if st.session_state.status == 'ready':
@@ -133,15 +186,35 @@ if st.session_state.status == 'ready':
         with st.chat_message('assistant'):
             with st.spinner("Thinking..."):
                 try:
-                    response: RAGResponse = service.query(
-                        st.session_state.video_id,
-                        question,
-                        use_langgraph=True
-                    )
-                    
-                    st.write(response.answer)
+                    start_time, end_time = st.session_state.get('query_window', (None, None))
+                    if config.FRONTEND_MODE == "api":
+                        # Show the answer as it is generated
+                        answer_area, answer = st.empty(), ""
+                        for event, data in service.query_stream(
+                            st.session_state.video_id,
+                            question,
+                            session_id=st.session_state.session_id,
+                            start_time=start_time,
+                            end_time=end_time
+                        ):
+                            if event == 'token':
+                                answer += data['text']
+                                answer_area.markdown(answer + "▌")
+                            elif event == 'done':
+                                response = RAGResponse(**data)
+                        answer_area.markdown(response.answer)
+                    else:
+                        response: RAGResponse = service.query(
+                            st.session_state.video_id,
+                            question,
+                            use_langgraph=True,
+                            session_id=st.session_state.session_id,
+                            start_time=start_time,
+                            end_time=end_time
+                        )
+                        st.write(response.answer)
                     
-                    st.session_state.memory.add_turn(question, response.answer)
+                    st.session_state.session_id = response.session_id
                     
                     st.session_state.messages.append({
                         'role': 'assistant',
@@ -0,0 +1,59 @@
+"""ConversationMemory history compression stays within its token budget."""
+import pytest
+from backend.utils.conversation_memory import ConversationMemory
+
+def _count(text):
+    return len(text.split())
+
+def _tokens(history):
+    return sum(_count(turn.get("summary", "")) + _count(turn.get("query", "")) + _count(turn.get("answer", ""))
+               for turn in history)
+
+def _memory(turns, words=10):
+    memory = ConversationMemory(max_history=5)
+    for i in range(turns):
+        memory.add_turn(f"question {i} " + "q " * words, f"answer {i} " + "a " * words)
+    return memory
+
+def _verbose_summary(previous, turns):
+    # Grows with every fold, like an LLM summary that ignores its length limit
+    return previous + " " + " ".join(f"turn {turn['query']} {turn['answer']}" for turn in turns)
+
+@pytest.mark.parametrize("budget", [0, 5, 30, 60, 200])
+def test_history_fits_budget(budget):
+    memory = _memory(12)
+    for _ in range(3):
+        history = memory.compressed_history(budget, summarize=_verbose_summary, count_tokens=_count)
+        assert _tokens(history) <= budget
+        memory.add_turn("follow up " + "q " * 10, "reply " + "a " * 10)
+
+def test_oversized_summary_is_clipped():
+    memory = _memory(8)
+
+    history = memory.compressed_history(20, summarize=lambda previous, turns: "word " * 500, count_tokens=_count)
+
+    assert history[0]["summary"]
+    assert _tokens(history) <= 20
+    assert _count(memory.summary) <= 20
+
+def test_turns_are_summarized_once():
+    memory = _memory(8)
+    calls = []
+
+    def summarize(previous, turns):
+        calls.append(len(turns))
+        return "summary"
+
+    memory.compressed_history(60, summarize=summarize, count_tokens=_count)
+    memory.compressed_history(60, summarize=summarize, count_tokens=_count)
+
+    assert calls == [sum(calls)]
+    assert sum(calls) + len(memory.history) == 8
+
+def test_recent_turns_kept_verbatim_without_summarizer():
+    memory = _memory(3)
+
+    history = memory.compressed_history(1000, count_tokens=_count)
+
+    assert [turn["query"].split()[:2] for turn in history] == [["question", "0"], ["question", "1"], ["question", "2"]]
+    assert len(memory) == 3
@@ -0,0 +1,100 @@
+"""SingleFlight coalescing of concurrent identical queries."""
+import threading
+import time
+import pytest
+from backend.utils.singleflight import SingleFlight
+from backend.services.video_rag_service import VideoRAGService
+
+CALLERS = 8
+
+def _run(flight, key, fn):
+    entered = threading.Barrier(CALLERS + 1)
+    outputs = []
+    errors = []
+
+    def call():
+        entered.wait()
+        try:
+            outputs.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    entered.wait()
+    return threads, outputs, errors
+
+def _blocking(release, calls, result=None, error=None):
+    def fn():
+        calls.append(1)
+        release.wait(timeout=10)
+        if error is not None:
+            raise error
+        return result
+    return fn
+
+def test_concurrent_identical_calls_run_once():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    threads, outputs, errors = _run(flight, "key", _blocking(release, calls, result="answer"))
+    # Let every caller reach do() before the leader finishes
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert not errors
+    assert len(calls) == 1
+    assert [result for result, _ in outputs] == ["answer"] * CALLERS
+    assert sum(not shared for _, shared in outputs) == 1
+    assert flight.in_flight() == 0
+
+def test_leader_exception_reaches_followers():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    threads, outputs, errors = _run(flight, "key", _blocking(release, calls, error=RuntimeError("llm down")))
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(calls) == 1
+    assert not outputs
+    assert len(errors) == CALLERS
+    assert all(isinstance(e, RuntimeError) and str(e) == "llm down" for e in errors)
+    # Nothing is cached: the next call runs again
+    assert flight.do("key", lambda: "retry") == ("retry", False)
+
+def test_finished_call_is_not_reused():
+    flight = SingleFlight("test")
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do("key", fn) == (1, False)
+    assert flight.do("key", fn) == (2, False)
+
+def test_query_key_normalizes_question():
+    key = VideoRAGService._query_key("video", "What is  RAG?", "pipeline", None, None, [])
+
+    assert key == VideoRAGService._query_key("video", "what is rag?", "pipeline", None, None, [])
+
+@pytest.mark.parametrize("other", [
+    dict(history=[{"query": "earlier", "answer": "reply"}]),
+    dict(history=[{"summary": "talked about RAG"}]),
+    dict(start_time=30.0),
+    dict(end_time=90.0),
+    dict(engine="langgraph"),
+    dict(video_id="other-video"),
+])
+def test_query_key_differs_by_history_and_window(other):
+    base = dict(video_id="video", question="What is RAG?", engine="pipeline", start_time=None, end_time=None, history=[])
+
+    assert VideoRAGService._query_key(**base) != VideoRAGService._query_key(**{**base, **other})
@@ -0,0 +1,66 @@
+"""StatusStore under concurrent writers from several processes."""
+import multiprocessing
+import os
+import sys
+import pytest
+from backend.services.status_store import StatusStore
+
+PROCESSES = 6
+UPDATES = 25
+
+def _claim(db_path, video_id, start, results):
+    store = StatusStore(db_path)
+    start.wait()
+    status = store.claim(video_id, {'status': 'processing', 'stage': 'queued'})
+    results.put((os.getpid(), status is not None))
+
+def _update(db_path, video_id, start, results):
+    store = StatusStore(db_path)
+    start.wait()
+    versions = [store.update(video_id, {'pid': os.getpid()})['version'] for _ in range(UPDATES)]
+    results.put(versions)
+
+def _run(target, *args):
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    processes = [context.Process(target=target, args=(*args, start, results)) for _ in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    start.set()
+    outputs = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    return outputs
+
+def test_claim_has_one_winner_across_processes(tmp_path):
+    outputs = _run(_claim, tmp_path / "status.db", "video")
+
+    assert sum(won for _, won in outputs) == 1
+    # The winner's process has exited, so the job can be claimed again
+    store = StatusStore(tmp_path / "status.db")
+    assert store.claim("video", {'status': 'processing'}) is not None
+
+def test_versions_are_monotonic_across_processes(tmp_path):
+    store = StatusStore(tmp_path / "status.db")
+    initial = store.put("video", {'status': 'processing'})['version']
+
+    outputs = _run(_update, tmp_path / "status.db", "video")
+
+    for versions in outputs:
+        assert versions == sorted(versions)
+    seen = [version for versions in outputs for version in versions]
+    assert len(set(seen)) == len(seen)
+    assert store.get_version("video") == initial + PROCESSES * UPDATES
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="process start times come from /proc")
+def test_reused_pid_does_not_hold_claim(tmp_path):
+    store = StatusStore(tmp_path / "status.db")
+    store.claim("video", {'status': 'processing'})
+    # Same (live) pid, but written by an earlier process that had it
+    store._connect().execute("UPDATE jobs SET worker_token = 'old-boot:1' WHERE video_id = 'video'")
+
+    assert store.claim("video", {'status': 'processing'}) is not None
+    assert store.claim("video", {'status': 'processing'}) is None
+    assert store.fail_orphaned_jobs() == 0